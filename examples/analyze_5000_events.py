@@ -7,32 +7,34 @@ Análise final da hipótese numerológica com dataset de 5000 eventos.
 
 import sys
 import os
-import pandas as pd
 
 # Adicionar src ao path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from data_processor import NumerologyDataAnalyzer
+from dataset_catalog import DatasetCatalog
+from output_writers import write_partitioned
 
 
 def analyze_5000_events():
     """Análise completa dos 5000 eventos."""
     print("=== PyNumerology-Matrix: Análise Final de 5000 Eventos ===\n")
 
-    # Carregar dataset de 5000 eventos
-    dataset_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'historical_events_5000_synthetic.csv')
+    # Carregar dataset de 5000 eventos (snapshot binário do catálogo)
+    data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    catalog = DatasetCatalog((data_dir, os.path.join(data_dir, 'cache')))
 
-    if not os.path.exists(dataset_path):
+    if 'historical_events_5000_synthetic' not in catalog.names():
         print("❌ Dataset de 5000 eventos não encontrado!")
         return
 
-    df_events = pd.read_csv(dataset_path)
+    # Inicializar analisador
+    analyzer = NumerologyDataAnalyzer(catalog=catalog)
+
+    df_events = analyzer.load_dataset('historical_events_5000_synthetic')
     print(f"✅ Dataset carregado: {len(df_events)} eventos")
     print(f"📅 Período: {df_events['year'].min()}-{df_events['year'].max()}")
 
-    # Inicializar analisador
-    analyzer = NumerologyDataAnalyzer()
-
     # Análise numerológica
     print("\n🔢 Calculando ciclos numerológicos...")
     analysis_df = analyzer.analyze_event_cycles(df_events)
@@ -87,8 +89,7 @@ def analyze_5000_events():
 
     # Análise por categoria
     print(f"\n📂 ANÁLISE POR CATEGORIA:")
-    for category in df_events['category'].unique():
-        cat_events = analysis_df[analysis_df['eventLabel'].str.contains(category.replace('/', '|'), na=False)]
+    for category, cat_events in analysis_df.groupby('category', observed=True):
         if len(cat_events) > 50:  # Só categorias com dados suficientes
             ano_9_pct = (cat_events['ano_pessoal'] == 9).sum() / len(cat_events) * 100
             print(f"   {category}: {len(cat_events)} eventos, Ano 9: {ano_9_pct:.1f}%")
@@ -105,13 +106,11 @@ def analyze_5000_events():
             marker = "🔴" if ano_9_pct > 13 else "🟢" if ano_9_pct < 9 else "🟡"
             print(f"   {decade}s: {marker} {ano_9_pct:.1f}% ({(decade_data['ano_pessoal'] == 9).sum()}/{len(decade_data)}) | Desvio: {deviation:+.1f}%")
 
-    # Salvar análise completa
-    output_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
-    os.makedirs(output_dir, exist_ok=True)
-
-    analysis_df.to_csv(os.path.join(output_dir, 'numerology_analysis_5000.csv'), index=False)
+    # Salvar análise completa (em blocos, particionada por década e compactada)
+    output_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'numerology_analysis_5000')
+    manifest = write_partitioned(analysis_df, output_dir, partition_by='decade', fmt='csv.gz')
 
-    print(f"\n💾 Análise salva em: {output_dir}")
+    print(f"\n💾 Análise salva em: {output_dir} ({len(manifest['partitions'])} partições)")
 
     # Conclusão final
     print(f"\n🔬 CONCLUSÃO FINAL (5000 eventos):")
@@ -14,6 +14,7 @@ import pandas as pd
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from data_processor import NumerologyDataAnalyzer
+from entity_resolution import resolve_entities
 
 
 def main():
@@ -24,7 +25,6 @@ def main():
 
     # Coletar dados de múltiplas fontes
     all_events = []
-    all_analysis = []
 
     sources = ['wikidata', 'owid']
 
@@ -40,8 +40,9 @@ def main():
                 print(f"   ✅ {len(events_df)} eventos coletados")
                 print(f"   ✅ {len(analysis_df)} eventos analisados")
 
+                if 'source' not in events_df.columns:
+                    events_df = events_df.assign(source=source)
                 all_events.append(events_df)
-                all_analysis.append(analysis_df)
             else:
                 print(f"   ❌ Nenhum dado coletado de {source}")
 
@@ -55,14 +56,15 @@ def main():
         return
 
     combined_events = pd.concat(all_events, ignore_index=True)
-    combined_analysis = pd.concat(all_analysis, ignore_index=True)
 
-    # Remover duplicatas se houver
-    combined_events = combined_events.drop_duplicates()
-    combined_analysis = combined_analysis.drop_duplicates()
+    # Remover duplicatas entre fontes (QID do Wikidata, depois rótulo + data)
+    combined_events, dedup_report = resolve_entities(combined_events)
+    combined_analysis = analyzer.analyze_event_cycles(combined_events)
 
     print(f"\n📊 TOTAL COMBINADO:")
     print(f"   Eventos únicos: {len(combined_events)}")
+    print(f"   Duplicatas removidas: {dedup_report['qid']} por QID, "
+          f"{dedup_report['label_date']} por rótulo + data")
     print(f"   Análises num.: {len(combined_analysis)}")
     print(f"   Fontes: {combined_events['source'].nunique()} diferentes")
 
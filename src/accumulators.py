@@ -0,0 +1,207 @@
+"""
+PyNumerology-Matrix: Acumuladores de Contagens
+
+Este módulo mantém contagens de eventos por Ano Pessoal que podem ser
+atualizadas em lotes, combinadas entre si e persistidas em JSON, de modo
+que as estatísticas da hipótese sejam recalculadas sem reprocessar eventos.
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class AnoPessoalAccumulator:
+    """
+    Acumulador de contagens de eventos por Ano Pessoal.
+
+    As contagens ficam em um array indexado pelo próprio Ano Pessoal (0-9);
+    valores fora dessa faixa entram apenas no total. Opcionalmente mantém
+    contagens por fatia (ex: por década ou categoria) no mesmo formato.
+
+    Uma fatia pode cruzar várias colunas (ex: ('source', 'category',
+    'decade')): a dimensão se chama 'source+category+decade' e as chaves
+    são tuplas de valores, o que dá a tabela de contingência completa
+    usada pelos modelos de contagem.
+    """
+
+    N_CELLS = 10
+
+    def __init__(self, counts=None, total: int = 0, slices: Optional[Dict] = None):
+        """
+        Inicializa o acumulador.
+
+        Args:
+            counts: Contagens iniciais indexadas por Ano Pessoal (0-9)
+            total: Total de eventos já acumulados
+            slices: Contagens por fatia no formato {dimensão: {valor: contagens}}
+        """
+        self.counts = np.zeros(self.N_CELLS, dtype=np.int64)
+        if counts is not None:
+            self.counts[:] = counts
+        self.total = int(total)
+        self.slices = {}
+        for dimension, values in (slices or {}).items():
+            self.slices[dimension] = {
+                value: np.asarray(counts, dtype=np.int64) for value, counts in values.items()
+            }
+
+    @classmethod
+    def _histogram(cls, valores: np.ndarray) -> np.ndarray:
+        """Histograma de Anos Pessoais dentro da faixa 0-9."""
+        no_intervalo = valores[(valores >= 0) & (valores < cls.N_CELLS)]
+        return np.bincount(no_intervalo, minlength=cls.N_CELLS)
+
+    def update(self, anos_pessoais, slice_values: Optional[Dict] = None) -> 'AnoPessoalAccumulator':
+        """
+        Adiciona um lote de Anos Pessoais às contagens.
+
+        Args:
+            anos_pessoais: Array, Series ou sequência de Anos Pessoais
+            slice_values: Valores de fatia alinhados aos anos, no formato
+                {dimensão: array}; fatias cruzadas recebem uma tupla de arrays
+
+        Returns:
+            O próprio acumulador
+        """
+        valores = np.asarray(anos_pessoais, dtype=np.int64)
+        self.counts += self._histogram(valores)
+        self.total += len(valores)
+
+        for dimension, keys in (slice_values or {}).items():
+            if isinstance(keys, tuple):
+                codes, uniques = self._factorize_joint(keys)
+            else:
+                codes, uniques = pd.factorize(pd.Series(keys), use_na_sentinel=True)
+            validos = (codes >= 0) & (valores >= 0) & (valores < self.N_CELLS)
+            # Histograma conjunto (fatia, ano) em um único bincount
+            table = np.bincount(codes[validos] * self.N_CELLS + valores[validos],
+                                minlength=len(uniques) * self.N_CELLS).reshape(-1, self.N_CELLS)
+            target = self.slices.setdefault(dimension, {})
+            for key, row in zip(uniques, table):
+                key = self._plain_key(key)
+                if key in target:
+                    target[key] = target[key] + row
+                else:
+                    target[key] = row.astype(np.int64)
+        return self
+
+    @staticmethod
+    def _plain_key(key):
+        """Chave de fatia com escalares numpy convertidos para tipos Python."""
+        if isinstance(key, tuple):
+            return tuple(value.item() if hasattr(value, 'item') else value for value in key)
+        return key.item() if hasattr(key, 'item') else key
+
+    @staticmethod
+    def _factorize_joint(arrays: tuple):
+        """Códigos das combinações de valores (-1 se algum valor for nulo) e as tuplas únicas."""
+        factorized = [pd.factorize(pd.Series(values), use_na_sentinel=True) for values in arrays]
+        missing = np.zeros(len(factorized[0][0]), dtype=bool)
+        combined = np.zeros(len(missing), dtype=np.int64)
+        for codes, uniques in factorized:
+            missing |= codes < 0
+            combined = combined * max(len(uniques), 1) + np.maximum(codes, 0)
+        combined[missing] = -1
+        codes, combos = pd.factorize(combined, use_na_sentinel=True)
+        # Decodifica cada combinação de volta para a tupla de valores
+        digits = []
+        rest = np.asarray(combos, dtype=np.int64)
+        for _, uniques in reversed(factorized):
+            base = max(len(uniques), 1)
+            digits.append(np.asarray(uniques, dtype=object)[rest % base] if len(uniques) else rest)
+            rest = rest // base
+        return codes, list(zip(*reversed(digits)))
+
+    def merge(self, other: 'AnoPessoalAccumulator') -> 'AnoPessoalAccumulator':
+        """
+        Soma as contagens de outro acumulador a este.
+
+        Args:
+            other: Acumulador a ser incorporado
+
+        Returns:
+            O próprio acumulador
+        """
+        self.counts += other.counts
+        self.total += other.total
+        for dimension, values in other.slices.items():
+            target = self.slices.setdefault(dimension, {})
+            for key, counts in values.items():
+                target[key] = target[key] + counts if key in target else counts.copy()
+        return self
+
+    def counts_by_ano(self) -> Dict[int, int]:
+        """Contagens por Ano Pessoal observado, em ordem crescente."""
+        return {int(ano): int(count) for ano, count in enumerate(self.counts) if count > 0}
+
+    def slice_accumulator(self, dimension: str, key) -> 'AnoPessoalAccumulator':
+        """Acumulador com as contagens de uma única fatia."""
+        counts = self.slices[dimension][key]
+        return AnoPessoalAccumulator(counts, int(counts.sum()))
+
+    def to_dict(self) -> Dict:
+        """Serializa o acumulador para um dicionário compatível com JSON."""
+        data = {'counts': self.counts.tolist(), 'total': self.total}
+        if self.slices:
+            # Pares [valor, contagens] preservam chaves não textuais (ex: décadas)
+            data['slices'] = {
+                dimension: [[key, counts.tolist()] for key, counts in values.items()]
+                for dimension, values in self.slices.items()
+            }
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AnoPessoalAccumulator':
+        """Reconstrói um acumulador serializado por `to_dict`."""
+        slices = {
+            # Chaves de fatias cruzadas voltam do JSON como listas
+            dimension: {tuple(key) if isinstance(key, list) else key: counts for key, counts in pairs}
+            for dimension, pairs in data.get('slices', {}).items()
+        }
+        return cls(data.get('counts'), data.get('total', 0), slices)
+
+    @staticmethod
+    def joint_dimension(columns: Iterable[str]) -> str:
+        """Nome da dimensão de uma fatia cruzada (ex: 'source+category')."""
+        return '+'.join(columns)
+
+    @staticmethod
+    def _slice_column(analysis_df: pd.DataFrame, dimension: str) -> Optional[np.ndarray]:
+        """Valores de uma dimensão de fatia ('decade' é derivada de 'year'), ou None."""
+        if dimension == 'decade' and 'decade' not in analysis_df.columns:
+            return (analysis_df['year'].to_numpy(dtype=np.int64) // 10) * 10
+        if dimension in analysis_df.columns:
+            return analysis_df[dimension].to_numpy()
+        return None
+
+    @classmethod
+    def from_analysis(cls, analysis_df: pd.DataFrame,
+                      slice_by: Iterable[str] = ()) -> 'AnoPessoalAccumulator':
+        """
+        Cria um acumulador a partir de um DataFrame de análise.
+
+        Args:
+            analysis_df: DataFrame com a coluna 'ano_pessoal'
+            slice_by: Colunas usadas como fatias; 'decade' é derivada de 'year'
+                e tuplas de colunas formam fatias cruzadas
+
+        Returns:
+            Acumulador com as contagens totais e por fatia
+        """
+        accumulator = cls()
+        if analysis_df.empty:
+            return accumulator
+        slice_values = {}
+        for dimension in slice_by:
+            if isinstance(dimension, tuple):
+                columns = [cls._slice_column(analysis_df, column) for column in dimension]
+                if all(values is not None for values in columns):
+                    slice_values[cls.joint_dimension(dimension)] = tuple(columns)
+                continue
+            values = cls._slice_column(analysis_df, dimension)
+            if values is not None:
+                slice_values[dimension] = values
+        accumulator.update(analysis_df['ano_pessoal'].to_numpy(), slice_values)
+        return accumulator
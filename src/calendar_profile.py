@@ -0,0 +1,263 @@
+"""
+PyNumerology-Matrix: Perfil Exaustivo do "Hash" Numerológico no Calendário
+
+A redução numerológica é descrita como uma função de hash determinística
+sobre datas. Este módulo mede o quão uniforme ela é: calcula Número do
+Destino, Ano, Mês e Dia Pessoal para todas as datas de um intervalo de
+anos (ex: 0001-9999, ~3,65 milhões de dias) em operações de array e
+produz distribuições marginais, autocorrelações entre dias e anos
+consecutivos e distribuições condicionais. Os perfis ficam em cache (JSON).
+
+As marginais dão a linha de base exata dos testes: a probabilidade de
+cada Ano Pessoal para eventos distribuídos uniformemente pelos dias de um
+intervalo não é exatamente 1/9 quando o número de anos não é múltiplo de 9.
+
+Uso:
+    python src/calendar_profile.py --start 1 --end 9999
+"""
+
+import argparse
+import json
+import os
+from typing import Dict, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+try:
+    from .numerology_calculator import NumerologyCalculator
+except ImportError:
+    # Fallback para import direto se executado como script
+    from numerology_calculator import NumerologyCalculator
+
+
+CYCLES = ('destino', 'ano_pessoal', 'mes_pessoal', 'dia_pessoal')
+
+# Pares (condição, ciclo) das distribuições condicionais
+CONDITIONALS = (
+    ('mes_pessoal', 'dia_pessoal'),
+    ('ano_pessoal', 'mes_pessoal'),
+    ('month', 'destino'),
+    ('weekday', 'dia_pessoal'),
+    ('weekday', 'destino'),
+)
+
+
+class CalendarCycles(NamedTuple):
+    """Componentes e ciclos numerológicos de cada dia de um intervalo."""
+    year: np.ndarray
+    month: np.ndarray
+    day: np.ndarray
+    weekday: np.ndarray
+    destino: np.ndarray
+    ano_pessoal: np.ndarray
+    mes_pessoal: np.ndarray
+    dia_pessoal: np.ndarray
+
+
+def calendar_cycles(start_year: int, end_year: int, data_nasc: str = "2000-01-01",
+                    calc: Optional[NumerologyCalculator] = None) -> CalendarCycles:
+    """
+    Ciclos de todos os dias de `start_year` a `end_year` (inclusivos).
+
+    O Número do Destino é o de cada dia tomado como data de nascimento; Ano,
+    Mês e Dia Pessoal são os de cada dia tomado como data de um evento,
+    para a data de nascimento genérica da análise coletiva.
+
+    Args:
+        start_year: Primeiro ano
+        end_year: Último ano
+        data_nasc: Data de nascimento dos ciclos pessoais
+        calc: Calculadora (padrão: uma nova)
+
+    Returns:
+        CalendarCycles com um elemento por dia (calendário gregoriano proléptico)
+    """
+    calc = calc or NumerologyCalculator()
+    days = np.arange(np.datetime64(f"{start_year:04d}-01-01", 'D'),
+                     np.datetime64(f"{end_year + 1:04d}-01-01", 'D'))
+    months = days.astype('datetime64[M]')
+    year = months.astype('datetime64[Y]').astype(np.int64) + 1970
+    month = months.astype(np.int64) % 12 + 1
+    day = (days - months).astype(np.int64) + 1
+    # 1970-01-01 foi quinta-feira; 0 = segunda-feira
+    weekday = (days.astype(np.int64) + 3) % 7
+
+    destino = calc.calcular_numero_destino_array(year, month, day)
+    destinos = np.full(len(days), calc.calcular_numero_destino(data_nasc), dtype=np.int64)
+    ano, mes, dia = calc.calcular_ciclos_pessoais_array(destinos, year, month, day)
+    return CalendarCycles(year, month, day, weekday, destino, ano, mes, dia)
+
+
+def _distribution(values: np.ndarray) -> Dict:
+    """Contagens e probabilidades dos valores 1-9 e desvio máximo de 1/9.
+
+    Valores fora de 1-9 (ex: os ciclos de anos negativos, antes de Cristo)
+    são ignorados, como no AnoPessoalAccumulator.
+    """
+    values = values[(values >= 1) & (values <= 9)]
+    counts = np.bincount(values, minlength=10)[1:10]
+    total = max(int(counts.sum()), 1)
+    probabilities = counts / total
+    return {
+        'counts': counts.tolist(),
+        'probabilities': probabilities.tolist(),
+        'max_deviation': float(np.abs(probabilities - 1 / 9).max()) if counts.any() else 0.0,
+        'chi_square_uniform': float(((counts - counts.sum() / 9) ** 2).sum() / (total / 9))
+    }
+
+
+def _autocorrelation(series: np.ndarray, lags: Sequence[int]) -> Dict:
+    """
+    Autocorrelação de Pearson e taxa de repetição P(x[t] == x[t+lag]) por defasagem.
+
+    Para um hash sem memória, a correlação é ~0 e a repetição é ~1/9.
+    """
+    x = series.astype(float) - series.mean()
+    variance = (x ** 2).mean()
+    result = {}
+    for lag in lags:
+        if lag >= len(series):
+            continue
+        correlation = (x[:-lag] * x[lag:]).mean() / variance if variance > 0 else 0.0
+        result[str(lag)] = {'correlation': float(correlation),
+                            'repeat_rate': float((series[:-lag] == series[lag:]).mean())}
+    return result
+
+
+def _conditional(condition: np.ndarray, values: np.ndarray) -> Dict:
+    """Distribuição de `values` (1-9) para cada valor da condição, em um bincount."""
+    valid = (values >= 1) & (values <= 9)
+    condition, values = condition[valid], values[valid]
+    keys, codes = np.unique(condition, return_inverse=True)
+    table = np.bincount(codes * 10 + values, minlength=len(keys) * 10).reshape(len(keys), 10)[:, 1:]
+    probabilities = table / np.maximum(table.sum(axis=1, keepdims=True), 1)
+    return {
+        'keys': keys.tolist(),
+        'probabilities': probabilities.tolist(),
+        'max_deviation': float(np.abs(probabilities - 1 / 9).max()) if len(keys) else 0.0
+    }
+
+
+class CalendarProfiler:
+    """
+    Perfis exaustivos do calendário, com cache em disco e em memória.
+    """
+
+    def __init__(self, cache_dir: str = "data/cache/calendar_profiles",
+                 data_nasc: str = "2000-01-01"):
+        """
+        Inicializa o perfilador.
+
+        Args:
+            cache_dir: Diretório dos perfis em cache
+            data_nasc: Data de nascimento dos ciclos pessoais
+        """
+        self.cache_dir = cache_dir
+        self.data_nasc = data_nasc
+        self.calc = NumerologyCalculator()
+        self._memory = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, start_year: int, end_year: int) -> str:
+        return os.path.join(self.cache_dir,
+                            f"calendar_{self.data_nasc}_{start_year}_{end_year}.json")
+
+    def profile(self, start_year: int = 1, end_year: int = 9999,
+                day_lags: Sequence[int] = (1, 2, 3, 7, 9, 30, 365),
+                year_lags: Sequence[int] = (1, 2, 3, 9)) -> Dict:
+        """
+        Perfil completo de um intervalo de anos (calculado uma vez e cacheado).
+
+        Args:
+            start_year: Primeiro ano (inclusivo)
+            end_year: Último ano (inclusivo)
+            day_lags: Defasagens, em dias, da autocorrelação diária
+            year_lags: Defasagens, em anos, da autocorrelação anual
+
+        Returns:
+            Dicionário com 'days', 'marginals', 'autocorrelation' ('daily'
+            para os ciclos dia a dia e 'yearly' para o Ano Pessoal e o
+            Destino de uma mesma data em anos consecutivos) e 'conditionals'
+        """
+        key = (start_year, end_year, tuple(day_lags), tuple(year_lags))
+        if key in self._memory:
+            return self._memory[key]
+        path = self._path(start_year, end_year)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached['day_lags'] == list(day_lags) and cached['year_lags'] == list(year_lags):
+                self._memory[key] = cached
+                return cached
+
+        cycles = calendar_cycles(start_year, end_year, self.data_nasc, self.calc)
+        columns = cycles._asdict()
+
+        # Série anual: o Ano Pessoal e o Destino de 1º de janeiro de cada ano
+        first_day = (cycles.month == 1) & (cycles.day == 1)
+        profile = {
+            'data_nasc': self.data_nasc,
+            'start_year': start_year,
+            'end_year': end_year,
+            'days': int(len(cycles.year)),
+            'day_lags': list(day_lags),
+            'year_lags': list(year_lags),
+            'marginals': {cycle: _distribution(columns[cycle]) for cycle in CYCLES},
+            'autocorrelation': {
+                'daily': {cycle: _autocorrelation(columns[cycle], day_lags)
+                          for cycle in ('destino', 'mes_pessoal', 'dia_pessoal')},
+                'yearly': {cycle: _autocorrelation(columns[cycle][first_day], year_lags)
+                           for cycle in ('destino', 'ano_pessoal')},
+            },
+            'conditionals': {f"{cycle}|{condition}": _conditional(columns[condition], columns[cycle])
+                             for condition, cycle in CONDITIONALS},
+        }
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, indent=2)
+        os.replace(tmp_path, path)
+        self._memory[key] = profile
+        return profile
+
+    def expected_probabilities(self, start_year: int, end_year: int,
+                               cycle: str = 'ano_pessoal') -> np.ndarray:
+        """
+        Linha de base exata: probabilidade de cada valor 1-9 de um ciclo para
+        eventos distribuídos uniformemente pelos dias do intervalo.
+
+        Args:
+            start_year: Primeiro ano (inclusivo)
+            end_year: Último ano (inclusivo)
+            cycle: Ciclo ('destino', 'ano_pessoal', 'mes_pessoal' ou 'dia_pessoal')
+
+        Returns:
+            Array com 9 probabilidades (valores 1-9)
+        """
+        profile = self.profile(start_year, end_year)
+        return np.asarray(profile['marginals'][cycle]['probabilities'])
+
+
+def main():
+    """Ponto de entrada de linha de comando."""
+    parser = argparse.ArgumentParser(description='Perfil exaustivo do calendário numerológico')
+    parser.add_argument('--start', type=int, default=1)
+    parser.add_argument('--end', type=int, default=9999)
+    parser.add_argument('--data-nasc', default='2000-01-01')
+    parser.add_argument('--cache-dir', default='data/cache/calendar_profiles')
+    args = parser.parse_args()
+
+    profile = CalendarProfiler(args.cache_dir, args.data_nasc).profile(args.start, args.end)
+    print(f"{profile['days']} dias de {args.start} a {args.end}")
+    for cycle, marginal in profile['marginals'].items():
+        shares = ' '.join(f"{p * 100:5.2f}" for p in marginal['probabilities'])
+        print(f"{cycle:12s} {shares}  (desvio máx. {marginal['max_deviation'] * 100:.3f} p.p.)")
+    for cycle, lags in profile['autocorrelation']['daily'].items():
+        print(f"{cycle:12s} lag 1 dia: r={lags['1']['correlation']:+.3f}, "
+              f"repetição={lags['1']['repeat_rate']:.3f}")
+    for name, conditional in profile['conditionals'].items():
+        print(f"{name:24s} desvio máx. {conditional['max_deviation'] * 100:.2f} p.p.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+PyNumerology-Matrix: Checkpoints de Coleta
+
+Este módulo persiste o progresso de coletas longas (Wikidata, GDELT) em
+partições: cada partição ou página concluída é gravada em disco e
+registrada em um manifesto JSON. Se a coleta falhar no meio, a próxima
+execução lê o manifesto e busca apenas o que falta.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+
+class CollectionCheckpoint:
+    """
+    Manifesto e arquivos de partição de uma coleta retomável.
+
+    Todas as escritas são atômicas (arquivo temporário + `os.replace`), de
+    modo que uma interrupção nunca deixa um manifesto ou partição parcial.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, cache_dir: str, job_name: str):
+        """
+        Inicializa (ou reabre) o checkpoint de uma coleta.
+
+        Args:
+            cache_dir: Diretório de cache do coletor
+            job_name: Nome único da coleta (ex: 'wikidata_events_1900_2020')
+        """
+        self.job_name = job_name
+        self.directory = os.path.join(cache_dir, 'checkpoints', job_name)
+        os.makedirs(self.directory, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    def _load_manifest(self) -> Dict:
+        path = self._path(self.MANIFEST)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        return {
+            'job': self.job_name,
+            'created_at': datetime.now().isoformat(),
+            'completed': False,
+            'partitions': {}
+        }
+
+    def _write_manifest(self):
+        self.manifest['updated_at'] = datetime.now().isoformat()
+        tmp_path = self._path(self.MANIFEST + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._path(self.MANIFEST))
+
+    @staticmethod
+    def _filename(key: str) -> str:
+        """Nome de arquivo seguro para a chave da partição."""
+        safe = ''.join(c if c.isalnum() or c in '-_' else '_' for c in key)
+        return f"part_{safe}.csv"
+
+    def is_done(self, key: str) -> bool:
+        """Indica se a partição já foi concluída."""
+        return key in self.manifest['partitions']
+
+    def rows(self, key: str) -> Optional[int]:
+        """Número de linhas de uma partição concluída (None se pendente)."""
+        entry = self.manifest['partitions'].get(key)
+        return entry['rows'] if entry else None
+
+    def pending(self, keys: Iterable[str]) -> List[str]:
+        """Chaves ainda não concluídas, na ordem dada."""
+        return [key for key in keys if not self.is_done(key)]
+
+    def save_partition(self, key: str, data: pd.DataFrame, meta: Optional[Dict] = None):
+        """
+        Grava uma partição concluída e a registra no manifesto.
+
+        Partições vazias são registradas sem arquivo: indicam que a faixa
+        foi consultada com sucesso e não tem dados (ex: última página).
+
+        Args:
+            key: Chave da partição
+            data: Dados da partição
+            meta: Metadados adicionais para o manifesto
+        """
+        entry = {'rows': len(data), 'completed_at': datetime.now().isoformat(), 'file': None}
+        if not data.empty:
+            filename = self._filename(key)
+            tmp_path = self._path(filename + '.tmp')
+            data.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, self._path(filename))
+            entry['file'] = filename
+        if meta:
+            entry.update(meta)
+        self.manifest['partitions'][key] = entry
+        self._write_manifest()
+
+    def load(self, keys: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Concatena as partições concluídas.
+
+        Args:
+            keys: Partições a carregar, na ordem desejada (padrão: todas, na
+                ordem de conclusão)
+
+        Returns:
+            DataFrame com os dados das partições não vazias
+        """
+        keys = list(self.manifest['partitions']) if keys is None else list(keys)
+        frames = []
+        for key in keys:
+            entry = self.manifest['partitions'].get(key)
+            if entry and entry['file']:
+                frames.append(pd.read_csv(self._path(entry['file'])))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def mark_complete(self):
+        """Marca a coleta inteira como concluída."""
+        self.manifest['completed'] = True
+        self._write_manifest()
+
+    @property
+    def completed(self) -> bool:
+        return self.manifest['completed']
@@ -0,0 +1,430 @@
+"""
+PyNumerology-Matrix: Modelos de Contagem (GLM Poisson e Binomial Negativa)
+
+O qui-quadrado sobre as contagens por Ano Pessoal não separa o efeito do
+Ano Pessoal do perfil dos eventos: uma década com mais eventos, ou uma
+categoria concentrada em certos anos, desloca as contagens por si só.
+Este módulo ajusta modelos log-lineares das contagens da tabela de
+contingência (Ano Pessoal x covariáveis) com efeitos principais e uma
+exposição por célula:
+
+    log E[n] = log(exposição) + b0 + b_ano + b_categoria + b_decada + b_impacto + b_fonte
+
+e mede o efeito do Ano 9 já controlado pelas covariáveis.
+
+Sem a exposição, a Poisson de efeitos principais reproduz as contagens
+marginais: a razão de taxas do Ano Pessoal é a razão das contagens, com
+ou sem covariáveis. A exposição é o número de anos do calendário com cada
+Ano Pessoal em cada década (o Ano Pessoal de um evento depende só do seu
+ano): uma década tem 10 anos e o ciclo tem 9, então um Ano Pessoal aparece
+duas vezes e a composição muda de década para década. Com ela, o efeito
+do Ano Pessoal é uma taxa por ano de calendário, ajustada pela década.
+Como a exposição só varia com a década, as demais covariáveis têm as suas
+razões de taxas, mas na Poisson não deslocam o efeito do Ano Pessoal: o
+Ano Pessoal é função do ano, e só o tempo pode confundi-lo.
+
+Todas as fatias (ex: cada fonte, ou cada uma de centenas de combinações)
+compartilham a mesma matriz de desenho - uma linha por célula da tabela -
+e diferem apenas no vetor de contagens. O IRLS é feito em lote: a cada
+iteração, X'WX de todas as fatias sai de um único produto de matrizes e os
+sistemas são resolvidos juntos por `np.linalg.solve`. As tabelas vêm das
+fatias cruzadas do AnoPessoalAccumulator, sem voltar aos eventos.
+"""
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import stats
+
+try:
+    from .accumulators import AnoPessoalAccumulator
+except ImportError:
+    # Fallback para import direto se executado como script
+    from accumulators import AnoPessoalAccumulator
+
+
+ANOS = np.arange(1, 10)
+FAMILIES = ('poisson', 'negbin')
+DEFAULT_COVARIATES = ('category', 'decade', 'impact', 'source')
+
+# Regularização mínima: resolve níveis sem eventos em uma fatia e colinearidades
+RIDGE = 1e-8
+MAX_ALPHA = 1e3
+
+
+class CountTable(NamedTuple):
+    """Tabela densa de contagens: fatias x níveis das covariáveis x Ano Pessoal (1-9)."""
+    slices: List
+    covariates: List[str]
+    levels: List[List]
+    counts: np.ndarray
+
+
+class DesignMatrix(NamedTuple):
+    """Matriz de desenho de efeitos principais, compartilhada por todas as fatias."""
+    X: np.ndarray
+    columns: List[str]
+    # Fator de cada coluna (None para o intercepto) e índice do nível
+    factors: List[Optional[str]]
+    level_index: np.ndarray
+
+
+def count_table(accumulator: AnoPessoalAccumulator, covariates: Sequence[str],
+                slice_by: Optional[str] = None) -> CountTable:
+    """
+    Monta a tabela densa a partir de uma fatia cruzada do acumulador.
+
+    Args:
+        accumulator: Acumulador com a fatia cruzada `(slice_by, *covariates)`
+            (ou só `covariates`), criada por
+            `AnoPessoalAccumulator.from_analysis(df, [(...)])`
+        covariates: Covariáveis do modelo
+        slice_by: Dimensão que separa as fatias ajustadas (None: uma só fatia)
+
+    Returns:
+        CountTable com contagens de forma (fatias, *níveis, 9)
+    """
+    columns = ([slice_by] if slice_by else []) + list(covariates)
+    dimension = AnoPessoalAccumulator.joint_dimension(columns)
+    if len(columns) == 1:
+        # Uma única coluna é uma fatia comum (chaves escalares)
+        cells = {(key,): counts for key, counts in accumulator.slices.get(columns[0], {}).items()}
+    else:
+        cells = accumulator.slices.get(dimension, {})
+    if not cells and not columns:
+        cells = {(): accumulator.counts}
+    elif not cells:
+        raise KeyError(f"Acumulador sem a fatia cruzada '{dimension}'; crie-o com "
+                       f"from_analysis(df, [{tuple(columns)!r}])")
+
+    keys = list(cells)
+    levels = [sorted({key[i] for key in keys}, key=lambda v: (str(type(v)), v))
+              for i in range(len(columns))]
+    shape = [len(values) for values in levels]
+    counts = np.zeros(shape + [len(ANOS)], dtype=np.float64)
+    positions = [{value: j for j, value in enumerate(values)} for values in levels]
+    for key, row in cells.items():
+        index = tuple(positions[i][value] for i, value in enumerate(key))
+        counts[index] = np.asarray(row)[1:10]
+
+    if slice_by:
+        slices, levels = levels[0], levels[1:]
+    else:
+        slices = ['all']
+        counts = counts[np.newaxis]
+    return CountTable(slices, list(covariates), levels, counts)
+
+
+def design_matrix(levels: Sequence[Sequence], covariates: Sequence[str],
+                  reference: Optional[Sequence[int]] = None) -> DesignMatrix:
+    """
+    Matriz de desenho dos efeitos principais sobre as células da tabela.
+
+    As células seguem a ordem C de (níveis das covariáveis..., Ano Pessoal);
+    cada fator tem uma coluna indicadora por nível, exceto o de referência
+    (Ano Pessoal 1 e, nas covariáveis, o nível `reference[i]`).
+
+    Args:
+        levels: Níveis de cada covariável
+        covariates: Nomes das covariáveis
+        reference: Índice do nível de referência de cada covariável (padrão: 0)
+
+    Returns:
+        DesignMatrix
+    """
+    factors = list(covariates) + ['ano_pessoal']
+    all_levels = [list(values) for values in levels] + [list(ANOS)]
+    references = list(reference or [0] * len(covariates)) + [0]
+    shape = [len(values) for values in all_levels]
+    grid = np.indices(shape).reshape(len(shape), -1)
+
+    blocks = [np.ones((grid.shape[1], 1))]
+    columns = ['intercept']
+    column_factors = [None]
+    level_index = [-1]
+    for f, (name, values) in enumerate(zip(factors, all_levels)):
+        for j, value in enumerate(values):
+            if j == references[f]:
+                continue
+            blocks.append((grid[f] == j).astype(np.float64)[:, np.newaxis])
+            columns.append(f"{name}={value}")
+            column_factors.append(name)
+            level_index.append(j)
+    return DesignMatrix(np.hstack(blocks), columns, column_factors, np.asarray(level_index))
+
+
+def calendar_exposure(levels: Sequence[Sequence], covariates: Sequence[str],
+                      ano_pessoal: Callable[[np.ndarray], np.ndarray],
+                      year_range: Optional[Tuple[int, int]] = None) -> Optional[np.ndarray]:
+    """
+    Exposição das células: anos do calendário com cada Ano Pessoal.
+
+    Com a covariável 'decade', conta os anos de cada década (limitados a
+    `year_range`) por Ano Pessoal; sem ela, os anos de `year_range`.
+
+    Args:
+        levels: Níveis de cada covariável
+        covariates: Nomes das covariáveis
+        ano_pessoal: Função anos -> Ano Pessoal de cada ano
+        year_range: Primeiro e último ano (inclusivos) cobertos pelos dados
+            (padrão: décadas inteiras)
+
+    Returns:
+        Array (níveis..., 9) com eixos unitários nas covariáveis que não
+        afetam a exposição, ou None sem década nem faixa de anos
+    """
+    if 'decade' not in covariates and year_range is None:
+        return None
+    first, last = year_range if year_range is not None else (-np.inf, np.inf)
+    shape = [1] * len(covariates) + [len(ANOS)]
+    if 'decade' in covariates:
+        axis = list(covariates).index('decade')
+        years = np.asarray([int(decade) for decade in levels[axis]])[:, np.newaxis] + np.arange(10)
+        covered = (years >= first) & (years <= last)
+        shape[axis] = len(years)
+    else:
+        years = np.arange(int(first), int(last) + 1)[np.newaxis]
+        covered = np.ones(years.shape, dtype=bool)
+    anos = ano_pessoal(years.ravel()).reshape(years.shape)
+    exposure = np.stack([((anos == ano) & covered).sum(axis=1) for ano in ANOS], axis=1)
+    return exposure.reshape(shape).astype(np.float64)
+
+
+def _deviance(y: np.ndarray, mu: np.ndarray, alpha: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Deviance de cada fatia (Poisson quando alpha = 0)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        term = np.where(y > 0, y * np.log(y / mu), 0.0)
+        a = alpha[:, np.newaxis]
+        negbin = np.where(a > 0, (y + 1 / np.where(a > 0, a, 1)) * np.log((1 + a * y) / (1 + a * mu)), 0)
+        dev = np.where(a > 0, term - negbin, term - (y - mu))
+    return 2 * (dev * mask).sum(axis=1)
+
+
+def fit_batched_glm(X: np.ndarray, Y: np.ndarray, family: str = 'poisson', max_iter: int = 100,
+                    tol: float = 1e-8, cell_mask: Optional[np.ndarray] = None,
+                    column_mask: Optional[np.ndarray] = None,
+                    offset: Optional[np.ndarray] = None) -> Dict:
+    """
+    Ajusta um GLM de ligação log para várias fatias de uma vez (IRLS em lote).
+
+    Na binomial negativa (NB2, Var = mu + alpha * mu^2), o alpha de cada
+    fatia é reestimado a cada iteração pelo método dos momentos, alternando
+    com o passo de IRLS dos coeficientes.
+
+    Args:
+        X: Matriz de desenho (células, p), a mesma para todas as fatias
+        Y: Contagens (fatias, células)
+        family: 'poisson' ou 'negbin'
+        max_iter: Máximo de iterações
+        tol: Tolerância da variação relativa da deviance
+        cell_mask: Células usadas por fatia (padrão: todas)
+        column_mask: Colunas estimadas por fatia; as demais ficam em 0
+        offset: Termo fixo do preditor linear, ex: log(exposição), por
+            célula (células,) ou por fatia e célula (padrão: 0)
+
+    Returns:
+        Dicionário com 'beta' (fatias, p), 'cov' (fatias, p, p), 'mu',
+        'alpha', 'deviance', 'iterations' e 'converged' (por fatia)
+    """
+    if family not in FAMILIES:
+        raise ValueError(f"Família não suportada: {family}")
+    S, n = Y.shape
+    p = X.shape[1]
+    mask = np.ones((S, n)) if cell_mask is None else cell_mask.astype(np.float64)
+    cols = np.ones((S, p)) if column_mask is None else column_mask.astype(np.float64)
+    offset = np.zeros(n) if offset is None else offset
+    # Produtos X_i * X_j por célula, para X'WX de todas as fatias em um matmul
+    XX = (X[:, :, np.newaxis] * X[:, np.newaxis, :]).reshape(n, p * p)
+    eye = np.eye(p)
+
+    mu = np.where(mask > 0, Y + 0.5, 1.0)
+    eta = np.log(mu)
+    alpha = np.zeros(S)
+    beta = np.zeros((S, p))
+    deviance = _deviance(Y, mu, alpha, mask)
+    converged = np.zeros(S, dtype=bool)
+    iterations = np.zeros(S, dtype=np.int64)
+    active = np.ones(S, dtype=bool)
+
+    def information(mu, alpha):
+        """X'WX de todas as fatias; colunas sem dados viram linha/coluna da identidade."""
+        W = mu / (1 + alpha[:, np.newaxis] * mu) * mask
+        XtWX = (W @ XX).reshape(S, p, p)
+        XtWX = XtWX * cols[:, :, np.newaxis] * cols[:, np.newaxis, :] + (1 - cols)[:, :, np.newaxis] * eye
+        return W, XtWX
+
+    for iteration in range(1, max_iter + 1):
+        W, XtWX = information(mu, alpha)
+        XtWz = (W * (eta - offset + (Y - mu) / mu)) @ X
+        scale = np.maximum(np.abs(np.diagonal(XtWX, axis1=1, axis2=2)).max(axis=1), 1.0)
+        XtWX = XtWX + RIDGE * scale[:, np.newaxis, np.newaxis] * eye
+        beta_new = np.linalg.solve(XtWX, (XtWz * cols)[:, :, np.newaxis])[:, :, 0]
+
+        eta_new = np.clip(offset + beta_new @ X.T, -700, 700)
+        mu_new = np.where(mask > 0, np.exp(eta_new), 1.0)
+        if family == 'negbin':
+            dof = np.maximum(mask.sum(axis=1) - cols.sum(axis=1), 1)
+            moments = (((Y - mu_new) ** 2 - mu_new) / mu_new ** 2 * mask).sum(axis=1) / dof
+            alpha = np.where(active, np.clip(moments, 0, MAX_ALPHA), alpha)
+        new_deviance = _deviance(Y, mu_new, alpha, mask)
+
+        # Fatias já convergidas mantêm o ajuste
+        update = active[:, np.newaxis]
+        beta = np.where(update, beta_new, beta)
+        eta = np.where(update, eta_new, eta)
+        mu = np.where(update, mu_new, mu)
+        change = np.abs(new_deviance - deviance) / (np.abs(new_deviance) + 0.1)
+        deviance = np.where(active, new_deviance, deviance)
+        iterations[active] = iteration
+        converged |= active & (change < tol)
+        active &= ~converged
+        if not active.any():
+            break
+
+    # Covariância pela pseudo-inversa: contrastes identificáveis seguem válidos
+    # mesmo se um nível de referência não tiver eventos na fatia
+    _, XtWX = information(mu, alpha)
+    cov = np.linalg.pinv(XtWX, hermitian=True)
+    beta[cols == 0] = np.nan
+    cov[cols == 0] = np.nan
+    cov.transpose(0, 2, 1)[cols == 0] = np.nan
+    return {'beta': beta, 'cov': cov, 'mu': mu, 'alpha': alpha, 'deviance': deviance,
+            'iterations': iterations, 'converged': converged}
+
+
+def _level_masks(counts: np.ndarray) -> List[np.ndarray]:
+    """Para cada fator (covariáveis e Ano Pessoal), níveis com eventos em cada fatia: (fatias, níveis)."""
+    axes = range(1, counts.ndim)
+    return [counts.sum(axis=tuple(a for a in axes if a != axis)) > 0 for axis in axes]
+
+
+def _ano_9_contrast(design: DesignMatrix) -> np.ndarray:
+    """Contraste log(taxa do Ano 9) - média dos log(taxas) dos Anos 1-8."""
+    c = np.zeros(len(design.columns))
+    for i, (factor, level) in enumerate(zip(design.factors, design.level_index)):
+        if factor == 'ano_pessoal':
+            c[i] = 1.0 if ANOS[level] == 9 else -1.0 / 8
+    return c
+
+
+def fit_count_models(table: CountTable, family: str = 'poisson', max_iter: int = 100,
+                     tol: float = 1e-8, exposure: Optional[np.ndarray] = None) -> Dict:
+    """
+    Ajusta o modelo de contagem de todas as fatias de uma tabela.
+
+    O nível de referência de cada covariável é o mais frequente no total;
+    níveis sem eventos em uma fatia saem do ajuste dessa fatia (coeficiente
+    NaN), em vez de empurrar o IRLS para -infinito. Células com exposição
+    zero (ex: um Ano Pessoal que não ocorre no trecho coberto de uma
+    década) são zeros estruturais e ficam fora do ajuste.
+
+    Args:
+        table: Tabela de `count_table`
+        family: 'poisson' ou 'negbin'
+        max_iter: Máximo de iterações do IRLS
+        tol: Tolerância da variação relativa da deviance
+        exposure: Exposição das células, broadcastável a (níveis..., 9),
+            ex: `calendar_exposure` (None: sem offset; as razões de taxas do
+            Ano Pessoal são então as razões das contagens marginais)
+
+    Returns:
+        Dicionário com a família, as colunas do desenho, os níveis de
+        referência e, em 'slices', para cada fatia: eventos, deviance,
+        alpha, convergência, o efeito do Ano 9 ('ano_9': razão de taxas
+        contra a média dos Anos 1-8, erro padrão, z, p-valor e IC 95%), as
+        razões de taxas de cada Ano Pessoal contra o Ano 1, o teste de Wald
+        conjunto do Ano Pessoal e as razões de taxas das covariáveis
+    """
+    counts = table.counts
+    S = counts.shape[0]
+    totals = counts.sum(axis=0)
+    reference = [int(np.argmax(totals.sum(axis=tuple(a for a in range(totals.ndim) if a != k))))
+                 for k in range(len(table.covariates))]
+    design = design_matrix(table.levels, table.covariates, reference)
+    Y = counts.reshape(S, -1)
+
+    # Máscaras por fatia: células cujos níveis têm eventos e colunas desses níveis
+    level_masks = _level_masks(counts)
+    cell_mask = np.ones(Y.shape, dtype=bool)
+    grid = np.indices(counts.shape[1:]).reshape(counts.ndim - 1, -1)
+    for axis, present in enumerate(level_masks):
+        cell_mask &= present[:, grid[axis]]
+    factor_axis = {name: axis for axis, name in enumerate(table.covariates + ['ano_pessoal'])}
+    column_mask = np.ones((S, len(design.columns)), dtype=bool)
+    for i, (factor, level) in enumerate(zip(design.factors, design.level_index)):
+        if factor is not None:
+            column_mask[:, i] = level_masks[factor_axis[factor]][:, level]
+
+    offset = None
+    if exposure is not None:
+        exposure = np.broadcast_to(exposure, counts.shape[1:]).reshape(-1)
+        if (Y[:, exposure <= 0] > 0).any():
+            raise ValueError("Eventos em células sem exposição; verifique a faixa de anos")
+        cell_mask &= exposure > 0
+        offset = np.log(np.where(exposure > 0, exposure, 1.0))
+
+    fit = fit_batched_glm(design.X, Y, family, max_iter, tol, cell_mask, column_mask, offset)
+    beta, cov = fit['beta'], fit['cov']
+
+    c = _ano_9_contrast(design)
+    # Colunas fora do ajuste (NaN) só invalidam o contraste se ele as usar
+    estimate = np.nan_to_num(beta) @ c
+    std_error = np.sqrt(np.einsum('i,sij,j->s', c, np.nan_to_num(cov), c))
+    uses_missing = ~column_mask[:, c != 0].all(axis=1)
+    estimate[uses_missing] = std_error[uses_missing] = np.nan
+    ano_columns = [i for i, factor in enumerate(design.factors) if factor == 'ano_pessoal']
+    wald = np.full(S, np.nan)
+    b = beta[:, ano_columns]
+    V = cov[:, ano_columns][:, :, ano_columns]
+    finite = np.isfinite(b).all(axis=1) & np.isfinite(V).all(axis=(1, 2))
+    if finite.any():
+        wald[finite] = np.einsum('si,si->s', b[finite],
+                                 np.linalg.solve(V[finite], b[finite][:, :, np.newaxis])[:, :, 0])
+
+    slices = {}
+    for s, key in enumerate(table.slices):
+        events = int(Y[s].sum())
+        cells = int(cell_mask[s].sum())
+        z = estimate[s] / std_error[s] if events and std_error[s] > 0 else np.nan
+        covariate_effects = {}
+        for i, (factor, level) in enumerate(zip(design.factors, design.level_index)):
+            if factor not in (None, 'ano_pessoal'):
+                value = table.levels[factor_axis[factor]][level]
+                covariate_effects.setdefault(factor, {})[value] = float(np.exp(beta[s, i]))
+        slices[key] = {
+            'events': events,
+            'cells': cells,
+            'df_resid': int(cells - column_mask[s].sum()),
+            'deviance': float(fit['deviance'][s]),
+            'alpha': float(fit['alpha'][s]),
+            'converged': bool(fit['converged'][s]),
+            'iterations': int(fit['iterations'][s]),
+            'ano_9': {
+                'log_rate_ratio': float(estimate[s]),
+                'rate_ratio': float(np.exp(estimate[s])),
+                'std_error': float(std_error[s]),
+                'z_score': float(z),
+                'p_value': float(2 * stats.norm.sf(abs(z))) if np.isfinite(z) else float('nan'),
+                'ci_95': [float(np.exp(estimate[s] - 1.96 * std_error[s])),
+                          float(np.exp(estimate[s] + 1.96 * std_error[s]))]
+            },
+            'ano_effects': {int(ANOS[design.level_index[i]]): float(np.exp(beta[s, i]))
+                            for i in ano_columns},
+            'ano_wald': {
+                'chi_square_stat': float(wald[s]),
+                'df': len(ano_columns),
+                'p_value': float(stats.chi2.sf(wald[s], len(ano_columns))) if np.isfinite(wald[s])
+                else float('nan')
+            },
+            'covariates': covariate_effects
+        }
+
+    return {
+        'family': family,
+        'covariates': table.covariates,
+        'exposure': exposure is not None,
+        'columns': design.columns,
+        'reference_levels': {name: table.levels[k][reference[k]]
+                             for k, name in enumerate(table.covariates)},
+        'slices': slices
+    }
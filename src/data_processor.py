@@ -6,12 +6,52 @@ para análise estatística de padrões numerológicos.
 """
 
 import requests
+import numpy as np
 import pandas as pd
+import hashlib
 import json
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Sequence, Tuple
 from datetime import datetime
+import io
 import time
 import os
+import zipfile
+
+from scipy import stats
+
+try:
+    from .accumulators import AnoPessoalAccumulator
+    from .checkpoint import CollectionCheckpoint
+    from . import count_models
+    from .date_parser import format_iso, parse_dates, to_datetime64
+    from .calendar_profile import CalendarProfiler
+    from .dataset_catalog import DatasetCatalog
+    from .event_store import EventStore
+    from .pipeline import Pipeline
+    from .rate_limiter import RateLimitedSession
+    from .sampling import StratifiedSampler, estimate_proportions, reservoir_sample
+    from . import sparql_planner
+    from . import streaming
+    from . import wikidata_dump
+except ImportError:
+    # Fallback para import direto se executado como script
+    from accumulators import AnoPessoalAccumulator
+    from checkpoint import CollectionCheckpoint
+    import count_models
+    from date_parser import format_iso, parse_dates, to_datetime64
+    from calendar_profile import CalendarProfiler
+    from dataset_catalog import DatasetCatalog
+    from event_store import EventStore
+    from pipeline import Pipeline
+    from rate_limiter import RateLimitedSession
+    from sampling import StratifiedSampler, estimate_proportions, reservoir_sample
+    import sparql_planner
+    import streaming
+    import wikidata_dump
+
+# Falhas de uma consulta SPARQL: rede/HTTP, corpo que não é JSON ou JSON sem
+# 'results'/'bindings' (ex: página de erro do proxy com status 200)
+SPARQL_ERRORS = (requests.exceptions.RequestException, ValueError, KeyError)
 
 
 class DataProcessor:
@@ -19,23 +59,32 @@ class DataProcessor:
     Processador principal para coleta e análise de dados históricos.
     """
 
-    def __init__(self, cache_dir: str = "data/cache"):
+    USER_AGENT = 'PyNumerology-Matrix/1.0 (research project)'
+
+    def __init__(self, cache_dir: str = "data/cache", session: Optional[requests.Session] = None):
         """
         Inicializa o processador de dados.
 
         Args:
             cache_dir: Diretório para cache de dados
+            session: Sessão HTTP (padrão: RateLimitedSession, que compartilha
+                o limitador de cada host entre todos os coletores)
         """
         self.cache_dir = cache_dir
         os.makedirs(cache_dir, exist_ok=True)
+        self.session = session or RateLimitedSession()
+        self.session.headers.update({'User-Agent': self.USER_AGENT})
 
     def _cache_file(self, filename: str) -> str:
         """Retorna caminho completo para arquivo em cache."""
         return os.path.join(self.cache_dir, filename)
 
     def _save_cache(self, data: pd.DataFrame, filename: str):
-        """Salva DataFrame em cache."""
+        """Salva DataFrame em cache (resultados vazios nunca são cacheados)."""
         path = self._cache_file(filename)
+        if data.empty:
+            print(f"Resultado vazio não salvo em cache: {path}")
+            return
         data.to_csv(path, index=False)
         print(f"Dados salvos em cache: {path}")
 
@@ -46,6 +95,62 @@ class DataProcessor:
             return pd.read_csv(path)
         return None
 
+    def _collect_paginated(self, job_name: str, partitions: List[str], fetch_page,
+                           page_size: Optional[int], cache_file: str, transform=None) -> pd.DataFrame:
+        """
+        Executa uma coleta longa em partições paginadas, com checkpoints.
+
+        Cada página concluída é gravada no checkpoint da coleta; uma página
+        com menos de `page_size` linhas encerra sua partição. Se uma página
+        falhar, a coleta é interrompida sem cachear nada e a próxima execução
+        busca apenas as páginas que faltam.
+
+        Args:
+            job_name: Nome único da coleta (diretório do checkpoint)
+            partitions: Chaves das partições, na ordem de coleta
+            fetch_page: Função (partição, página) -> DataFrame que levanta
+                exceção em caso de falha
+            page_size: Número máximo de linhas por página (None: uma única
+                página por partição)
+            cache_file: Arquivo de cache do resultado final
+            transform: Limpeza aplicada ao resultado concatenado (as páginas
+                ficam no checkpoint como vieram, para a contagem de linhas
+                decidir corretamente se há próxima página)
+
+        Returns:
+            DataFrame com todas as páginas, ou vazio se a coleta não terminou
+        """
+        cached = self._load_cache(cache_file)
+        if cached is not None:
+            return cached
+
+        checkpoint = CollectionCheckpoint(self.cache_dir, job_name)
+        keys = []
+        for partition in partitions:
+            page = 0
+            while True:
+                key = f"{partition}_p{page}"
+                keys.append(key)
+                if not checkpoint.is_done(key):
+                    try:
+                        data = fetch_page(partition, page)
+                    except Exception as e:
+                        done = len(checkpoint.manifest['partitions'])
+                        print(f"Coleta '{job_name}' interrompida em {key}: {e}")
+                        print(f"{done} páginas em checkpoint; execute novamente para retomar")
+                        return pd.DataFrame()
+                    checkpoint.save_partition(key, data)
+                if page_size is None or checkpoint.rows(key) < page_size:
+                    break
+                page += 1
+
+        df = checkpoint.load(keys)
+        if transform is not None:
+            df = transform(df)
+        checkpoint.mark_complete()
+        self._save_cache(df, cache_file)
+        return df
+
 
 class WikidataCollector(DataProcessor):
     """
@@ -54,13 +159,6 @@ class WikidataCollector(DataProcessor):
 
     SPARQL_URL = "https://query.wikidata.org/sparql"
 
-    def __init__(self):
-        super().__init__()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'PyNumerology-Matrix/1.0 (research project)'
-        })
-
     def query_sparql(self, query: str, timeout: int = 30) -> pd.DataFrame:
         """
         Executa consulta SPARQL e retorna DataFrame.
@@ -70,23 +168,33 @@ class WikidataCollector(DataProcessor):
             timeout: Timeout em segundos
 
         Returns:
-            DataFrame com resultados
+            DataFrame com resultados (vazio em caso de erro)
         """
-        params = {
-            'query': query,
-            'format': 'json'
-        }
-
         try:
-            response = self.session.get(self.SPARQL_URL, params=params, timeout=timeout)
-            response.raise_for_status()
+            return self._execute_sparql(query, timeout)
         except requests.exceptions.Timeout:
             print("Timeout na consulta SPARQL. Tentando query mais simples...")
             return pd.DataFrame()
-        except requests.exceptions.RequestException as e:
+        except SPARQL_ERRORS as e:
             print(f"Erro na requisição SPARQL: {e}")
             return pd.DataFrame()
 
+    def _execute_sparql(self, query: str, timeout: int = 30) -> pd.DataFrame:
+        """
+        Executa consulta SPARQL, levantando exceção em caso de falha.
+
+        Diferente de `query_sparql`, um resultado vazio aqui significa que
+        a consulta foi bem-sucedida e não retornou linhas. Uma resposta que
+        não é JSON levanta ValueError; sem 'results'/'bindings', KeyError.
+        """
+        params = {
+            'query': query,
+            'format': 'json'
+        }
+
+        response = self.session.get(self.SPARQL_URL, params=params, timeout=timeout)
+        response.raise_for_status()
+
         data = response.json()
         bindings = data['results']['bindings']
 
@@ -100,49 +208,136 @@ class WikidataCollector(DataProcessor):
 
         return pd.DataFrame(records)
 
-    def collect_historical_events(self, limit: int = 1000) -> pd.DataFrame:
+    def subclass_closure(self, root: str = sparql_planner.EVENT_CLASS) -> List[str]:
+        """
+        Resolve (uma única vez) o fecho de subclasses de uma classe, podado
+        às classes com instâncias datadas (P585).
+
+        O resultado fica em cache em JSON; um fecho vazio (falha) nunca é
+        cacheado.
+
+        Args:
+            root: QID da classe raiz
+
+        Returns:
+            Lista ordenada de QIDs, incluindo a raiz
+        """
+        path = self._cache_file(f"wikidata_dated_subclasses_{root}.json")
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+
+        df = self._execute_sparql(sparql_planner.closure_query(root), timeout=300)
+        classes = sorted({sparql_planner.qid(uri) for uri in df.get('class', [])} | {root})
+        if len(classes) > 1:
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(classes, f)
+            os.replace(tmp_path, path)
+        return classes
+
+    def collect_historical_events(self, limit: int = 1000, batch_size: int = 200) -> pd.DataFrame:
         """
         Coleta eventos históricos do Wikidata.
 
+        Em vez de avaliar `wdt:P31/wdt:P279*` para cada evento, usa o fecho
+        de subclasses cacheado (só classes com eventos datados) e consulta
+        as classes em lotes de `VALUES`; cada evento volta em uma única
+        linha, com os tipos unidos por '|'. Cada lote concluído vai para um
+        checkpoint, como em `collect_historical_events_by_decade`: uma falha
+        não descarta os lotes já baixados.
+
         Args:
             limit: Número máximo de eventos
+            batch_size: Classes por consulta
 
         Returns:
-            DataFrame com eventos
+            DataFrame com eventos (vazio se a coleta foi interrompida)
         """
         cache_file = f"wikidata_events_{limit}.csv"
         cached = self._load_cache(cache_file)
         if cached is not None:
             return cached
 
-        # Query otimizada para coletar mais dados
-        query = f"""
-        SELECT ?event ?eventLabel ?date ?typeLabel WHERE {{
-          ?event wdt:P31/wdt:P279* wd:Q1190554 ;  # instance of event (including subclasses)
-                 wdt:P585 ?date .                 # point in time
-          OPTIONAL {{ ?event wdt:P31 ?type . }}   # event type
-          SERVICE wikibase:label {{
-            bd:serviceParam wikibase:language "en" .
-            ?event rdfs:label ?eventLabel .
-            ?type rdfs:label ?typeLabel .
-          }}
-          FILTER(YEAR(?date) >= 1900)  # Focus on 20th-21st century events
-        }}
-        ORDER BY DESC(?date)
-        LIMIT {limit}
-        """
+        try:
+            batches = sparql_planner.batched(self.subclass_closure(), batch_size)
+        except SPARQL_ERRORS as e:
+            print(f"Erro na requisição SPARQL: {e}")
+            return pd.DataFrame()
 
-        df = self.query_sparql(query)
+        def fetch_page(partition: str, page: int) -> pd.DataFrame:
+            batch = batches[int(partition[1:])]
+            return self._execute_sparql(sparql_planner.events_query(batch, limit=limit))
 
-        # Limpar e formatar
-        if not df.empty:
-            df['date'] = pd.to_datetime(df['date'], errors='coerce')
-            df = df.dropna(subset=['date'])
-            df['year'] = df['date'].dt.year
+        def transform(df: pd.DataFrame) -> pd.DataFrame:
+            # Cada lote traz seus `limit` eventos mais recentes; a junção
+            # mantém os `limit` mais recentes entre todos os lotes
+            return self._clean_events(sparql_planner.merge_event_batches([df], limit))
 
-        self._save_cache(df, cache_file)
+        return self._collect_paginated(f"wikidata_events_{limit}_{batch_size}",
+                                       [f"b{i}" for i in range(len(batches))], fetch_page, None,
+                                       cache_file, transform=transform)
+
+    @staticmethod
+    def _clean_events(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Limpa e formata eventos (datas normalizadas para 'YYYY-MM-DD', inclusive
+        anos fora da faixa de nanossegundos do pandas).
+        """
+        if df.empty:
+            return df
+        parsed = parse_dates(df['date'])
+        df = df[parsed.valid].copy()
+        df['date'] = format_iso(parsed)[parsed.valid]
+        df['year'] = parsed.year[parsed.valid]
         return df
 
+    def collect_historical_events_by_decade(self, start_year: int = 1900, end_year: int = 2030,
+                                            step: int = 10, page_size: int = 1000,
+                                            batch_size: int = 200) -> pd.DataFrame:
+        """
+        Coleta eventos históricos em faixas de anos paginadas, de forma retomável.
+
+        Cada faixa de `step` anos e cada lote de `batch_size` classes é
+        consultado em páginas de `page_size` eventos (ORDER BY ?event,
+        LIMIT/OFFSET), e cada página concluída vai para um checkpoint. Uma
+        falha no meio da coleta não descarta o que já foi baixado: a próxima
+        chamada retoma da primeira página pendente.
+
+        Args:
+            start_year: Primeiro ano (inclusivo)
+            end_year: Último ano (exclusivo)
+            step: Tamanho de cada faixa em anos
+            page_size: Eventos por página
+            batch_size: Classes por consulta
+
+        Returns:
+            DataFrame com eventos (vazio se a coleta foi interrompida)
+        """
+        job_name = f"wikidata_events_{start_year}_{end_year}_{step}_{page_size}_{batch_size}"
+        try:
+            batches = sparql_planner.batched(self.subclass_closure(), batch_size)
+        except SPARQL_ERRORS as e:
+            print(f"Erro ao resolver subclasses de eventos: {e}")
+            return pd.DataFrame()
+        ranges = {}
+        for year in range(start_year, end_year, step):
+            for i, batch in enumerate(batches):
+                ranges[f"{year}_b{i}"] = (year, min(year + step, end_year), batch)
+
+        def fetch_page(partition: str, page: int) -> pd.DataFrame:
+            year_min, year_max, batch = ranges[partition]
+            query = sparql_planner.events_query(batch, limit=page_size, offset=page * page_size,
+                                                year_min=year_min, year_max=year_max,
+                                                order_by='?event ?date')
+            return self._execute_sparql(query, timeout=60)
+
+        def transform(df: pd.DataFrame) -> pd.DataFrame:
+            return self._clean_events(sparql_planner.merge_event_batches([df]))
+
+        return self._collect_paginated(job_name, list(ranges), fetch_page, page_size,
+                                       f"{job_name}.csv", transform=transform)
+
     def collect_person_birth_dates(self, limit: int = 1000) -> pd.DataFrame:
         """
         Coleta datas de nascimento de pessoas famosas.
@@ -169,16 +364,202 @@ class WikidataCollector(DataProcessor):
         LIMIT {limit}
         """
 
-        df = self.query_sparql(query)
+        df = self._clean_people(self.query_sparql(query))
+        self._save_cache(df, cache_file)
+        return df
 
-        # Limpar datas
-        if not df.empty:
-            df['birthDate'] = pd.to_datetime(df['birthDate'], errors='coerce')
-            df['deathDate'] = pd.to_datetime(df['deathDate'], errors='coerce')
-            df = df.dropna(subset=['birthDate'])
-            df['birth_year'] = df['birthDate'].dt.year
+    @staticmethod
+    def _clean_people(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Limpa e formata pessoas (datas normalizadas para 'YYYY-MM-DD').
 
-        self._save_cache(df, cache_file)
+        Pessoas com mais de uma data de nascimento ou morte no Wikidata
+        aparecem em várias linhas; fica a primeira de cada pessoa.
+        """
+        if df.empty:
+            return df
+        birth = parse_dates(df['birthDate'])
+        death = parse_dates(df['deathDate']) if 'deathDate' in df.columns else None
+        df = df[birth.valid].copy()
+        df['birthDate'] = format_iso(birth)[birth.valid]
+        df['deathDate'] = format_iso(death)[birth.valid] if death is not None else None
+        df['birth_year'] = birth.year[birth.valid]
+        if 'person' in df.columns:
+            df = df.drop_duplicates('person')
+            # Pessoas sem rótulo em inglês recebem o QID, como faz o serviço de rótulos
+            if 'personLabel' not in df.columns:
+                df['personLabel'] = None
+            missing = df['personLabel'].isna() | (df['personLabel'] == '')
+            df.loc[missing, 'personLabel'] = df.loc[missing, 'person'].map(sparql_planner.qid)
+        return df.reset_index(drop=True)
+
+    def collect_people_by_birth_year(self, start_year: int = 1800, end_year: int = 2000,
+                                     step: int = 1, page_size: int = 10_000,
+                                     require_death: bool = True) -> pd.DataFrame:
+        """
+        Coleta humanos em faixas de ano de nascimento paginadas, de forma retomável.
+
+        Mesmo esquema de `collect_historical_events_by_decade`: cada faixa de
+        `step` anos é consultada em páginas de `page_size` pessoas e cada
+        página concluída vai para um checkpoint, então a coleta de milhões
+        de pessoas pode ser interrompida e retomada.
+
+        Args:
+            start_year: Primeiro ano de nascimento (inclusivo)
+            end_year: Último ano de nascimento (exclusivo)
+            step: Tamanho de cada faixa em anos
+            page_size: Pessoas por página
+            require_death: Se True, só pessoas com data de morte
+
+        Returns:
+            DataFrame com 'person', 'personLabel', 'birthDate', 'deathDate' e
+            'birth_year' (vazio se a coleta foi interrompida)
+        """
+        job_name = f"wikidata_people_{start_year}_{end_year}_{step}_{page_size}_{int(require_death)}"
+        ranges = {str(year): (year, min(year + step, end_year))
+                  for year in range(start_year, end_year, step)}
+
+        def fetch_page(partition: str, page: int) -> pd.DataFrame:
+            year_min, year_max = ranges[partition]
+            query = sparql_planner.people_query(year_min, year_max, limit=page_size,
+                                                offset=page * page_size,
+                                                require_death=require_death)
+            return self._execute_sparql(query, timeout=60)
+
+        return self._collect_paginated(job_name, list(ranges), fetch_page, page_size,
+                                       f"{job_name}.csv", transform=self._clean_people)
+
+
+class WikidataDumpCollector(WikidataCollector):
+    """
+    Coletor offline: extrai eventos e pessoas de um dump JSON local do Wikidata.
+
+    Produz as mesmas tabelas do WikidataCollector ('event', 'eventLabel',
+    'date', 'typeLabel', 'year' e 'person', 'personLabel', 'birthDate',
+    'deathDate', 'birth_year'), sem os limites de linhas e de tempo do
+    endpoint SPARQL. Os tipos ficam como QIDs em 'typeLabel', pois os
+    rótulos das classes estariam em outras linhas do dump.
+    """
+
+    # Colunas das tabelas em cache (também o cabeçalho de uma tabela vazia)
+    TABLE_COLUMNS = {
+        'events': ['event', 'eventLabel', 'date', 'typeLabel', 'year'],
+        'people': ['person', 'personLabel', 'birthDate', 'deathDate', 'birth_year'],
+    }
+
+    def __init__(self, dump_path: str, cache_dir: str = "data/cache", workers: Optional[int] = None,
+                 chunk_bytes: int = 8 << 20, session: Optional[requests.Session] = None):
+        """
+        Inicializa o coletor.
+
+        Args:
+            dump_path: Caminho do dump ('.json', '.json.bz2' ou '.json.gz')
+            cache_dir: Diretório para cache de dados
+            workers: Processos de decodificação (padrão: os.cpu_count())
+            chunk_bytes: Tamanho aproximado de cada bloco de linhas
+            session: Sessão HTTP (usada só por `subclass_closure`)
+        """
+        super().__init__(cache_dir, session)
+        self.dump_path = dump_path
+        self.workers = workers
+        self.chunk_bytes = chunk_bytes
+        name = os.path.basename(dump_path)
+        self.dump_name = name.split('.json')[0] if '.json' in name else os.path.splitext(name)[0]
+
+    def _table_files(self, event_classes: Optional[Sequence[str]]) -> Dict[str, str]:
+        # Só os eventos dependem das classes; as pessoas são as mesmas em toda leitura
+        suffix = '' if event_classes is None else \
+            '_' + hashlib.blake2b('|'.join(sorted(event_classes)).encode(), digest_size=4).hexdigest()
+        return {'events': f"wikidata_dump_{self.dump_name}_events{suffix}.csv",
+                'people': f"wikidata_dump_{self.dump_name}_people.csv"}
+
+    def ingest(self, event_classes: Optional[Sequence[str]] = None) -> Dict:
+        """
+        Lê o dump inteiro e grava as tabelas de eventos e de pessoas em cache.
+
+        Cada bloco extraído é limpo e anexado aos CSVs assim que chega, então
+        a memória fica limitada aos blocos em processamento. Os arquivos só
+        aparecem com o nome final ao término da leitura. Uma tabela sem
+        registros também é gravada (só o cabeçalho): a leitura completa do
+        dump é um resultado, e não deve ser repetida a cada coleta.
+
+        Args:
+            event_classes: QIDs aceitos em P31 para eventos (ex: o fecho de
+                `subclass_closure()`); None aceita qualquer entidade com P585
+
+        Returns:
+            Dicionário com linhas lidas, eventos, pessoas e caminhos das tabelas
+        """
+        files = {table: self._cache_file(name) for table, name in self._table_files(event_classes).items()}
+        tmp_files = {table: path + '.tmp' for table, path in files.items()}
+        written = {'events': 0, 'people': 0}
+        for table, path in tmp_files.items():
+            pd.DataFrame(columns=self.TABLE_COLUMNS[table]).to_csv(path, index=False)
+        lines = 0
+        start = time.perf_counter()
+        records = wikidata_dump.iter_dump_records(self.dump_path, self.workers, self.chunk_bytes,
+                                                  event_classes=event_classes)
+        for chunk in records:
+            lines += chunk.lines
+            tables = {
+                'events': self._clean_events(pd.DataFrame(chunk.events,
+                                                          columns=wikidata_dump.EVENT_COLUMNS)),
+                'people': self._clean_people(pd.DataFrame(chunk.people,
+                                                          columns=wikidata_dump.PEOPLE_COLUMNS)),
+            }
+            for table, df in tables.items():
+                if df.empty:
+                    continue
+                df[self.TABLE_COLUMNS[table]].to_csv(tmp_files[table], mode='a', header=False,
+                                                     index=False)
+                written[table] += len(df)
+
+        for table, path in files.items():
+            os.replace(tmp_files[table], path)
+            if not written[table]:
+                print(f"Nenhum registro de {table} no dump: {self.dump_path}")
+        return {'lines': lines, 'events': written['events'], 'people': written['people'],
+                'seconds': round(time.perf_counter() - start, 3), 'files': files}
+
+    def _load_table(self, table: str, event_classes: Optional[Sequence[str]]) -> pd.DataFrame:
+        """Tabela em cache, lendo o dump se ela ainda não existir."""
+        filename = self._table_files(event_classes)[table]
+        cached = self._load_cache(filename)
+        if cached is None:
+            self.ingest(event_classes)
+            cached = self._load_cache(filename)
+        return cached
+
+    def collect_historical_events(self, limit: Optional[int] = None,
+                                  event_classes: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Eventos do dump (entidades com P585).
+
+        Args:
+            limit: Se dado, os `limit` eventos mais recentes, como no SPARQL
+            event_classes: QIDs aceitos em P31 (None: qualquer)
+
+        Returns:
+            DataFrame com eventos
+        """
+        df = self._load_table('events', event_classes)
+        if limit is not None and not df.empty:
+            df = df.sort_values('date', ascending=False, kind='stable').head(limit).reset_index(drop=True)
+        return df
+
+    def collect_people(self, require_death: bool = False) -> pd.DataFrame:
+        """
+        Humanos do dump com data de nascimento.
+
+        Args:
+            require_death: Se True, só pessoas com data de morte
+
+        Returns:
+            DataFrame com pessoas e datas
+        """
+        df = self._load_table('people', None)
+        if require_death and not df.empty:
+            df = df[df['deathDate'].notna()].reset_index(drop=True)
         return df
 
 
@@ -189,6 +570,10 @@ class OurWorldInDataCollector(DataProcessor):
 
     BASE_URL = "https://ourworldindata.org/grapher/"
 
+    # URL específica para dados de conflitos
+    # Nota: OWID usa URLs específicas por dataset
+    CONFLICTS_URL = "https://raw.githubusercontent.com/owid/owid-datasets/master/datasets/Number%20of%20ongoing%20conflicts%20by%20type%20(UCDP)/Number%20of%20ongoing%20conflicts%20by%20type%20(UCDP).csv"
+
     def collect_conflicts_data(self) -> pd.DataFrame:
         """
         Coleta dados de conflitos e guerras.
@@ -201,12 +586,10 @@ class OurWorldInDataCollector(DataProcessor):
         if cached is not None:
             return cached
 
-        # URL específica para dados de conflitos
-        # Nota: OWID usa URLs específicas por dataset
-        url = "https://raw.githubusercontent.com/owid/owid-datasets/master/datasets/Number%20of%20ongoing%20conflicts%20by%20type%20(UCDP)/Number%20of%20ongoing%20conflicts%20by%20type%20(UCDP).csv"
-
         try:
-            df = pd.read_csv(url)
+            response = self.session.get(self.CONFLICTS_URL, timeout=60)
+            response.raise_for_status()
+            df = pd.read_csv(io.StringIO(response.text))
             self._save_cache(df, cache_file)
             return df
         except Exception as e:
@@ -219,7 +602,44 @@ class GDELTCollector(DataProcessor):
     Coletor de dados do GDELT Project.
     """
 
-    BASE_URL = "http://data.gdeltproject.org/gdeltv2/"
+    # Arquivos diários do GDELT 1.0 ('events/YYYYMMDD.export.CSV.zip'); o
+    # GDELT 2.0 ('gdeltv2/') só publica arquivos de 15 minutos
+    # ('YYYYMMDDHHMMSS.export.CSV.zip'), lidos por `stream_updates`
+    BASE_URL = "http://data.gdeltproject.org/events/"
+
+    # Colunas do arquivo de exportação (sem cabeçalho, separado por
+    # tabulação) mantidas na coleta: posição -> nome. As posições 0-34 são
+    # as mesmas no GDELT 1.0 (57-58 colunas) e no 2.0 (61 colunas)
+    EXPORT_COLUMNS = {
+        0: 'GlobalEventID',
+        1: 'SQLDATE',
+        26: 'EventCode',
+        28: 'EventRootCode',
+        29: 'QuadClass',
+        30: 'GoldsteinScale',
+        31: 'NumMentions',
+        34: 'AvgTone',
+    }
+
+    @classmethod
+    def parse_export(cls, payload: bytes) -> pd.DataFrame:
+        """
+        Lê um arquivo de exportação GDELT compactado (zip com um CSV).
+
+        Args:
+            payload: Conteúdo do arquivo .zip
+
+        Returns:
+            DataFrame com as colunas de EXPORT_COLUMNS e 'date' ('YYYY-MM-DD')
+        """
+        with zipfile.ZipFile(io.BytesIO(payload)) as archive:
+            with archive.open(archive.namelist()[0]) as f:
+                df = pd.read_csv(f, sep='\t', header=None, usecols=list(cls.EXPORT_COLUMNS),
+                                 dtype={1: str, 26: str, 28: str}, quoting=3)
+        df = df.rename(columns=cls.EXPORT_COLUMNS)
+        day = df['SQLDATE'].str
+        df['date'] = day[:4] + '-' + day[4:6] + '-' + day[6:8]
+        return df
 
     def collect_daily_events(self, date: str) -> pd.DataFrame:
         """
@@ -236,26 +656,67 @@ class GDELTCollector(DataProcessor):
         if cached is not None:
             return cached
 
-        # GDELT usa arquivos zip diários
+        # Um zip por dia, com os eventos adicionados naquele dia
         filename = f"{date}.export.CSV.zip"
         url = f"{self.BASE_URL}{filename}"
 
         try:
-            # Para simplificar, vamos usar uma abordagem diferente
-            # GDELT tem API limitada, então vamos simular com dados de exemplo
-            print(f"GDELT requer download manual. URL: {url}")
-            return pd.DataFrame()
+            response = self.session.get(url, timeout=120)
+            response.raise_for_status()
+            df = self.parse_export(response.content)
+            self._save_cache(df, cache_file)
+            return df
         except Exception as e:
             print(f"Erro ao coletar GDELT: {e}")
             return pd.DataFrame()
 
+    def stream_updates(self, directory: Optional[str] = None, poll_interval: float = 60.0,
+                       window_hours: float = 24.0, half_life_hours: float = 6.0,
+                       max_batches: Optional[int] = None,
+                       idle_timeout: Optional[float] = None) -> Iterator[Dict]:
+        """
+        Modo contínuo: analisa cada atualização de 15 minutos assim que chega.
+
+        Consulta o feed 'lastupdate.txt' do GDELT 2.0 (ou, com `directory`,
+        arquivos '*.export.CSV.zip' que aparecem em um diretório local) e
+        mantém acumuladores de janela deslizante e com decaimento
+        exponencial da distribuição de Anos Pessoais.
+
+        Args:
+            directory: Diretório local no lugar do feed HTTP
+            poll_interval: Segundos entre consultas sem lotes novos
+            window_hours: Largura da janela deslizante, em horas
+            half_life_hours: Meia-vida do decaimento, em horas
+            max_batches: Para após este número de lotes (None: sem limite)
+            idle_timeout: Para após tantos segundos sem lotes novos (None: nunca)
+
+        Yields:
+            Instantâneos por lote (ver `streaming.StreamingMonitor.process`)
+        """
+        feed = (streaming.DirectoryFeed(directory) if directory is not None
+                else streaming.GDELTUpdateFeed(self.session))
+        monitor = streaming.StreamingMonitor(window_hours * 3600, half_life_hours * 3600)
+        return streaming.run_stream(feed, self.parse_export, monitor, poll_interval,
+                                    max_batches, idle_timeout)
+
 
 class NumerologyDataAnalyzer:
     """
     Analisador que combina dados históricos com cálculos numerológicos.
     """
 
-    def __init__(self):
+    def __init__(self, state_dir: str = "data/cache", null_cache=None,
+                 catalog: Optional[DatasetCatalog] = None):
+        """
+        Inicializa o analisador.
+
+        Args:
+            state_dir: Diretório para o estado da análise incremental
+            null_cache: NullDistributionCache opcional; se dado, os testes
+                incluem o p-valor de Monte Carlo ('p_value_mc') consultado nele
+            catalog: DatasetCatalog de `load_dataset` (padrão: catálogo do
+                diretório pai de `state_dir` e do próprio `state_dir`)
+        """
         try:
             from .numerology_calculator import NumerologyCalculator
         except ImportError:
@@ -268,90 +729,735 @@ class NumerologyDataAnalyzer:
             'owid': OurWorldInDataCollector(),
             'gdelt': GDELTCollector()
         }
+        self.state_dir = state_dir
+        os.makedirs(state_dir, exist_ok=True)
+        self.null_cache = null_cache
+        self._calendar_profiler = None
+        self._catalog = catalog
+
+    # Colunas do evento original preservadas como categóricas na análise
+    PASSTHROUGH_COLUMNS = ('category', 'impact', 'source')
 
-    def analyze_event_cycles(self, events_df: pd.DataFrame) -> pd.DataFrame:
+    def analyze_event_cycles(self, events_df: pd.DataFrame, compact: bool = True,
+                             keep_labels: bool = True) -> pd.DataFrame:
         """
         Analisa ciclos numerológicos de eventos históricos.
 
+        O cálculo é vetorizado sobre a coluna de datas, decomposta por
+        `parse_dates` (inclusive anos fora da faixa do pandas). No layout
+        compacto (padrão) o resultado usa datetime64[s] para 'date', int16 para 'year',
+        uint8 para 'ano_pessoal' e categorias para tipo, rótulo, categoria,
+        impacto e fonte, ocupando uma fração da memória do layout legado.
+
         Args:
-            events_df: DataFrame com eventos (coluna 'date' obrigatória)
+            events_df: DataFrame com eventos (coluna 'date' obrigatória), no
+                formato de uma fonte ou no esquema canônico, ou EventStore
+                já analisado
+            compact: Se True, usa o layout compacto de tipos
+            keep_labels: Se False, descarta a coluna 'event_label'
 
         Returns:
             DataFrame com análise numerológica
         """
+        if isinstance(events_df, EventStore):
+            return events_df.to_frame()
+
         if events_df.empty or 'date' not in events_df.columns:
             return pd.DataFrame()
 
-        analysis = []
+        parsed = parse_dates(events_df['date'])
+        valid = parsed.valid
+
+        events = events_df[valid]
+        years = parsed.year[valid]
+
+        # Usando uma data de nascimento genérica para análise coletiva
+        # Na prática, isso seria feito por pessoa ou grupo
+        anos_pessoais = self.calc.calcular_ano_pessoal_array("2000-01-01", years)
+
+        columns = {
+            'date': events['date'].to_numpy(),
+            'year': years,
+            'ano_pessoal': anos_pessoais,
+            'event_type': self._column_or_default(events, ('typeLabel', 'event_type')),
+        }
+        if keep_labels:
+            columns['event_label'] = self._column_or_default(events, ('eventLabel', 'event_label'))
+        for column in self.PASSTHROUGH_COLUMNS:
+            if column in events.columns:
+                columns[column] = events[column].to_numpy()
+
+        analysis = pd.DataFrame(columns)
+
+        if compact:
+            analysis['date'] = to_datetime64(parsed)[valid]
+            analysis['year'] = self._downcast_int(analysis['year'], np.int16)
+            analysis['ano_pessoal'] = self._downcast_int(analysis['ano_pessoal'], np.uint8)
+            for column in ('event_type', 'event_label') + self.PASSTHROUGH_COLUMNS:
+                if column in analysis.columns:
+                    analysis[column] = analysis[column].astype('category')
+
+        return analysis
+
+    @staticmethod
+    def _column_or_default(df: pd.DataFrame, candidates: Sequence[str],
+                           default: str = 'unknown') -> np.ndarray:
+        """Retorna os valores da primeira coluna candidata presente ou um array com o padrão."""
+        for column in candidates:
+            if column in df.columns:
+                return df[column].to_numpy()
+        return np.full(len(df), default, dtype=object)
+
+    @staticmethod
+    def _downcast_int(values: pd.Series, dtype) -> pd.Series:
+        """Converte para o dtype inteiro indicado se todos os valores couberem nele."""
+        info = np.iinfo(dtype)
+        if values.empty or (values.min() >= info.min and values.max() <= info.max):
+            return values.astype(dtype)
+        return values
+
+    def analyze_life_events(self, people_df: pd.DataFrame, event_column: str = 'deathDate',
+                            birth_column: str = 'birthDate', compact: bool = True) -> pd.DataFrame:
+        """
+        Calcula os ciclos de cada pessoa na data de um evento da própria vida.
+
+        Diferente de `analyze_event_cycles` (data de nascimento genérica), o
+        Número do Destino vem do nascimento de cada pessoa, e Ano, Mês e Dia
+        Pessoal são os dela na data do evento (por padrão, a morte). Tudo é
+        vetorizado sobre as colunas de datas.
 
-        for _, event in events_df.iterrows():
-            try:
-                date_str = str(event['date'])[:10]  # YYYY-MM-DD
-                year = int(date_str[:4])
+        Pessoas sem data de nascimento completa (mês ou dia 0) ou sem data
+        do evento ficam de fora. Com mês ou dia do evento desconhecido, o
+        Mês/Dia Pessoal correspondente vale 0 (fora dos testes).
 
-                # Calcular ano pessoal para o ano do evento
-                # Usando uma data de nascimento genérica para análise coletiva
-                # Na prática, isso seria feito por pessoa ou grupo
-                ano_pessoal = self.calc.calcular_ano_pessoal("2000-01-01", year)
+        Args:
+            people_df: DataFrame de pessoas (ex: `collect_people_by_birth_year`)
+            event_column: Coluna com a data do evento
+            birth_column: Coluna com a data de nascimento
+            compact: Se True, usa o layout compacto de tipos
 
-                analysis.append({
-                    'date': event['date'],
-                    'year': year,
-                    'ano_pessoal': ano_pessoal,
-                    'event_type': event.get('typeLabel', 'unknown'),
-                    'event_label': event.get('eventLabel', 'unknown')
-                })
+        Returns:
+            DataFrame com 'person' (se houver), 'birth_date', 'date', 'year',
+            'birth_decade', 'age', 'numero_destino', 'ano_pessoal',
+            'mes_pessoal' e 'dia_pessoal'
+        """
+        if people_df.empty or event_column not in people_df.columns:
+            return pd.DataFrame()
+
+        birth = parse_dates(people_df[birth_column])
+        event = parse_dates(people_df[event_column])
+        valid = birth.valid & event.valid & (birth.month > 0) & (birth.day > 0)
+
+        by, bm, bd = birth.year[valid], birth.month[valid], birth.day[valid]
+        ey, em, ed = event.year[valid], event.month[valid], event.day[valid]
+        destinos = self.calc.calcular_numero_destino_array(by, bm, bd)
+        anos, meses, dias = self.calc.calcular_ciclos_pessoais_array(destinos, ey, em, ed)
+        meses = np.where(em > 0, meses, 0)
+        dias = np.where((em > 0) & (ed > 0), dias, 0)
+        # Idade completa: um ano a menos se o evento é antes do aniversário
+        age = ey - by - ((em * 100 + ed) < (bm * 100 + bd))
+
+        columns = {}
+        if 'person' in people_df.columns:
+            columns['person'] = people_df['person'].to_numpy()[valid]
+        # Layout compacto: datetime64[s]; legado: texto 'YYYY-MM-DD'
+        as_dates = to_datetime64 if compact else format_iso
+        columns.update({
+            'birth_date': as_dates(birth)[valid],
+            'date': as_dates(event)[valid],
+            'year': ey,
+            'birth_decade': (by // 10) * 10,
+            'age': age,
+            'numero_destino': destinos,
+            'ano_pessoal': anos,
+            'mes_pessoal': meses,
+            'dia_pessoal': dias,
+        })
+        analysis = pd.DataFrame(columns)
 
-            except Exception as e:
-                continue
+        if compact:
+            for column in ('year', 'birth_decade', 'age'):
+                analysis[column] = self._downcast_int(analysis[column], np.int16)
+            for column in ('numero_destino', 'ano_pessoal', 'mes_pessoal', 'dia_pessoal'):
+                analysis[column] = analysis[column].astype(np.uint8)
 
-        return pd.DataFrame(analysis)
+        return analysis
 
-    def test_hypothesis_ano_9(self, analysis_df: pd.DataFrame) -> Dict:
+    @staticmethod
+    def memory_report(analysis_df: pd.DataFrame) -> Dict:
+        """
+        Relatório de memória por coluna de um DataFrame de análise.
+
+        Args:
+            analysis_df: DataFrame a ser medido
+
+        Returns:
+            Dicionário com bytes por coluna, total e bytes por linha
+        """
+        usage = analysis_df.memory_usage(index=False, deep=True)
+        total = int(usage.sum())
+        return {
+            'columns': {column: int(nbytes) for column, nbytes in usage.items()},
+            'dtypes': {column: str(dtype) for column, dtype in analysis_df.dtypes.items()},
+            'total_bytes': total,
+            'bytes_per_row': round(total / len(analysis_df), 2) if len(analysis_df) else 0.0
+        }
+
+    def test_hypothesis_ano_9(self, analysis_df: pd.DataFrame, approximate: bool = False,
+                              expected=None, **approximate_options) -> Dict:
         """
         Testa a hipótese de concentração de eventos no Ano Pessoal 9.
 
         Args:
-            analysis_df: DataFrame com análise numerológica
+            analysis_df: DataFrame com análise numerológica ou EventStore
+            approximate: Se True, estima a partir de uma amostra (ver
+                `approximate_hypothesis_ano_9`, que recebe as demais opções)
+            expected: Linha de base da nula: None (uniforme 1/9), 'calendar'
+                (probabilidades exatas para os dias do intervalo de anos
+                observado, ver `calendar_baseline`) ou 9 probabilidades
 
         Returns:
             Dicionário com resultados estatísticos
         """
-        if analysis_df.empty:
+        if approximate and not isinstance(analysis_df, EventStore):
+            return self.approximate_hypothesis_ano_9(analysis_df, **approximate_options)
+
+        if isinstance(analysis_df, EventStore):
+            years, anos = analysis_df.year, analysis_df.ano_pessoal
+            accumulator = analysis_df.accumulator()
+        elif analysis_df.empty:
+            return {}
+        else:
+            years, anos = analysis_df['year'].to_numpy(), analysis_df['ano_pessoal'].to_numpy()
+            accumulator = AnoPessoalAccumulator.from_analysis(analysis_df)
+
+        if isinstance(expected, str):
+            if expected != 'calendar':
+                raise ValueError(f"Linha de base não suportada: {expected}")
+            # Só os eventos contados (Ano Pessoal 1-9) definem o intervalo de anos
+            years = years[(anos >= 1) & (anos <= 9)]
+            expected = self.calendar_baseline(int(years.min()), int(years.max())) if len(years) else None
+        return self.hypothesis_from_counts(accumulator, expected)
+
+    def calendar_baseline(self, year_min: int, year_max: int) -> np.ndarray:
+        """
+        Probabilidades exatas de cada Ano Pessoal (1-9) para eventos
+        distribuídos uniformemente pelos dias de `year_min` a `year_max`.
+
+        Vêm do perfil exaustivo do calendário, cacheado em
+        '<state_dir>/calendar_profiles'.
+
+        Returns:
+            Array com 9 probabilidades
+        """
+        if self._calendar_profiler is None:
+            self._calendar_profiler = CalendarProfiler(os.path.join(self.state_dir, 'calendar_profiles'))
+        return self._calendar_profiler.expected_probabilities(year_min, year_max)
+
+    def load_dataset(self, name: str, schema: str = 'events') -> pd.DataFrame:
+        """
+        Carrega um dataset registrado pelo nome (ex: 'historical_events_5000_synthetic').
+
+        A primeira leitura interpreta o CSV e grava um snapshot binário; as
+        seguintes abrem o snapshot em memory-map, enquanto o arquivo não mudar.
+
+        Args:
+            name: Nome do dataset no catálogo
+            schema: 'events' (esquema canônico) ou 'raw' (colunas do CSV)
+
+        Returns:
+            DataFrame do dataset
+        """
+        if self._catalog is None:
+            data_dir = os.path.dirname(os.path.normpath(self.state_dir)) or '.'
+            self._catalog = DatasetCatalog((data_dir, self.state_dir),
+                                           os.path.join(self.state_dir, 'snapshots'))
+        return self._catalog.load(name, schema)
+
+    def _anos_pessoais(self, events: pd.DataFrame) -> np.ndarray:
+        """Ano Pessoal de cada linha (-1 para datas inválidas), sem descartar linhas."""
+        if 'ano_pessoal' in events.columns:
+            return events['ano_pessoal'].to_numpy(dtype=np.int64)
+        parsed = parse_dates(events['date'])
+        anos = np.full(len(events), -1, dtype=np.int64)
+        anos[parsed.valid] = self.calc.calcular_ano_pessoal_array("2000-01-01", parsed.year[parsed.valid])
+        return anos
+
+    def approximate_hypothesis_ano_9(self, events, precision: Optional[float] = None, confidence: float = 0.95,
+                                     stratify_by: Optional[str] = None, initial_sample: int = 2000,
+                                     max_sample: int = 1_000_000, seed: Optional[int] = None,
+                                     chunksize: int = 100_000) -> Dict:
+        """
+        Estima a hipótese do Ano 9 a partir de uma amostra, com intervalos de confiança.
+
+        Para dados em memória, sorteia linhas (com reposição, opcionalmente
+        estratificadas) e calcula o Ano Pessoal apenas delas; a amostra
+        cresce até a maior margem de erro das proporções dos anos 1-9 ficar
+        abaixo de `precision`, então o custo depende da precisão pedida e
+        não do tamanho da entrada. Para um CSV, faz uma única passada com
+        amostra de reservatório de `max_sample` linhas: a leitura em ordem
+        não permite parar antes do fim sem viés, então não há precisão alvo
+        nem estratos (passá-los com um caminho levanta ValueError); a
+        margem de erro obtida é informada.
+
+        Os testes (z, qui-quadrado, p-valor) são calculados sobre a amostra
+        efetiva e continuam válidos, com menos poder que os exatos.
+
+        Args:
+            events: DataFrame de eventos (coluna 'date') ou de análise
+                (coluna 'ano_pessoal'), ou caminho de um CSV de eventos
+            precision: Margem de erro máxima desejada (proporção; padrão 0.005)
+            confidence: Nível de confiança dos intervalos
+            stratify_by: Coluna de estratos ('decade' é derivada de 'year')
+            initial_sample: Tamanho da primeira rodada de sorteio
+            max_sample: Tamanho máximo da amostra
+            seed: Semente do sorteio
+            chunksize: Linhas por bloco ao ler um CSV
+
+        Returns:
+            Dicionário com os resultados de `hypothesis_from_counts` e as
+            estimativas com intervalos de confiança
+
+        Raises:
+            ValueError: `precision` ou `stratify_by` com o caminho de um CSV
+        """
+        if isinstance(events, str):
+            if precision is not None or stratify_by is not None:
+                raise ValueError("precision e stratify_by não se aplicam a um CSV, lido em uma única "
+                                 "passada; ajuste max_sample ou carregue os eventos em memória")
+            events = reservoir_sample(pd.read_csv(events, chunksize=chunksize), max_sample, seed)
+            population = events.attrs['population_size']
+            initial_sample = max_sample = len(events)
+        else:
+            population = len(events)
+            precision = 0.005 if precision is None else precision
+        if events.empty:
             return {}
 
-        # Contar frequência por ano pessoal
-        counts = analysis_df['ano_pessoal'].value_counts().sort_index()
+        strata = None
+        if stratify_by == 'decade' and 'decade' not in events.columns:
+            strata = (events['year'].to_numpy(dtype=np.int64) // 10) * 10
+        elif stratify_by is not None:
+            strata = events[stratify_by].to_numpy()
+
+        sampler = StratifiedSampler(len(events), strata, seed)
+        anos, stratum = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        target = min(initial_sample, max_sample)
+        while True:
+            # Sem estratos, uma amostra do tamanho da entrada vira contagem exata
+            exhaustive = strata is None and target >= len(events)
+            if exhaustive:
+                positions = np.arange(len(events))
+                drawn_strata = np.zeros(len(events), dtype=np.int64)
+                anos, stratum = anos[:0], stratum[:0]
+            else:
+                positions, drawn_strata = sampler.draw(target - len(anos))
+            anos = np.concatenate([anos, self._anos_pessoais(events.iloc[positions])])
+            stratum = np.concatenate([stratum, drawn_strata])
+
+            estimate = estimate_proportions(anos, stratum, sampler.weights, confidence)
+            margin = 0.0 if exhaustive and population == len(events) else float(estimate.margin[1:10].max())
+            if exhaustive or margin <= precision or len(anos) >= max_sample:
+                break
+            # Próxima rodada: tamanho projetado pela margem atual (erro ~ 1/sqrt(n))
+            target = int(min(max_sample, max(2 * len(anos), len(anos) * 1.1 * (margin / precision) ** 2)))
+
+        counts = np.round(estimate.proportions * estimate.sample_size).astype(np.int64)
+        result = self.hypothesis_from_counts(AnoPessoalAccumulator(counts, int(counts.sum())))
+        if not result:
+            return result
+
+        margins = estimate.margin if margin > 0 else np.zeros_like(estimate.margin)
+        lower = np.clip(estimate.proportions - margins, 0, 1)
+        upper = np.clip(estimate.proportions + margins, 0, 1)
+        valid_population = population * estimate.valid_fraction
+        result.update({
+            'approximate': True,
+            'population_size': population,
+            'sample_size': len(anos),
+            'confidence': confidence,
+            'ano_9_percentage': round(float(estimate.proportions[9]) * 100, 2),
+            'ano_9_percentage_ci': (round(float(lower[9]) * 100, 2), round(float(upper[9]) * 100, 2)),
+            'concentration_ratio_ci': (float(lower[9] * 9), float(upper[9] * 9)),
+            'proportions_ci': {ano: (float(lower[ano]), float(upper[ano])) for ano in range(1, 10)},
+            'estimated_counts_by_ano': {ano: int(round(valid_population * estimate.proportions[ano]))
+                                        for ano in range(1, 10)},
+            'margin_of_error': margin,
+            'precision': precision,
+            'precision_reached': margin <= precision if precision is not None else None
+        })
+        return result
+
+    def hypothesis_from_counts(self, accumulator: AnoPessoalAccumulator, expected=None) -> Dict:
+        """
+        Calcula as estatísticas da hipótese do Ano 9 a partir de contagens.
 
-        # Calcular estatísticas
-        total_events = len(analysis_df)
-        ano_9_count = counts.get(9, 0)
-        ano_9_percentage = (ano_9_count / total_events) * 100 if total_events > 0 else 0
+        O custo é constante: depende apenas das 9 contagens, não do número
+        de eventos que as originaram.
+
+        Args:
+            accumulator: Contagens acumuladas por Ano Pessoal
+            expected: Probabilidades dos Anos Pessoais 1-9 sob a nula (ex:
+                `calendar_baseline`); padrão: uniforme 1/9
 
-        # Distribuição esperada (uniforme)
-        expected_per_ano = total_events / 9
-        expected_ano_9 = expected_per_ano
+        Returns:
+            Dicionário com resultados estatísticos
+        """
+        total_events = accumulator.total
+        if total_events == 0:
+            return {}
+
+        ano_9_count = int(accumulator.counts[9])
+        ano_9_percentage = (ano_9_count / total_events) * 100
+
+        # Distribuição esperada (uniforme, ou a linha de base exata dada)
+        if expected is None:
+            p_ano_9 = 1 / 9
+        else:
+            expected = np.asarray(expected, dtype=float)
+            expected = expected / expected.sum()
+            p_ano_9 = expected[8]
+        expected_uniform = total_events / 9
+        expected_ano_9 = total_events * p_ano_9
 
         # Teste simples: diferença da média
         deviation = ano_9_count - expected_ano_9
 
-        return {
+        # Z-score binomial do Ano 9 e qui-quadrado contra a nula (anos 1-9)
+        z_score = deviation / np.sqrt(total_events * p_ano_9 * (1 - p_ano_9))
+        observed = accumulator.counts[1:10]
+        if observed.sum() == 0:
+            chi_square_stat, p_value = 0.0, 1.0
+        elif expected is None:
+            chi_square_stat, p_value = stats.chisquare(observed)
+        else:
+            chi_square_stat, p_value = stats.chisquare(observed, expected * observed.sum())
+
+        result = {
             'total_events': total_events,
             'ano_9_count': ano_9_count,
             'ano_9_percentage': round(ano_9_percentage, 2),
-            'expected_uniform': round(expected_ano_9, 2),
+            'expected_uniform': round(expected_uniform, 2),
             'deviation': round(deviation, 2),
-            'counts_by_ano': counts.to_dict(),
+            'z_score': float(z_score),
+            'concentration_ratio': ano_9_count / expected_ano_9,
+            'chi_square_stat': float(chi_square_stat),
+            'p_value': float(p_value),
+            'distribution_uniform': bool(p_value > 0.05),
+            'counts_by_ano': accumulator.counts_by_ano(),
             'hypothesis_supported': ano_9_count > expected_ano_9 * 1.2  # 20% acima da média
         }
+        if expected is not None:
+            result['expected_ano_9'] = round(expected_ano_9, 2)
+            result['expected_probabilities'] = expected.tolist()
+        elif self.null_cache is not None:
+            # p-valor de Monte Carlo do qui-quadrado, da nula cacheada para este n
+            result['p_value_mc'] = self.null_cache.p_value(observed)
+        return result
+
+    def slice_hypotheses(self, accumulator: AnoPessoalAccumulator, dimension: str) -> Dict:
+        """
+        Estatísticas da hipótese para cada fatia de uma dimensão.
 
-    def collect_and_analyze(self, source: str = 'wikidata', limit: int = 1000) -> Dict:
+        Args:
+            accumulator: Acumulador com contagens por fatia
+            dimension: Dimensão das fatias (ex: 'decade', 'category')
+
+        Returns:
+            Dicionário {valor da fatia: resultados estatísticos}
+        """
+        return {
+            key: self.hypothesis_from_counts(accumulator.slice_accumulator(dimension, key))
+            for key in accumulator.slices.get(dimension, {})
+        }
+
+    def count_regression(self, data, covariates: Sequence[str] = count_models.DEFAULT_COVARIATES,
+                         slice_by: Optional[str] = None, family: str = 'poisson',
+                         exposure: bool = True, year_range: Optional[Tuple[int, int]] = None) -> Dict:
+        """
+        Efeito do Ano Pessoal nas contagens, controlado por covariáveis (GLM).
+
+        Ajusta, em lote para todas as fatias, log E[n] = log(exposição) +
+        Ano Pessoal + covariáveis (efeitos principais) sobre a tabela de
+        contingência das contagens (ver `count_models`). A exposição são os
+        anos do calendário com cada Ano Pessoal em cada década coberta; é
+        ela que faz a década ajustar o efeito do Ano Pessoal.
+
+        Args:
+            data: DataFrame de análise ou AnoPessoalAccumulator com a fatia
+                cruzada `(slice_by, *covariates)`
+            covariates: Covariáveis (as ausentes no DataFrame são ignoradas)
+            slice_by: Dimensão das fatias ajustadas separadamente (ex: 'source')
+            family: 'poisson' ou 'negbin' (binomial negativa, com superdispersão)
+            exposure: Se False, ajusta sem offset de exposição
+            year_range: Primeiro e último ano cobertos (padrão: os do
+                DataFrame; para um acumulador, décadas inteiras)
+
+        Returns:
+            Resultado de `count_models.fit_count_models`
+        """
+        if isinstance(data, pd.DataFrame):
+            available = set(data.columns) | ({'decade'} if 'year' in data.columns else set())
+            covariates = [column for column in covariates
+                          if column in available and column != slice_by]
+            if year_range is None and 'year' in data.columns and len(data):
+                year_range = (int(data['year'].min()), int(data['year'].max()))
+            columns = tuple(([slice_by] if slice_by else []) + covariates)
+            data = AnoPessoalAccumulator.from_analysis(data, [columns] if len(columns) > 1 else columns)
+        table = count_models.count_table(data, covariates, slice_by)
+        offset = None
+        if exposure:
+            offset = count_models.calendar_exposure(
+                table.levels, table.covariates,
+                lambda years: self.calc.calcular_ano_pessoal_array("2000-01-01", years), year_range)
+        return count_models.fit_count_models(table, family, exposure=offset)
+
+    def life_event_hypotheses(self, life_df: pd.DataFrame,
+                              slice_by: Sequence[str] = ('birth_decade',)) -> Dict:
+        """
+        Testa a concentração no ciclo 9 dos eventos de vida de cada pessoa.
+
+        Os mesmos testes dos eventos históricos, aplicados ao Ano, ao Mês e
+        ao Dia Pessoal de cada pessoa na data do evento.
+
+        Args:
+            life_df: Saída de `analyze_life_events`
+            slice_by: Dimensões das fatias do Ano Pessoal (ex: 'birth_decade')
+
+        Returns:
+            Dicionário com as hipóteses de 'ano_pessoal', 'mes_pessoal' e
+            'dia_pessoal' e, em 'slices', as hipóteses do Ano Pessoal por fatia
+        """
+        if life_df.empty:
+            return {}
+        accumulator = AnoPessoalAccumulator.from_analysis(life_df, slice_by)
+        result = {'ano_pessoal': self.hypothesis_from_counts(accumulator)}
+        for column in ('mes_pessoal', 'dia_pessoal'):
+            counts = AnoPessoalAccumulator._histogram(life_df[column].to_numpy(dtype=np.int64))
+            # Ciclo 0 (mês/dia do evento desconhecido) fica fora do total
+            counts[0] = 0
+            result[column] = self.hypothesis_from_counts(AnoPessoalAccumulator(counts, counts.sum()))
+        result['slices'] = {dimension: self.slice_hypotheses(accumulator, dimension)
+                            for dimension in slice_by}
+        return result
+
+    def analyze_by_decade(self, analysis_df: pd.DataFrame) -> Dict:
+        """
+        Testa a hipótese do Ano 9 separadamente para cada década.
+
+        Args:
+            analysis_df: DataFrame com análise numerológica ou EventStore
+
+        Returns:
+            Dicionário {década: resultados estatísticos}
+        """
+        if isinstance(analysis_df, EventStore):
+            return self.slice_hypotheses(analysis_df.decade_accumulator(), 'decade')
+
+        if analysis_df.empty:
+            return {}
+        accumulator = AnoPessoalAccumulator.from_analysis(analysis_df, slice_by=('decade',))
+        return self.slice_hypotheses(accumulator, 'decade')
+
+    def analyze_in_chunks(self, source, chunksize: int = 100_000, writer=None,
+                          slice_by: Sequence[str] = ('decade',), workers: int = 0,
+                          queue_size: int = 4) -> Dict:
+        """
+        Analisa eventos em blocos, sem manter a análise inteira em memória.
+
+        Cada bloco é analisado, enviado ao gravador (se houver) assim que
+        fica pronto e somado ao acumulador; a hipótese é calculada uma vez,
+        a partir das contagens.
+
+        Com `workers` > 0, leitura, análise e gravação rodam sobrepostas em
+        um `pipeline.Pipeline` (leitor com pré-busca, `workers` threads de
+        análise e gravador assíncrono, com filas limitadas); o resultado é o
+        mesmo da execução serial.
+
+        Args:
+            source: Caminho de um CSV de eventos ou iterável de DataFrames
+            chunksize: Linhas por bloco ao ler um CSV
+            writer: Gravador com método `write` (ex: PartitionedWriter)
+            slice_by: Dimensões das fatias acumuladas
+            workers: Threads de análise do pipeline (0: execução serial)
+            queue_size: Blocos pré-lidos à frente da análise
+
+        Returns:
+            Dicionário com a hipótese, o acumulador e o número de linhas
+            (e, no pipeline, a utilização de cada estágio em 'pipeline')
+        """
+        chunks = pd.read_csv(source, chunksize=chunksize) if isinstance(source, str) else source
+        accumulator = AnoPessoalAccumulator()
+        rows = 0
+
+        def process(events: pd.DataFrame):
+            analysis = self.analyze_event_cycles(events)
+            if analysis.empty:
+                return None
+            return analysis, AnoPessoalAccumulator.from_analysis(analysis, slice_by)
+
+        def consume(result):
+            nonlocal rows
+            if result is None:
+                return
+            analysis, counts = result
+            if writer is not None:
+                writer.write(analysis)
+            accumulator.merge(counts)
+            rows += len(analysis)
+
+        pipeline_stats = None
+        if workers > 0:
+            pipeline_stats = Pipeline(chunks, process, consume, workers, queue_size).run()
+        else:
+            for events in chunks:
+                consume(process(events))
+
+        result = {
+            'hypothesis_test': self.hypothesis_from_counts(accumulator) if rows else {},
+            'accumulator': accumulator,
+            'rows': rows
+        }
+        if pipeline_stats is not None:
+            result['pipeline'] = pipeline_stats
+        return result
+
+    def _state_file(self, state_name: str) -> str:
+        """Retorna caminho do arquivo de estado incremental."""
+        return os.path.join(self.state_dir, f"analysis_state_{state_name}.json")
+
+    def load_incremental_state(self, state_name: str) -> Optional[Dict]:
+        """
+        Carrega o estado incremental (acumuladores e watermark) persistido.
+
+        Args:
+            state_name: Nome do estado (ex: 'wikidata_1000')
+
+        Returns:
+            Dicionário com o estado ou None se não existir
+        """
+        path = self._state_file(state_name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        state['accumulator'] = AnoPessoalAccumulator.from_dict(state['accumulator'])
+        return state
+
+    def _save_incremental_state(self, state_name: str, state: Dict):
+        """Persiste o estado incremental de forma atômica."""
+        path = self._state_file(state_name)
+        payload = dict(state, accumulator=state['accumulator'].to_dict())
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _watermark_values(events_df: pd.DataFrame, column: str) -> pd.Series:
+        """Valores comparáveis da coluna de watermark ('date' vira 'YYYY-MM-DD')."""
+        if column == 'date':
+            return events_df['date'].astype(str).str[:10]
+        return events_df[column]
+
+    @staticmethod
+    def _row_keys(events_df: pd.DataFrame) -> pd.Series:
+        """
+        Chave de cada linha para desempatar linhas com o mesmo watermark.
+
+        Usa a coluna 'event' (URI do Wikidata) se existir, senão um hash do
+        conteúdo da linha; o número da ocorrência distingue repetições.
+        """
+        if 'event' in events_df.columns:
+            base = events_df['event'].astype(str)
+        else:
+            base = pd.util.hash_pandas_object(events_df, index=False).astype(str)
+        occurrence = base.groupby(base.to_numpy()).cumcount().astype(str)
+        return base + '#' + occurrence
+
+    def analyze_incremental(self, events_df: pd.DataFrame, state_name: str = 'default',
+                            watermark_column: Optional[str] = None) -> Dict:
+        """
+        Analisa apenas os eventos posteriores ao último watermark processado.
+
+        Os novos eventos são analisados e somados aos acumuladores
+        persistidos; as estatísticas da hipótese são recalculadas a partir
+        das contagens acumuladas. Pressupõe um cache append-only em que
+        novas linhas têm watermark maior ou igual ao das já processadas.
+        O watermark não precisa ser único (ex: várias linhas com a mesma
+        'date'): as chaves das linhas já vistas no valor do watermark ficam
+        no estado, e linhas que chegam depois com esse mesmo valor ainda
+        são analisadas.
+
+        Args:
+            events_df: DataFrame com todos os eventos do cache
+            state_name: Nome do estado persistido
+            watermark_column: Coluna de watermark (padrão: 'event_id' se
+                existir, senão 'date')
+
+        Returns:
+            Dicionário com a análise dos novos eventos, a hipótese e o watermark
+        """
+        state = self.load_incremental_state(state_name)
+        if watermark_column is None:
+            watermark_column = state['watermark_column'] if state else (
+                'event_id' if 'event_id' in events_df.columns else 'date')
+        if state is None:
+            state = {
+                'watermark_column': watermark_column,
+                'watermark': None,
+                'watermark_keys': [],
+                'accumulator': AnoPessoalAccumulator()
+            }
+        elif state['watermark_column'] != watermark_column:
+            raise ValueError(f"Estado '{state_name}' usa watermark '{state['watermark_column']}', "
+                             f"não '{watermark_column}'")
+
+        new_events = events_df
+        if not events_df.empty:
+            marks = self._watermark_values(events_df, watermark_column)
+            keys = self._row_keys(events_df)
+            if state['watermark'] is not None:
+                # Empates com o watermark: novas só as linhas ainda não vistas
+                seen = set(state.get('watermark_keys', []))
+                is_new = ((marks > state['watermark'])
+                          | ((marks == state['watermark']) & ~keys.isin(seen))).to_numpy()
+                new_events, marks, keys = events_df[is_new], marks[is_new], keys[is_new]
+            if not new_events.empty:
+                watermark = marks.max()
+                watermark = watermark.item() if hasattr(watermark, 'item') else watermark
+                at_watermark = keys[(marks == watermark).to_numpy()].tolist()
+                if watermark == state['watermark']:
+                    state['watermark_keys'] = state.get('watermark_keys', []) + at_watermark
+                else:
+                    state['watermark_keys'] = at_watermark
+                state['watermark'] = watermark
+
+        analysis_df = self.analyze_event_cycles(new_events)
+        if not analysis_df.empty:
+            state['accumulator'].update(analysis_df['ano_pessoal'].to_numpy())
+
+        state['updated_at'] = datetime.now().isoformat()
+        self._save_incremental_state(state_name, state)
+
+        return {
+            'analysis_data': analysis_df,
+            'hypothesis_test': self.hypothesis_from_counts(state['accumulator']),
+            'new_events': len(new_events),
+            'watermark_column': watermark_column,
+            'watermark': state['watermark']
+        }
+
+    def collect_and_analyze(self, source: str = 'wikidata', limit: int = 1000,
+                            incremental: bool = False) -> Dict:
         """
         Pipeline completo: coleta dados e analisa.
 
         Args:
             source: Fonte de dados ('wikidata', 'owid', 'gdelt')
             limit: Limite de registros
+            incremental: Se True, analisa apenas eventos novos desde a última
+                execução e acumula as contagens persistidas
 
         Returns:
             Dicionário com dados e análise
@@ -371,11 +1477,17 @@ class NumerologyDataAnalyzer:
         if events_df.empty:
             return {'error': 'Nenhum dado coletado'}
 
-        print(f"Analisando {len(events_df)} eventos...")
-        analysis_df = self.analyze_event_cycles(events_df)
+        if incremental:
+            result = self.analyze_incremental(events_df, state_name=f"{source}_{limit}")
+            print(f"Analisados {result['new_events']} eventos novos de {len(events_df)}")
+            analysis_df = result['analysis_data']
+            hypothesis_test = result['hypothesis_test']
+        else:
+            print(f"Analisando {len(events_df)} eventos...")
+            analysis_df = self.analyze_event_cycles(events_df)
 
-        print("Testando hipótese do Ano 9...")
-        hypothesis_test = self.test_hypothesis_ano_9(analysis_df)
+            print("Testando hipótese do Ano 9...")
+            hypothesis_test = self.test_hypothesis_ano_9(analysis_df)
 
         return {
             'events_data': events_df,
@@ -383,4 +1495,4 @@ class NumerologyDataAnalyzer:
             'hypothesis_test': hypothesis_test,
             'source': source,
             'timestamp': datetime.now().isoformat()
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,261 @@
+"""
+PyNumerology-Matrix: Catálogo de Datasets com Snapshots Binários
+
+Este módulo registra os CSVs de 'data/' e 'data/cache' sob nomes estáveis
+(caminho relativo sem extensão, ex: 'historical_events_5000_synthetic' ou
+'cache/wikidata_events_100') e guarda, para cada conteúdo, um snapshot já
+interpretado: uma coluna por arquivo .npy (números, datas datetime64 e
+códigos de categorias) e um 'meta.json' com tipos e categorias. Os .npy
+são abertos com memory-map, então carregar um dataset depois da primeira
+vez não relê nem reinterpreta o CSV.
+
+Os snapshots são indexados pela impressão digital (BLAKE2b) do conteúdo do
+arquivo; alterar o CSV muda a impressão e o snapshot é refeito na próxima
+leitura. Para não refazer o hash a cada leitura, o catálogo lembra
+(tamanho, mtime) de cada arquivo e só recalcula quando eles mudam.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .event_schema import normalize_events
+except ImportError:
+    # Fallback para import direto se executado como script
+    from event_schema import normalize_events
+
+
+CATALOG_FILE = 'catalog.json'
+SCHEMAS = ('raw', 'events')
+
+
+def file_fingerprint(path: str, chunk_size: int = 1 << 20) -> str:
+    """Impressão digital BLAKE2b (128 bits) do conteúdo de um arquivo."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_snapshot(df: pd.DataFrame, directory: str, metadata: Optional[Dict] = None):
+    """
+    Grava um DataFrame como snapshot colunar (atomicamente).
+
+    Colunas numéricas, booleanas e datetime64 vão como estão; categóricas,
+    como códigos + categorias; textuais ('str'/object), também como
+    códigos + valores distintos, e voltam como texto na leitura.
+
+    Args:
+        df: DataFrame a gravar
+        directory: Diretório do snapshot (substituído se existir)
+        metadata: Informações extras guardadas em 'meta.json'
+    """
+    tmp_dir = directory + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    columns = []
+    for i, (name, values) in enumerate(df.items()):
+        entry = {'name': str(name), 'file': f"{i:04d}.npy"}
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            entry['kind'] = 'category'
+            entry['categories'] = values.cat.categories.tolist()
+            data = values.cat.codes.to_numpy()
+        elif values.dtype == object or pd.api.types.is_string_dtype(values.dtype):
+            codes, uniques = pd.factorize(values, use_na_sentinel=True)
+            entry['kind'] = 'str'
+            entry['categories'] = [str(value) for value in uniques]
+            data = codes.astype(np.int32)
+        else:
+            entry['kind'] = 'array'
+            data = values.to_numpy()
+        entry['dtype'] = str(data.dtype)
+        np.save(os.path.join(tmp_dir, entry['file']), data, allow_pickle=False)
+        columns.append(entry)
+
+    meta = dict(metadata or {}, rows=len(df), columns=columns, attrs=_json_attrs(df.attrs),
+                created_at=datetime.now().isoformat())
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_dir, directory)
+
+
+def _json_attrs(attrs: Dict) -> Dict:
+    """Atributos do DataFrame que cabem em JSON (ex: relatório de validação)."""
+    try:
+        return json.loads(json.dumps(attrs))
+    except TypeError:
+        return {}
+
+
+def read_snapshot(directory: str, mmap: bool = True) -> pd.DataFrame:
+    """
+    Lê um snapshot gravado por `write_snapshot`.
+
+    Args:
+        directory: Diretório do snapshot
+        mmap: Se True, as colunas numéricas e os códigos ficam em memory-map
+            (somente leitura; o pandas copia ao modificar)
+
+    Returns:
+        DataFrame
+    """
+    with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    columns = {}
+    for entry in meta['columns']:
+        data = np.load(os.path.join(directory, entry['file']), mmap_mode='r' if mmap else None)
+        if entry['kind'] == 'array':
+            columns[entry['name']] = data
+            continue
+        categorical = pd.Categorical.from_codes(data, pd.Index(entry['categories'], dtype=object))
+        columns[entry['name']] = categorical if entry['kind'] == 'category' else \
+            pd.Series(categorical).astype('str')
+    df = pd.DataFrame(columns, copy=False)
+    df.attrs.update(meta.get('attrs', {}))
+    return df
+
+
+class DatasetCatalog:
+    """
+    Catálogo de CSVs com snapshots binários indexados pelo conteúdo.
+    """
+
+    def __init__(self, roots: Sequence[str] = ('data', os.path.join('data', 'cache')),
+                 snapshot_dir: Optional[str] = None):
+        """
+        Inicializa o catálogo e registra os CSVs das raízes.
+
+        Args:
+            roots: Diretórios registrados; os nomes são relativos à primeira
+                raiz (ex: 'cache/wikidata_events_100')
+            snapshot_dir: Diretório dos snapshots (padrão:
+                '<primeira raiz>/cache/snapshots')
+        """
+        self.roots = list(roots)
+        self.base = self.roots[0]
+        self.snapshot_dir = snapshot_dir or os.path.join(self.base, 'cache', 'snapshots')
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        self.entries = self._read_index()
+        self.paths = {}
+        self.scan()
+
+    def _index_path(self) -> str:
+        return os.path.join(self.snapshot_dir, CATALOG_FILE)
+
+    def _read_index(self) -> Dict:
+        path = self._index_path()
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_index(self):
+        tmp_path = self._index_path() + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self._index_path())
+
+    def scan(self) -> List[str]:
+        """
+        (Re)registra os arquivos '*.csv' das raízes (sem subdiretórios).
+
+        Returns:
+            Nomes registrados
+        """
+        self.paths = {}
+        for root in self.roots:
+            if not os.path.isdir(root):
+                continue
+            for filename in sorted(os.listdir(root)):
+                path = os.path.join(root, filename)
+                if filename.endswith('.csv') and os.path.isfile(path):
+                    name = os.path.splitext(os.path.relpath(path, self.base))[0].replace(os.sep, '/')
+                    self.paths.setdefault(name, path)
+        return self.names()
+
+    def names(self) -> List[str]:
+        """Nomes dos datasets registrados."""
+        return sorted(self.paths)
+
+    def path(self, name: str) -> str:
+        """Caminho do CSV de um dataset."""
+        if name not in self.paths:
+            raise KeyError(f"Dataset não registrado: {name} (disponíveis: {', '.join(self.names())})")
+        return self.paths[name]
+
+    def fingerprint(self, name: str) -> str:
+        """
+        Impressão digital do conteúdo atual do dataset.
+
+        O hash só é recalculado quando o tamanho ou o mtime do arquivo mudam.
+        """
+        path = self.path(name)
+        stat = os.stat(path)
+        entry = self.entries.get(name)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['fingerprint']
+        self.entries[name] = {'path': path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                              'fingerprint': file_fingerprint(path)}
+        self._write_index()
+        return self.entries[name]['fingerprint']
+
+    def _snapshot_path(self, fingerprint: str, schema: str) -> str:
+        return os.path.join(self.snapshot_dir, f"{fingerprint}_{schema}")
+
+    def load(self, name: str, schema: str = 'raw', mmap: bool = True) -> pd.DataFrame:
+        """
+        Carrega um dataset pelo nome, do snapshot (criado na primeira leitura).
+
+        Args:
+            name: Nome do dataset (ver `names`)
+            schema: 'raw' (colunas do CSV; textos como categorias) ou
+                'events' (esquema canônico de `event_schema.normalize_events`)
+            mmap: Se True, abre as colunas em memory-map
+
+        Returns:
+            DataFrame com atributos 'dataset' e 'fingerprint'
+        """
+        if schema not in SCHEMAS:
+            raise ValueError(f"Esquema não suportado: {schema}")
+        fingerprint = self.fingerprint(name)
+        directory = self._snapshot_path(fingerprint, schema)
+        if not os.path.exists(os.path.join(directory, 'meta.json')):
+            df = pd.read_csv(self.path(name))
+            if schema == 'events':
+                df = normalize_events(df, errors='ignore')
+            else:
+                for column in df.columns:
+                    if df[column].dtype == object or pd.api.types.is_string_dtype(df[column].dtype):
+                        df[column] = df[column].astype('category')
+            write_snapshot(df, directory, {'dataset': name, 'fingerprint': fingerprint,
+                                           'schema': schema})
+        df = read_snapshot(directory, mmap)
+        df.attrs.update({'dataset': name, 'fingerprint': fingerprint})
+        return df
+
+    def prune(self) -> List[str]:
+        """
+        Remove snapshots cujo conteúdo não corresponde mais a nenhum dataset.
+
+        Returns:
+            Diretórios removidos
+        """
+        live = {self.fingerprint(name) for name in self.names()}
+        removed = []
+        for entry in os.listdir(self.snapshot_dir):
+            directory = os.path.join(self.snapshot_dir, entry)
+            if os.path.isdir(directory) and entry.split('_', 1)[0] not in live:
+                shutil.rmtree(directory)
+                removed.append(directory)
+        self.entries = {name: entry for name, entry in self.entries.items() if name in self.paths}
+        self._write_index()
+        return removed
@@ -0,0 +1,168 @@
+"""
+PyNumerology-Matrix: Parser de Datas ISO/Wikidata
+
+Este módulo decompõe datas ISO 8601 e xsd:dateTime do Wikidata em arrays
+inteiros de ano, mês e dia, em lote. Diferente de `pd.to_datetime`, não
+depende da faixa de nanossegundos do pandas (1677-2262): aceita anos
+negativos ('-0044-03-15T00:00:00Z'), anos com sinal e mais de 4 dígitos
+e datas parciais ('1950-00-00', mês/dia 0 = desconhecido).
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class ParsedDates(NamedTuple):
+    """Componentes inteiros das datas; posições inválidas valem 0."""
+    year: np.ndarray
+    month: np.ndarray
+    day: np.ndarray
+    valid: np.ndarray
+
+
+# Ano com sinal opcional, mês e dia opcionais (datas parciais)
+DATE_REGEX = r'^\s*([+-]?\d+)(?:-(\d{1,2})(?:-(\d{1,2}))?)?(?:$|[T\s])'
+
+# Dias de cada mês (índice 0: mês desconhecido) em ano comum
+_DAYS_IN_MONTH = np.array([31, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# Layout de largura fixa do caminho rápido: [+]YYYY-MM-DD
+_FAST_WIDTH = 12
+_DIGITS = (0, 1, 2, 3, 5, 6, 8, 9)
+
+
+def _parse_fixed_width(strings: np.ndarray):
+    """
+    Caminho rápido para 'YYYY-MM-DD...' e '+YYYY-MM-DD...' via bytes.
+
+    Args:
+        strings: Array (object) de strings
+
+    Returns:
+        Tupla (ano, mês, dia, máscara das linhas reconhecidas)
+    """
+    n = len(strings)
+    try:
+        raw = strings.astype(f'S{_FAST_WIDTH}')
+    except UnicodeEncodeError:
+        # Algum texto não ASCII: caracteres fora do ASCII viram '?' e essas
+        # linhas simplesmente não passam no padrão do caminho rápido
+        raw = (pd.Series(strings).str.slice(0, _FAST_WIDTH)
+               .str.encode('ascii', 'replace').to_numpy().astype(f'S{_FAST_WIDTH}'))
+    m = raw.view(np.uint8).reshape(n, _FAST_WIDTH).astype(np.int16)
+
+    plus = m[:, 0] == ord('+')
+    # Desloca uma coluna as linhas que começam com '+'
+    m = np.where(plus[:, None], np.roll(m, -1, axis=1), m)
+    m[plus, -1] = 0
+
+    digits = m - ord('0')
+    is_digit = (digits >= 0) & (digits <= 9)
+    after = m[:, 10]
+    ok = (is_digit[:, _DIGITS].all(axis=1) & (m[:, 4] == ord('-')) & (m[:, 7] == ord('-'))
+          & ((after == 0) | (after == ord('T')) | (after == ord(' '))))
+
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 5] * 10 + digits[:, 6]
+    day = digits[:, 8] * 10 + digits[:, 9]
+    return year.astype(np.int64), month.astype(np.int64), day.astype(np.int64), ok
+
+
+def parse_dates(values) -> ParsedDates:
+    """
+    Decompõe datas em arrays de ano, mês e dia.
+
+    Aceita strings ISO/xsd:dateTime (com ou sem horário e fuso), datas
+    parciais, anos negativos e valores datetime64/Timestamp. A maioria das
+    linhas ('YYYY-MM-DD...') é decodificada direto dos bytes; só as demais
+    passam pela expressão regular.
+
+    Args:
+        values: Series, array ou lista de datas
+
+    Returns:
+        ParsedDates com arrays int64 (ano, mês, dia) e máscara de validade
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    n = len(series)
+    year = np.zeros(n, dtype=np.int64)
+    month = np.zeros(n, dtype=np.int64)
+    day = np.zeros(n, dtype=np.int64)
+    valid = np.zeros(n, dtype=bool)
+    if n == 0:
+        return ParsedDates(year, month, day, valid)
+
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        valid = series.notna().to_numpy()
+        year[valid] = series.dt.year.to_numpy()[valid]
+        month[valid] = series.dt.month.to_numpy()[valid]
+        day[valid] = series.dt.day.to_numpy()[valid]
+        return ParsedDates(year, month, day, valid)
+
+    present = series.notna().to_numpy()
+    strings = series[present].astype(str).to_numpy(dtype=object)
+    positions = np.flatnonzero(present)
+
+    fast_year, fast_month, fast_day, ok = _parse_fixed_width(strings)
+    hit = positions[ok]
+    year[hit], month[hit], day[hit] = fast_year[ok], fast_month[ok], fast_day[ok]
+    valid[hit] = True
+    rest = ~ok
+
+    if rest.any():
+        parts = pd.Series(strings[rest]).str.extract(DATE_REGEX)
+        matched = parts[0].notna().to_numpy()
+        hit = positions[rest][matched]
+        year[hit] = parts[0][matched].astype(np.int64).to_numpy()
+        month[hit] = parts[1][matched].fillna(0).astype(np.int64).to_numpy()
+        day[hit] = parts[2][matched].fillna(0).astype(np.int64).to_numpy()
+        valid[hit] = True
+
+    # Componentes fora da faixa tornam a data inválida (0 = parcial), inclusive
+    # dias além do fim do mês (ex: 1999-02-31); bissextos no calendário
+    # gregoriano proléptico, com ano astronômico, como o datetime64
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_days = _DAYS_IN_MONTH[np.clip(month, 0, 12)] + ((month == 2) & leap)
+    bad = valid & ((month > 12) | (day > month_days))
+    valid &= ~bad
+    year[bad] = month[bad] = day[bad] = 0
+    return ParsedDates(year, month, day, valid)
+
+
+def format_iso(parsed: ParsedDates) -> np.ndarray:
+    """
+    Formata datas decompostas como 'YYYY-MM-DD' (anos negativos com '-').
+
+    Args:
+        parsed: Resultado de `parse_dates`
+
+    Returns:
+        Array de strings (object) com None nas posições inválidas
+    """
+    texts = (pd.Series(np.abs(parsed.year)).astype(str).str.zfill(4)
+             + '-' + pd.Series(parsed.month).astype(str).str.zfill(2)
+             + '-' + pd.Series(parsed.day).astype(str).str.zfill(2))
+    texts = np.where(parsed.year < 0, '-' + texts, texts).astype(object)
+    texts[~parsed.valid] = None
+    return texts
+
+
+def to_datetime64(parsed: ParsedDates) -> np.ndarray:
+    """
+    Converte datas decompostas para datetime64[s] (faixa de ±2,9e11 anos).
+
+    Mês e dia 0 (datas parciais) viram 1; posições inválidas viram NaT.
+
+    Args:
+        parsed: Resultado de `parse_dates`
+
+    Returns:
+        Array datetime64[s]
+    """
+    months = (parsed.year - 1970) * 12 + np.maximum(parsed.month, 1) - 1
+    days = months.astype('datetime64[M]').astype('datetime64[D]') + (np.maximum(parsed.day, 1) - 1)
+    result = days.astype('datetime64[s]')
+    result[~parsed.valid] = np.datetime64('NaT')
+    return result
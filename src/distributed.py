@@ -0,0 +1,520 @@
+"""
+PyNumerology-Matrix: Análise Distribuída com Coordenador e Workers
+
+Este módulo divide a análise entre várias máquinas (ou processos locais)
+por um protocolo HTTP/JSON simples. O coordenador mantém a fila de shards
+(arquivos CSV de eventos, inteiros ou partições) e os entrega sob
+concessão (lease); cada worker analisa o shard, devolve apenas o
+acumulador de contagens e renova suas concessões com heartbeats. Se um
+worker morre, suas concessões expiram e os shards voltam para a fila;
+resultados repetidos de um shard já concluído são ignorados.
+
+Endpoints do coordenador (POST, corpo JSON):
+    /lease      {worker}                           -> {shard_id, shard, slice_by} | {wait} | {done}
+    /heartbeat  {worker}                           -> {leases}
+    /result     {worker, shard_id, accumulator}    -> {accepted}
+    /failed     {worker, shard_id, error}          -> {requeued}
+    /status     {}                                 -> progresso
+
+Uso:
+    python src/distributed.py coordinator --port 8766 data/shards/*.csv.gz
+    python src/distributed.py worker --url http://coordenador:8766
+    python src/distributed.py local --workers 4 data/shards/*.csv.gz
+"""
+
+import argparse
+import collections
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+try:
+    from .accumulators import AnoPessoalAccumulator
+    from .data_processor import NumerologyDataAnalyzer
+    from .parallel_executor import DEFAULT_SLICES, analyze_partition, partition_events
+except ImportError:
+    # Fallback para import direto se executado como script
+    from accumulators import AnoPessoalAccumulator
+    from data_processor import NumerologyDataAnalyzer
+    from parallel_executor import DEFAULT_SLICES, analyze_partition, partition_events
+
+
+def _json_default(o):
+    """Converte escalares numpy (ex: chaves de fatia) para JSON."""
+    return o.item() if hasattr(o, 'item') else str(o)
+
+
+def write_shards(events_df: pd.DataFrame, out_dir: str, partition_by: str = 'chunks',
+                 n_partitions: int = 16) -> List[str]:
+    """
+    Grava um DataFrame de eventos como shards CSV compactados.
+
+    Args:
+        events_df: DataFrame de eventos
+        out_dir: Diretório dos shards (visível para todos os workers)
+        partition_by: 'decade', 'source' ou 'chunks'
+        n_partitions: Número de blocos quando partition_by='chunks'
+
+    Returns:
+        Caminhos dos shards gravados
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i, partition in enumerate(partition_events(events_df, partition_by, n_partitions)):
+        path = os.path.join(out_dir, f"shard-{i:05d}.csv.gz")
+        partition.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+class ShardCoordinator:
+    """
+    Coordenador: distribui shards sob concessão e soma os acumuladores recebidos.
+    """
+
+    def __init__(self, shards: Sequence[str], slice_by: Sequence[str] = DEFAULT_SLICES,
+                 lease_timeout: float = 30.0, max_attempts: int = 3,
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Inicializa o coordenador (o servidor só escuta após `start`).
+
+        Args:
+            shards: Caminhos dos shards, acessíveis a partir dos workers
+            slice_by: Dimensões das fatias acumuladas
+            lease_timeout: Segundos sem heartbeat até a concessão expirar e
+                o shard voltar para a fila
+            max_attempts: Falhas explícitas toleradas por shard
+            host: Endereço de escuta
+            port: Porta (0 escolhe uma porta livre)
+        """
+        self.shards = list(shards)
+        self.slice_by = tuple(slice_by)
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.host = host
+        self.port = port
+
+        self.accumulator = AnoPessoalAccumulator()
+        self.pending = collections.deque(range(len(self.shards)))
+        self.leases = {}
+        self.completed = {}
+        self.failed = {}
+        self.attempts = collections.Counter()
+        self.workers = {}
+        self.reassigned = 0
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._server = None
+        self._thread = None
+        if not self.shards:
+            self._finished.set()
+
+    @property
+    def url(self) -> str:
+        """URL base do coordenador em execução."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _expire_leases(self, now: float):
+        """Devolve à fila os shards cujas concessões expiraram."""
+        for shard_id, (worker, deadline) in list(self.leases.items()):
+            if deadline < now:
+                del self.leases[shard_id]
+                self.pending.appendleft(shard_id)
+                self.reassigned += 1
+
+    def _check_finished(self):
+        if len(self.completed) + len(self.failed) == len(self.shards):
+            self._finished.set()
+
+    def lease(self, params: Dict) -> Dict:
+        worker = params['worker']
+        now = time.monotonic()
+        with self._lock:
+            self.workers[worker] = now
+            self._expire_leases(now)
+            if self._finished.is_set():
+                return {'done': True}
+            if not self.pending:
+                # Tudo concedido: o worker volta a perguntar, pois uma concessão pode expirar
+                return {'wait': min(1.0, self.lease_timeout / 4)}
+            shard_id = self.pending.popleft()
+            self.leases[shard_id] = (worker, now + self.lease_timeout)
+            return {'shard_id': shard_id, 'shard': self.shards[shard_id],
+                    'slice_by': list(self.slice_by)}
+
+    def heartbeat(self, params: Dict) -> Dict:
+        worker = params['worker']
+        now = time.monotonic()
+        with self._lock:
+            self.workers[worker] = now
+            renewed = [shard_id for shard_id, (owner, _) in self.leases.items() if owner == worker]
+            for shard_id in renewed:
+                self.leases[shard_id] = (worker, now + self.lease_timeout)
+            return {'leases': renewed}
+
+    def result(self, params: Dict) -> Dict:
+        shard_id = int(params['shard_id'])
+        accumulator = AnoPessoalAccumulator.from_dict(params['accumulator'])
+        with self._lock:
+            self.workers[params['worker']] = time.monotonic()
+            if shard_id in self.completed:
+                # Shard reatribuído e concluído por dois workers: conta uma vez
+                return {'accepted': False}
+            self.leases.pop(shard_id, None)
+            if shard_id in self.pending:
+                self.pending.remove(shard_id)
+            self.failed.pop(shard_id, None)
+            self.completed[shard_id] = params['worker']
+            self.accumulator.merge(accumulator)
+            self._check_finished()
+            return {'accepted': True}
+
+    def fail(self, params: Dict) -> Dict:
+        shard_id = int(params['shard_id'])
+        with self._lock:
+            if shard_id in self.completed or self.leases.get(shard_id, (None,))[0] != params['worker']:
+                return {'requeued': False}
+            del self.leases[shard_id]
+            self.attempts[shard_id] += 1
+            if self.attempts[shard_id] >= self.max_attempts:
+                self.failed[shard_id] = params.get('error', '')
+                self._check_finished()
+                return {'requeued': False}
+            self.pending.append(shard_id)
+            return {'requeued': True}
+
+    def status(self, params: Dict) -> Dict:
+        with self._lock:
+            return {
+                'shards': len(self.shards),
+                'pending': len(self.pending),
+                'leased': len(self.leases),
+                'completed': len(self.completed),
+                'failed': len(self.failed),
+                'reassigned': self.reassigned,
+                'workers': len(self.workers),
+                'done': self._finished.is_set()
+            }
+
+    @property
+    def routes(self) -> Dict:
+        return {
+            '/lease': self.lease,
+            '/heartbeat': self.heartbeat,
+            '/result': self.result,
+            '/failed': self.fail,
+            '/status': self.status,
+        }
+
+    def start(self) -> 'ShardCoordinator':
+        """Inicia o servidor HTTP em uma thread."""
+        handler = type('CoordinatorHandler', (_Handler,), {'coordinator': self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera todos os shards serem concluídos ou descartados.
+
+        Concessões expiradas também são recolhidas aqui, para que shards de
+        workers mortos voltem à fila mesmo sem novos pedidos de concessão.
+
+        Returns:
+            True se terminou, False se o tempo esgotou
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._finished.wait(min(1.0, self.lease_timeout / 4)):
+            with self._lock:
+                self._expire_leases(time.monotonic())
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+        return True
+
+    def stop(self):
+        """Para o servidor HTTP."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def results(self) -> Dict:
+        """
+        Hipótese total e por fatia a partir dos acumuladores recebidos.
+
+        Returns:
+            Dicionário no formato de `ParallelAnalysisExecutor.run`, com o
+            progresso da distribuição
+        """
+        analyzer = NumerologyDataAnalyzer()
+        with self._lock:
+            accumulator = self.accumulator
+            return {
+                'hypothesis_test': analyzer.hypothesis_from_counts(accumulator) if accumulator.total else {},
+                'slices': {
+                    dimension: analyzer.slice_hypotheses(accumulator, dimension)
+                    for dimension in self.slice_by
+                },
+                'accumulator': accumulator,
+                'shards': len(self.shards),
+                'completed': len(self.completed),
+                'failed': {self.shards[i]: error for i, error in self.failed.items()},
+                'reassigned': self.reassigned,
+                'workers': len(self.workers)
+            }
+
+    def run(self, timeout: Optional[float] = None) -> Dict:
+        """Inicia, espera a conclusão, para e devolve os resultados."""
+        if self._server is None:
+            self.start()
+        try:
+            if not self.wait(timeout):
+                raise TimeoutError(f"Shards não concluídos em {timeout} s: {self.status({})}")
+        finally:
+            self.stop()
+        return self.results()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Handler HTTP/1.1 que despacha para ShardCoordinator."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    coordinator: ShardCoordinator = None
+
+    def _send(self, status: int, payload: Dict):
+        body = json.dumps(payload, default=_json_default).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        endpoint = self.coordinator.routes.get(urlsplit(self.path).path.rstrip('/'))
+        if endpoint is None:
+            self._send(404, {'error': f'Endpoint não encontrado: {self.path}'})
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            self._send(200, endpoint(json.loads(self.rfile.read(length) or b'{}')))
+        except (ValueError, KeyError) as e:
+            self._send(400, {'error': f'Requisição inválida: {e}'})
+
+    def log_message(self, format, *args):
+        """Silencia o log por requisição."""
+        pass
+
+
+class CoordinatorClient:
+    """Cliente HTTP do coordenador (uma conexão persistente por instância)."""
+
+    def __init__(self, url: str, timeout: float = 30.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self._conn = None
+
+    def call(self, endpoint: str, payload: Dict) -> Dict:
+        """Envia um POST JSON e devolve a resposta; reconecta uma vez se a conexão caiu."""
+        body = json.dumps(payload, default=_json_default).encode('utf-8')
+        for attempt in range(2):
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self._conn.request('POST', endpoint, body, {'Content-Type': 'application/json'})
+                response = self._conn.getresponse()
+                data = json.loads(response.read() or b'{}')
+            except (OSError, http.client.HTTPException):
+                self.close()
+                if attempt:
+                    raise
+                continue
+            if response.status != 200:
+                raise RuntimeError(f"Coordenador respondeu {response.status}: {data.get('error')}")
+            return data
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def run_worker(url: str, worker_id: Optional[str] = None, heartbeat_interval: float = 5.0,
+               connect_timeout: float = 30.0) -> int:
+    """
+    Loop do worker: pede shards, analisa e devolve os acumuladores.
+
+    Um thread separado envia heartbeats enquanto a análise de um shard está
+    em andamento, para que shards longos não percam a concessão.
+
+    Args:
+        url: URL base do coordenador
+        worker_id: Identificador do worker (padrão: host-pid-aleatório)
+        heartbeat_interval: Segundos entre heartbeats (menor que o
+            lease_timeout do coordenador)
+        connect_timeout: Segundos tentando alcançar o coordenador antes de desistir
+
+    Returns:
+        Número de shards processados por este worker
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    client = CoordinatorClient(url)
+    stop = threading.Event()
+
+    def beat():
+        beat_client = CoordinatorClient(url)
+        while not stop.wait(heartbeat_interval):
+            try:
+                beat_client.call('/heartbeat', {'worker': worker_id})
+            except (OSError, http.client.HTTPException, RuntimeError):
+                pass
+        beat_client.close()
+
+    heart = threading.Thread(target=beat, daemon=True)
+    heart.start()
+    processed = 0
+    unreachable_since = None
+    try:
+        while True:
+            try:
+                task = client.call('/lease', {'worker': worker_id})
+                unreachable_since = None
+            except (OSError, http.client.HTTPException):
+                # Coordenador ainda subindo, ou já encerrado após a conclusão
+                unreachable_since = unreachable_since or time.monotonic()
+                if time.monotonic() - unreachable_since > connect_timeout:
+                    break
+                time.sleep(0.2)
+                continue
+            if task.get('done'):
+                break
+            if 'wait' in task:
+                time.sleep(task['wait'])
+                continue
+            try:
+                accumulator = analyze_partition(task['shard'], task['slice_by'])
+            except Exception as e:
+                client.call('/failed', {'worker': worker_id, 'shard_id': task['shard_id'],
+                                        'error': f"{type(e).__name__}: {e}"})
+                continue
+            client.call('/result', {'worker': worker_id, 'shard_id': task['shard_id'],
+                                    'accumulator': accumulator.to_dict()})
+            processed += 1
+    finally:
+        stop.set()
+        client.close()
+    return processed
+
+
+def start_local_workers(url: str, n_workers: int, heartbeat_interval: float = 5.0
+                        ) -> List[multiprocessing.process.BaseProcess]:
+    """
+    Inicia workers como processos locais (substitutos de máquinas remotas).
+
+    Os workers são iniciados com 'spawn': o processo atual já tem a thread
+    do servidor do coordenador, e um fork com threads ativas pode travar.
+
+    Returns:
+        Processos iniciados
+    """
+    context = multiprocessing.get_context('spawn')
+    processes = []
+    for i in range(n_workers):
+        process = context.Process(target=run_worker, name=f"numerology-worker-{i}",
+                                          args=(url, f"local-{i}", heartbeat_interval), daemon=True)
+        process.start()
+        processes.append(process)
+    return processes
+
+
+def run_local(shards: Sequence[str], n_workers: int = 4, slice_by: Sequence[str] = DEFAULT_SLICES,
+              lease_timeout: float = 10.0, timeout: Optional[float] = None) -> Dict:
+    """
+    Executa coordenador e workers em uma única máquina.
+
+    Args:
+        shards: Caminhos dos shards
+        n_workers: Número de processos worker
+        slice_by: Dimensões das fatias acumuladas
+        lease_timeout: Segundos até reatribuir shards de um worker morto
+        timeout: Tempo máximo total (None: sem limite)
+
+    Returns:
+        Resultados de `ShardCoordinator.results`
+    """
+    coordinator = ShardCoordinator(shards, slice_by, lease_timeout=lease_timeout).start()
+    processes = start_local_workers(coordinator.url, n_workers, heartbeat_interval=lease_timeout / 4)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        while not coordinator.wait(timeout=lease_timeout / 2):
+            if not any(process.is_alive() for process in processes):
+                raise RuntimeError(f"Todos os workers terminaram antes da conclusão: "
+                                   f"{coordinator.status({})}")
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Shards não concluídos em {timeout} s: {coordinator.status({})}")
+        return coordinator.results()
+    finally:
+        coordinator.stop()
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+
+def main():
+    """Ponto de entrada de linha de comando."""
+    parser = argparse.ArgumentParser(description='Análise distribuída do PyNumerology-Matrix')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    coordinator = commands.add_parser('coordinator', help='Inicia o coordenador')
+    coordinator.add_argument('shards', nargs='+')
+    coordinator.add_argument('--host', default='0.0.0.0')
+    coordinator.add_argument('--port', type=int, default=8766)
+    coordinator.add_argument('--lease-timeout', type=float, default=30.0)
+
+    worker = commands.add_parser('worker', help='Inicia um worker')
+    worker.add_argument('--url', required=True)
+    worker.add_argument('--heartbeat', type=float, default=5.0)
+
+    local = commands.add_parser('local', help='Coordenador e workers nesta máquina')
+    local.add_argument('shards', nargs='+')
+    local.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    local.add_argument('--lease-timeout', type=float, default=10.0)
+
+    args = parser.parse_args()
+    if args.command == 'worker':
+        print(f"Shards processados: {run_worker(args.url, heartbeat_interval=args.heartbeat)}")
+        return
+    if args.command == 'coordinator':
+        server = ShardCoordinator(args.shards, lease_timeout=args.lease_timeout,
+                                  host=args.host, port=args.port).start()
+        print(f"Coordenador em {server.url} com {len(args.shards)} shards")
+        result = server.run()
+    else:
+        result = run_local(args.shards, args.workers, lease_timeout=args.lease_timeout)
+
+    hypothesis = result['hypothesis_test']
+    print(f"Shards: {result['completed']}/{result['shards']} "
+          f"(reatribuídos: {result['reassigned']}, falhas: {len(result['failed'])})")
+    if hypothesis:
+        print(f"Eventos: {hypothesis['total_events']}  Ano 9: {hypothesis['ano_9_percentage']:.2f}%  "
+              f"p-valor: {hypothesis['p_value']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
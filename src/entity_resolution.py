@@ -0,0 +1,135 @@
+"""
+PyNumerology-Matrix: Resolução de Entidades entre Fontes
+
+Este módulo remove eventos duplicados vindos de fontes diferentes usando
+chaves estáveis em vez de comparar linhas inteiras: primeiro o QID do
+Wikidata extraído da URI do evento e, na falta dele, o rótulo normalizado
+combinado com a data. Cada regra é um único `duplicated()` vetorizado
+sobre as chaves; a entrada inteira fica em memória.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Colunas candidatas, em ordem de preferência, para cada papel na chave
+URI_COLUMNS = ('event',)
+LABEL_COLUMNS = ('eventLabel', 'event_label')
+DATE_COLUMNS = ('date',)
+
+
+def _first_column(df: pd.DataFrame, candidates) -> Optional[str]:
+    """Retorna a primeira coluna candidata presente no DataFrame."""
+    for column in candidates:
+        if column in df.columns:
+            return column
+    return None
+
+
+def extract_qids(df: pd.DataFrame) -> pd.Series:
+    """
+    Extrai o QID do Wikidata (ex: 'Q42') da URI do evento.
+
+    Args:
+        df: DataFrame de eventos
+
+    Returns:
+        Series com o QID ou NaN quando ausente
+    """
+    column = _first_column(df, URI_COLUMNS)
+    if column is None:
+        return pd.Series(np.nan, index=df.index, dtype=object)
+    return df[column].astype(str).str.extract(r'(Q\d+)\s*$', expand=False)
+
+
+def normalize_labels(labels: pd.Series) -> pd.Series:
+    """
+    Normaliza rótulos: remove acentos, caixa e pontuação.
+
+    Args:
+        labels: Series de rótulos
+
+    Returns:
+        Series de rótulos normalizados ('' quando ausente)
+    """
+    return (labels.fillna('').astype(str)
+            .str.normalize('NFKD')
+            .str.encode('ascii', 'ignore').str.decode('ascii')
+            .str.lower()
+            .str.replace(r'[^a-z0-9]+', ' ', regex=True)
+            .str.strip())
+
+
+def normalize_dates(dates: pd.Series) -> pd.Series:
+    """
+    Normaliza datas em formatos variados para 'YYYY-MM-DD'.
+
+    Aceita ISO com horário e fuso ('2020-03-15 00:00:00+00:00',
+    '+2020-03-15T00:00:00Z') e Timestamps do pandas.
+
+    Args:
+        dates: Series de datas
+
+    Returns:
+        Series de datas normalizadas ('' quando não reconhecida)
+    """
+    return (dates.astype(str)
+            .str.extract(r'^\s*\+?(-?\d{1,4}-\d{2}-\d{2})', expand=False)
+            .fillna(''))
+
+
+def resolve_entities(events_df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Remove eventos duplicados entre fontes.
+
+    Regras, aplicadas em ordem:
+      1. 'qid': mesmo QID do Wikidata extraído da coluna 'event'.
+      2. 'label_date': mesmo rótulo normalizado e mesma data. Linhas com
+         QIDs diferentes nunca são fundidas; uma linha sem QID é removida
+         quando já existe outra linha (com ou sem QID) no mesmo grupo.
+
+    A primeira ocorrência de cada entidade é mantida, na ordem original.
+
+    Args:
+        events_df: DataFrame com eventos de uma ou mais fontes
+
+    Returns:
+        Tupla (DataFrame deduplicado, relatório de remoções por regra)
+    """
+    report = {'input_rows': len(events_df), 'qid': 0, 'label_date': 0}
+    if events_df.empty:
+        report['output_rows'] = 0
+        return events_df, report
+
+    qids = extract_qids(events_df)
+    has_qid = qids.notna().to_numpy()
+
+    # Regra 1: QID
+    qid_dup = np.zeros(len(events_df), dtype=bool)
+    qid_dup[has_qid] = qids[has_qid].duplicated().to_numpy()
+    report['qid'] = int(qid_dup.sum())
+
+    # Regra 2: rótulo normalizado + data
+    label_column = _first_column(events_df, LABEL_COLUMNS)
+    date_column = _first_column(events_df, DATE_COLUMNS)
+    label_dup = np.zeros(len(events_df), dtype=bool)
+    if label_column is not None and date_column is not None:
+        labels = normalize_labels(events_df[label_column])
+        dates = normalize_dates(events_df[date_column])
+        has_key = ((labels != '') & (dates != '')).to_numpy() & ~qid_dup
+        keys = (labels + '|' + dates)[has_key]
+
+        # Chaves com alguma linha de QID: toda linha sem QID é duplicata
+        in_qid_group = keys.isin(keys[has_qid[has_key]]).to_numpy()
+        without_qid = ~has_qid[has_key]
+
+        candidates = np.zeros(len(keys), dtype=bool)
+        candidates[without_qid] = keys[without_qid].duplicated().to_numpy()
+        label_dup[np.flatnonzero(has_key)] = without_qid & (in_qid_group | candidates)
+    report['label_date'] = int(label_dup.sum())
+
+    resolved = events_df[~(qid_dup | label_dup)]
+    report['output_rows'] = len(resolved)
+    return resolved, report
@@ -0,0 +1,277 @@
+"""
+PyNumerology-Matrix: Esquema Canônico de Eventos
+
+Este módulo define um único layout tipado para eventos de todas as fontes
+e adaptadores por fonte que o produzem. Cada fonte tem seus nomes de
+coluna (Wikidata: 'event/eventLabel/typeLabel', arquivos sintéticos:
+'eventLabel/typeLabel/category/impact/source/event_id', saída da análise:
+'event_type/event_label', GDELT: 'GlobalEventID/EventCode/...'); o
+adaptador apenas renomeia as colunas, sem copiar dados (copy-on-write do
+pandas: padrão no pandas 3, opcional no 2), e só converte as colunas cujo
+dtype difere do canônico.
+
+A validação é vetorizada: cada regra é uma máscara booleana sobre a
+coluna inteira, e o relatório conta as violações por regra.
+"""
+
+from typing import Dict, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .date_parser import parse_dates, to_datetime64
+except ImportError:
+    # Fallback para import direto se executado como script
+    from date_parser import parse_dates, to_datetime64
+
+
+# Colunas canônicas, na ordem do layout, e seus dtypes
+CANONICAL_SCHEMA = {
+    'event_id': 'str',
+    'date': 'datetime64[s]',
+    'year': 'int32',
+    'event_label': 'str',
+    'event_type': 'category',
+    'category': 'category',
+    'impact': 'category',
+    'source': 'category',
+}
+
+# Valor das colunas textuais/categóricas ausentes na fonte
+MISSING_VALUE = 'unknown'
+
+
+def _has_dtype(values: pd.Series, dtype: str) -> bool:
+    """
+    Indica se a coluna já está no dtype canônico.
+
+    'str' é o dtype textual do pandas 3; no pandas 2 o mesmo layout é uma
+    coluna object só com strings (e None nos ausentes).
+    """
+    if dtype != 'str':
+        return str(values.dtype) == dtype
+    if isinstance(values.dtype, pd.StringDtype):
+        return True
+    return values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty')
+
+
+def _as_text(values: pd.Series) -> pd.Series:
+    """Converte para o dtype textual, mantendo os ausentes como ausentes."""
+    text = values.astype('str')
+    if text.dtype == object:
+        # pandas 2: astype('str') escreveria None/NaN como 'None'/'nan'
+        text = text.where(values.notna(), None)
+    return text
+
+
+class SourceAdapter:
+    """
+    Adaptador de uma fonte para o esquema canônico.
+    """
+
+    def __init__(self, name: str, renames: Dict[str, str], signature: Sequence[str],
+                 source_value: Optional[str] = None):
+        """
+        Inicializa o adaptador.
+
+        Args:
+            name: Nome da fonte
+            renames: Mapeamento coluna da fonte -> coluna canônica
+            signature: Colunas cuja presença identifica a fonte
+            source_value: Valor da coluna 'source' quando a fonte não a traz
+        """
+        self.name = name
+        self.renames = renames
+        self.signature = tuple(signature)
+        self.source_value = source_value
+
+    def matches(self, columns) -> bool:
+        """Indica se as colunas têm a assinatura desta fonte."""
+        return all(column in columns for column in self.signature)
+
+    def rename(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Renomeia as colunas da fonte (sem copiar os dados das colunas)."""
+        renames = {old: new for old, new in self.renames.items()
+                   if old in df.columns and new not in df.columns}
+        return df.rename(columns=renames) if renames else df
+
+
+# Em ordem de detecção: assinaturas mais específicas primeiro
+ADAPTERS = {
+    'gdelt': SourceAdapter('gdelt', {'GlobalEventID': 'event_id', 'EventCode': 'event_type',
+                                     'EventRootCode': 'category'},
+                           signature=('GlobalEventID', 'SQLDATE'), source_value='GDELT'),
+    'analysis': SourceAdapter('analysis', {}, signature=('ano_pessoal',)),
+    'synthetic': SourceAdapter('synthetic', {'eventLabel': 'event_label', 'typeLabel': 'event_type'},
+                               signature=('eventLabel', 'category', 'source')),
+    'wikidata': SourceAdapter('wikidata', {'event': 'event_id', 'eventLabel': 'event_label',
+                                           'typeLabel': 'event_type'},
+                              signature=('event', 'eventLabel'), source_value='Wikidata'),
+    'generic': SourceAdapter('generic', {'eventLabel': 'event_label', 'typeLabel': 'event_type'},
+                             signature=()),
+}
+
+
+def detect_source(df: pd.DataFrame) -> str:
+    """
+    Identifica a fonte de um DataFrame de eventos pelas colunas.
+
+    Returns:
+        Nome do adaptador ('generic' se nenhuma assinatura casar)
+    """
+    for name, adapter in ADAPTERS.items():
+        if adapter.signature and adapter.matches(df.columns):
+            return name
+    return 'generic'
+
+
+def is_canonical(df: pd.DataFrame) -> bool:
+    """Indica se o DataFrame já segue o esquema canônico (colunas, ordem e dtypes)."""
+    columns = list(CANONICAL_SCHEMA)
+    return (list(df.columns[:len(columns)]) == columns
+            and all(_has_dtype(df[column], dtype) for column, dtype in CANONICAL_SCHEMA.items()))
+
+
+def _constant(value: str, n: int) -> pd.Categorical:
+    """Coluna categórica constante (códigos zero, sem materializar strings)."""
+    return pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[value])
+
+
+def _years(dates: np.ndarray) -> np.ndarray:
+    """Ano de cada datetime64 (0 para NaT)."""
+    years = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+    years[np.isnat(dates)] = 0
+    return years
+
+
+class ValidationReport(NamedTuple):
+    """Resultado da validação: máscara de linhas válidas e violações por regra."""
+    valid: np.ndarray
+    errors: Dict[str, int]
+
+    @property
+    def n_invalid(self) -> int:
+        return int((~self.valid).sum())
+
+
+def validate_events(df: pd.DataFrame) -> ValidationReport:
+    """
+    Valida um DataFrame canônico com máscaras vetorizadas.
+
+    Regras: data ausente ou inválida ('invalid_date'), ano diferente do ano
+    da data ('year_mismatch') e identificador repetido ('duplicate_id',
+    a primeira ocorrência é mantida).
+
+    Args:
+        df: DataFrame no esquema canônico
+
+    Returns:
+        ValidationReport
+    """
+    dates = df['date'].to_numpy()
+    invalid_date = np.isnat(dates)
+    year_mismatch = ~invalid_date & (df['year'].to_numpy() != _years(dates))
+    ids = df['event_id']
+    duplicate_id = (ids.notna() & ids.duplicated()).to_numpy()
+
+    rules = {'invalid_date': invalid_date, 'year_mismatch': year_mismatch,
+             'duplicate_id': duplicate_id}
+    valid = ~(invalid_date | year_mismatch | duplicate_id)
+    return ValidationReport(valid, {rule: int(mask.sum()) for rule, mask in rules.items()})
+
+
+def _typed_column(df: pd.DataFrame, column: str, dtype: str):
+    """Coluna no dtype canônico; reaproveita os dados se o dtype já confere."""
+    values = df[column]
+    if _has_dtype(values, dtype):
+        return values
+    if dtype == 'str':
+        return _as_text(values)
+    return values.astype(dtype)
+
+
+def normalize_events(df: pd.DataFrame, source: Optional[str] = None, errors: str = 'drop',
+                     keep_extra: bool = True) -> pd.DataFrame:
+    """
+    Converte eventos de qualquer fonte para o esquema canônico.
+
+    Colunas que a fonte não traz são preenchidas (None para 'event_id' e
+    'event_label', 'unknown' ou o nome da fonte para as categóricas). A
+    data é decomposta por `parse_dates` e guardada como datetime64[s]; sem
+    coluna 'date', usa-se 1º de janeiro da coluna 'year'.
+
+    Args:
+        df: DataFrame de eventos
+        source: Nome do adaptador (padrão: detectado pelas colunas)
+        errors: 'drop' descarta linhas inválidas, 'raise' lança ValueError
+            e 'ignore' mantém todas as linhas
+        keep_extra: Se True, colunas fora do esquema (ex: 'ano_pessoal')
+            seguem após as canônicas
+
+    Returns:
+        DataFrame canônico com atributo `attrs['validation']`
+    """
+    if errors not in ('drop', 'raise', 'ignore'):
+        raise ValueError(f"Modo de erros não suportado: {errors}")
+    if is_canonical(df):
+        renamed = df
+        adapter = None
+    else:
+        adapter = ADAPTERS[source or detect_source(df)]
+        renamed = adapter.rename(df)
+
+    n = len(renamed)
+    columns = {}
+    if adapter is None:
+        columns = {column: renamed[column] for column in CANONICAL_SCHEMA}
+    else:
+        if 'date' in renamed.columns and not _has_dtype(renamed['date'], CANONICAL_SCHEMA['date']):
+            columns['date'] = to_datetime64(parse_dates(renamed['date']))
+        elif 'date' in renamed.columns:
+            columns['date'] = renamed['date']
+        elif 'year' in renamed.columns:
+            years = pd.to_numeric(renamed['year'], errors='coerce')
+            columns['date'] = to_datetime64(parse_dates(years.astype('Int64').astype('str')))
+        else:
+            raise ValueError("Eventos sem coluna 'date' ou 'year'")
+
+        if 'year' in renamed.columns and pd.api.types.is_integer_dtype(renamed['year'].dtype):
+            columns['year'] = renamed['year']
+        elif 'year' in renamed.columns:
+            columns['year'] = pd.to_numeric(renamed['year'], errors='coerce').fillna(0)
+        else:
+            columns['year'] = _years(np.asarray(columns['date']))
+
+        for column, dtype in CANONICAL_SCHEMA.items():
+            if column in ('date', 'year'):
+                continue
+            if column in renamed.columns:
+                columns[column] = _typed_column(renamed, column, dtype)
+            elif column == 'source' and adapter.source_value is not None:
+                columns[column] = _constant(adapter.source_value, n)
+            elif dtype == 'category':
+                columns[column] = _constant(MISSING_VALUE, n)
+            else:
+                columns[column] = pd.Series([None] * n, dtype='str', index=renamed.index)
+
+        columns['date'] = pd.Series(columns['date'], index=renamed.index).astype('datetime64[s]')
+        columns['year'] = pd.Series(columns['year'], index=renamed.index).astype('int32')
+
+    layout = {column: columns[column] for column in CANONICAL_SCHEMA}
+    if keep_extra:
+        layout.update((column, renamed[column]) for column in renamed.columns
+                      if column not in CANONICAL_SCHEMA)
+    # copy=False: colunas já no dtype canônico seguem compartilhando os dados da entrada
+    result = pd.DataFrame(layout, index=renamed.index, copy=False)
+
+    report = validate_events(result)
+    if report.n_invalid:
+        if errors == 'raise':
+            raise ValueError(f"{report.n_invalid} eventos inválidos: {report.errors}")
+        if errors == 'drop':
+            result = result[report.valid]
+    result = result.reset_index(drop=True)
+    result.attrs['source'] = adapter.name if adapter is not None else 'canonical'
+    result.attrs['validation'] = report.errors
+    return result
@@ -0,0 +1,358 @@
+"""
+PyNumerology-Matrix: Gravação/Reprodução HTTP e Endpoint Local Simulado
+
+Este módulo permite medir e testar os coletores sem rede:
+
+- `ReplayAdapter`, montado sob a sessão HTTP dos coletores, grava as
+  respostas reais em uma fita (`Cassette`) e depois as reproduz;
+- `MockEndpointServer` serve as gravações por HTTP local com latência e
+  largura de banda configuráveis, e `RoutingAdapter` desvia as requisições
+  dos coletores para ele, exercitando o transporte real (conexões,
+  concorrência, limitador de taxa, parsing e cache).
+
+Uso:
+    python src/http_replay.py serve --cassette tests/fixtures/http --latency 0.05
+    python src/http_replay.py bench --cassette tests/fixtures/http --bandwidth 1000000
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+# Cabeçalhos que não valem para o corpo gravado (já descomprimido)
+_DROPPED_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding',
+                              'connection', 'date', 'set-cookie'})
+
+
+class Cassette:
+    """
+    Fita de gravações HTTP em um diretório (metadados JSON + corpo binário).
+
+    A chave de cada gravação ignora esquema e host (método, caminho,
+    parâmetros ordenados e hash do corpo), para que a mesma fita sirva
+    tanto à reprodução direta quanto ao servidor local.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Abre (ou cria) a fita.
+
+        Args:
+            directory: Diretório das gravações
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._index = {}
+        for filename in os.listdir(directory):
+            if filename.endswith('.json'):
+                with open(os.path.join(directory, filename), encoding='utf-8') as f:
+                    self._index[json.load(f)['key']] = filename[:-len('.json')]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(method: str, url: str, body: Optional[bytes] = None) -> str:
+        """Chave canônica de uma requisição (URL absoluta ou só caminho?consulta)."""
+        parts = urlsplit(url)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        key = f"{method.upper()} {parts.path or '/'}?{query}"
+        if body:
+            key += ' body=' + hashlib.sha1(body).hexdigest()
+        return key
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def get(self, key: str) -> Optional[Tuple[Dict, bytes]]:
+        """Retorna (metadados, corpo) da gravação, ou None se não existir."""
+        stem = self._index.get(key)
+        if stem is None:
+            return None
+        with open(os.path.join(self.directory, stem + '.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(os.path.join(self.directory, stem + '.body'), 'rb') as f:
+            return meta, f.read()
+
+    def put(self, key: str, url: str, status: int, headers: Dict, body: bytes):
+        """Grava uma resposta (escrita atômica do corpo e dos metadados)."""
+        stem = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        meta = {
+            'key': key,
+            'url': url,
+            'status': status,
+            'headers': {name: value for name, value in headers.items()
+                        if name.lower() not in _DROPPED_HEADERS}
+        }
+        with self._lock:
+            for suffix, mode, content in (('.body', 'wb', body),
+                                          ('.json', 'w', json.dumps(meta, indent=2))):
+                path = os.path.join(self.directory, stem + suffix)
+                with open(path + '.tmp', mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+                    f.write(content)
+                os.replace(path + '.tmp', path)
+            self._index[key] = stem
+
+
+class RecordingNotFound(requests.exceptions.RequestException):
+    """Requisição sem gravação na fita (modo 'replay'); não é repetida."""
+
+
+def _build_response(request, status: int, headers: Dict, body: bytes) -> requests.Response:
+    """Monta um `requests.Response` a partir de uma gravação."""
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = request.url
+    response.request = request
+    response.reason = 'OK' if status < 400 else 'Recorded error'
+    return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Adaptador de transporte que grava e reproduz respostas de uma fita.
+
+    Modos: 'replay' (só fita; requisição sem gravação falha), 'record'
+    (sempre rede, gravando) e 'auto' (fita quando houver, senão rede e
+    grava). Respostas 429 e 5xx não são gravadas.
+    """
+
+    def __init__(self, cassette: Cassette, mode: str = 'replay', **kwargs):
+        if mode not in ('replay', 'record', 'auto'):
+            raise ValueError(f"Modo inválido: {mode}")
+        super().__init__(**kwargs)
+        self.cassette = cassette
+        self.mode = mode
+        self.hits = 0
+        self.recorded = 0
+
+    def send(self, request, **kwargs):
+        body = request.body.encode('utf-8') if isinstance(request.body, str) else request.body
+        key = Cassette.key(request.method, request.url, body)
+
+        if self.mode != 'record':
+            entry = self.cassette.get(key)
+            if entry is not None:
+                self.hits += 1
+                meta, content = entry
+                return _build_response(request, meta['status'], meta['headers'], content)
+            if self.mode == 'replay':
+                raise RecordingNotFound(f"Sem gravação para {key}", request=request)
+
+        response = super().send(request, **kwargs)
+        if response.status_code != 429 and response.status_code < 500:
+            self.cassette.put(key, request.url, response.status_code,
+                              dict(response.headers), response.content)
+            self.recorded += 1
+        return response
+
+
+class RoutingAdapter(HTTPAdapter):
+    """
+    Adaptador que envia toda requisição para outro endereço (ex: o
+    `MockEndpointServer`), preservando caminho e consulta.
+    """
+
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        routed = request.copy()
+        routed.url = f"{self.base_url}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+        return super().send(routed, **kwargs)
+
+
+def mount_adapter(session: requests.Session, adapter: HTTPAdapter) -> requests.Session:
+    """Monta o adaptador para http e https na sessão."""
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    """Serve as gravações da fita do servidor."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def _serve(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else None
+        server = self.server
+        entry = server.cassette.get(Cassette.key(self.command, self.path, body))
+        server.requests_served += 1
+
+        if server.latency:
+            time.sleep(server.latency)
+        if entry is None:
+            meta, content = {'status': 404, 'headers': {'Content-Type': 'text/plain'}}, b'not recorded'
+        else:
+            meta, content = entry
+
+        self.send_response(meta['status'])
+        for name, value in meta['headers'].items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+
+        if not server.bandwidth:
+            self.wfile.write(content)
+            return
+        # Envia em blocos no ritmo da largura de banda simulada
+        chunk = max(1024, int(server.bandwidth / 100))
+        start = time.perf_counter()
+        for offset in range(0, len(content), chunk):
+            self.wfile.write(content[offset:offset + chunk])
+            ahead = (offset + chunk) / server.bandwidth - (time.perf_counter() - start)
+            if ahead > 0:
+                time.sleep(ahead)
+
+    do_GET = _serve
+    do_POST = _serve
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockEndpointServer(ThreadingHTTPServer):
+    """
+    Servidor HTTP local que reproduz uma fita com latência e banda simuladas.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, cassette: Cassette, latency: float = 0.0, bandwidth: Optional[float] = None,
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Inicializa o servidor (sem iniciar o laço de atendimento).
+
+        Args:
+            cassette: Fita a ser servida
+            latency: Atraso antes de cada resposta, em segundos
+            bandwidth: Largura de banda por resposta, em bytes/s (None = sem limite)
+            host: Endereço de escuta
+            port: Porta (0 = livre)
+        """
+        super().__init__((host, port), _MockHandler)
+        self.cassette = cassette
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.requests_served = 0
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockEndpointServer':
+        """Atende em uma thread de fundo."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Encerra o atendimento e fecha o socket."""
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def run_collector_benchmark(cassette_dir: str, latency: float = 0.0,
+                            bandwidth: Optional[float] = None, gdelt_date: str = '20240101') -> Dict:
+    """
+    Mede os coletores contra o endpoint simulado: coleta a frio (rede
+    simulada, parsing e gravação do cache) e a quente (só cache).
+
+    Args:
+        cassette_dir: Diretório da fita
+        latency: Latência simulada, em segundos
+        bandwidth: Largura de banda simulada, em bytes/s
+        gdelt_date: Data do arquivo GDELT gravado
+
+    Returns:
+        Dicionário {coletor: {'rows', 'cold_s', 'cached_s'}} e requisições servidas
+    """
+    try:
+        from .data_processor import GDELTCollector, OurWorldInDataCollector, WikidataCollector
+        from .rate_limiter import LimiterRegistry, RateLimitedSession
+    except ImportError:
+        # Fallback para import direto se executado como script
+        from data_processor import GDELTCollector, OurWorldInDataCollector, WikidataCollector
+        from rate_limiter import LimiterRegistry, RateLimitedSession
+
+    jobs = {
+        'wikidata': (WikidataCollector, lambda c: c.collect_historical_events()),
+        'owid': (OurWorldInDataCollector, lambda c: c.collect_conflicts_data()),
+        'gdelt': (GDELTCollector, lambda c: c.collect_daily_events(gdelt_date)),
+    }
+    results = {}
+    with MockEndpointServer(Cassette(cassette_dir), latency, bandwidth) as server, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        # Limitador sem os limites dos hosts reais: mede o transporte, não o ritmo
+        session = RateLimitedSession(LimiterRegistry(defaults={'rate': 1000.0, 'concurrency': 64}))
+        mount_adapter(session, RoutingAdapter(server.url))
+        for name, (collector_class, collect) in jobs.items():
+            collector = collector_class(cache_dir=cache_dir, session=session)
+            start = time.perf_counter()
+            rows = len(collect(collector))
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            collect(collector)
+            results[name] = {'rows': rows, 'cold_s': round(cold, 4),
+                             'cached_s': round(time.perf_counter() - start, 4)}
+        results['requests_served'] = server.requests_served
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Endpoint simulado e benchmark dos coletores")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for name in ('serve', 'bench'):
+        sub = subparsers.add_parser(name)
+        sub.add_argument('--cassette', default=os.path.join('tests', 'fixtures', 'http'))
+        sub.add_argument('--latency', type=float, default=0.0)
+        sub.add_argument('--bandwidth', type=float, default=None)
+    subparsers.choices['serve'].add_argument('--port', type=int, default=8766)
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        server = MockEndpointServer(Cassette(args.cassette), args.latency, args.bandwidth,
+                                    port=args.port)
+        print(f"Servindo {len(server.cassette)} gravações em {server.url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+    else:
+        print(json.dumps(run_collector_benchmark(args.cassette, args.latency, args.bandwidth),
+                         indent=2))
+
+
+if __name__ == '__main__':
+    main()
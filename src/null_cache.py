@@ -0,0 +1,185 @@
+"""
+PyNumerology-Matrix: Cache de Distribuições Nulas de Monte Carlo
+
+Este módulo simula distribuições nulas de estatísticas de contagem
+(eventos distribuídos uniformemente em k células, ex: os 9 Anos Pessoais
+ou k fatias) e as guarda em disco, chaveadas por (n, células,
+estatística, simulações, semente). Como as contagens são inteiras, as
+estatísticas têm suporte discreto: guarda-se cada valor distinto com o
+número de simulações maiores ou iguais a ele, e o p-valor P(T >= obs) sai
+de uma busca binária exata, em microssegundos - sem interpolação, que
+subestima o p-valor (P(T > obs)) em amostras pequenas.
+"""
+
+import os
+import threading
+from typing import Callable, Dict, NamedTuple, Optional
+
+import numpy as np
+
+
+def _chi_square(counts: np.ndarray, n: int) -> np.ndarray:
+    """Qui-quadrado de Pearson contra a uniforme, por linha."""
+    expected = n / counts.shape[1]
+    return ((counts - expected) ** 2).sum(axis=1) / expected
+
+
+def _max_cell(counts: np.ndarray, n: int) -> np.ndarray:
+    """Fração da maior célula, por linha (concentração em qualquer célula)."""
+    return counts.max(axis=1) / n
+
+
+STATISTICS: Dict[str, Callable[[np.ndarray, int], np.ndarray]] = {
+    'chi_square': _chi_square,
+    'max_cell': _max_cell,
+}
+
+
+def statistic_value(statistic: str, counts, n: Optional[int] = None) -> float:
+    """Valor observado de uma estatística para um vetor de contagens."""
+    counts = np.asarray(counts, dtype=float)[None, :]
+    return float(STATISTICS[statistic](counts, int(counts.sum()) if n is None else n)[0])
+
+
+class NullKey(NamedTuple):
+    """Chave de uma distribuição nula simulada."""
+    n: int
+    cells: int
+    statistic: str
+    sims: int
+    seed: int
+
+    @property
+    def filename(self) -> str:
+        return f"{self.statistic}_n{self.n}_k{self.cells}_s{self.sims}_seed{self.seed}_tail.npy"
+
+
+# Casas decimais na comparação de valores: somas de ponto flutuante de um
+# mesmo vetor de contagens (em outra ordem) diferem só no último bit
+DECIMALS = 9
+
+
+class NullDistribution:
+    """Suporte simulado de uma estatística e consulta exata de P(T >= observado)."""
+
+    def __init__(self, key: NullKey, support: np.ndarray, tail: np.ndarray):
+        """
+        Args:
+            key: Chave da distribuição
+            support: Valores distintos simulados, em ordem crescente
+            tail: tail[i] = número de simulações com valor >= support[i]
+        """
+        self.key = key
+        self.support = support
+        self.tail = tail
+
+    @classmethod
+    def from_values(cls, key: NullKey, values: np.ndarray) -> 'NullDistribution':
+        """Resume as estatísticas simuladas em suporte e contagens de cauda."""
+        support, frequencies = np.unique(np.round(values, DECIMALS), return_counts=True)
+        tail = np.cumsum(frequencies[::-1])[::-1]
+        return cls(key, support, tail.astype(np.int64))
+
+    def p_value(self, observed: float) -> float:
+        """
+        P(T >= observado) sob a nula: (simulações >= observado + 1) / (simulações + 1).
+
+        Returns:
+            p-valor, limitado inferiormente por 1/(simulações + 1)
+        """
+        i = np.searchsorted(self.support, round(observed, DECIMALS), side='left')
+        at_least = int(self.tail[i]) if i < len(self.support) else 0
+        return min(1.0, (at_least + 1) / (self.key.sims + 1))
+
+
+class NullDistributionCache:
+    """
+    Cache persistente (disco + memória) de distribuições nulas de Monte Carlo.
+    """
+
+    def __init__(self, cache_dir: str = "data/cache/null_distributions", batch_size: int = 20_000):
+        """
+        Inicializa o cache.
+
+        Args:
+            cache_dir: Diretório dos arquivos das distribuições
+            batch_size: Simulações por lote (limita a memória da simulação)
+        """
+        self.cache_dir = cache_dir
+        self.batch_size = batch_size
+        self.simulated = 0
+        self._memory = {}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _simulate(self, key: NullKey) -> NullDistribution:
+        """Simula a estatística sob a uniforme e resume em suporte e caudas."""
+        rng = np.random.default_rng(key.seed)
+        statistic = STATISTICS[key.statistic]
+        probabilities = np.full(key.cells, 1.0 / key.cells)
+        values = np.empty(key.sims)
+        for start in range(0, key.sims, self.batch_size):
+            size = min(self.batch_size, key.sims - start)
+            values[start:start + size] = statistic(rng.multinomial(key.n, probabilities, size=size), key.n)
+        self.simulated += 1
+        return NullDistribution.from_values(key, values)
+
+    def get(self, n: int, cells: int = 9, statistic: str = 'chi_square', sims: int = 20_000,
+            seed: int = 0) -> NullDistribution:
+        """
+        Distribuição nula para a chave, da memória, do disco ou simulada.
+
+        Args:
+            n: Número de eventos
+            cells: Número de células (ex: 9 Anos Pessoais)
+            statistic: 'chi_square' ou 'max_cell'
+            sims: Número de simulações
+            seed: Semente da simulação
+
+        Returns:
+            NullDistribution
+        """
+        if statistic not in STATISTICS:
+            raise ValueError(f"Estatística não suportada: {statistic}")
+        key = NullKey(int(n), int(cells), statistic, int(sims), int(seed))
+        distribution = self._memory.get(key)
+        if distribution is not None:
+            return distribution
+
+        with self._lock:
+            distribution = self._memory.get(key)
+            if distribution is not None:
+                return distribution
+            path = os.path.join(self.cache_dir, key.filename)
+            if os.path.exists(path):
+                # Linha 0: suporte; linha 1: contagens de cauda
+                support, tail = np.load(path)
+                distribution = NullDistribution(key, support, tail.astype(np.int64))
+            else:
+                distribution = self._simulate(key)
+                tmp_path = path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, np.vstack([distribution.support, distribution.tail]))
+                os.replace(tmp_path, path)
+            self._memory[key] = distribution
+            return distribution
+
+    def p_value(self, counts, statistic: str = 'chi_square', sims: int = 20_000, seed: int = 0) -> float:
+        """
+        p-valor de Monte Carlo de um vetor de contagens contra a uniforme.
+
+        Args:
+            counts: Contagens observadas por célula
+            statistic: Estatística do teste
+            sims: Número de simulações da nula
+            seed: Semente da simulação
+
+        Returns:
+            p-valor de Monte Carlo
+        """
+        counts = np.asarray(counts)
+        n = int(counts.sum())
+        if n == 0:
+            return 1.0
+        distribution = self.get(n, len(counts), statistic, sims, seed)
+        return distribution.p_value(statistic_value(statistic, counts, n))
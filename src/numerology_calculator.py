@@ -6,7 +6,77 @@ removendo o misticismo e focando em algoritmos determinísticos.
 """
 
 import datetime
-from typing import Union, Tuple
+import unicodedata
+from functools import lru_cache
+from typing import Iterable, Union, Tuple
+
+import numpy as np
+
+
+# Tabela pitagórica: A-I = 1-9, J-R = 1-9, S-Z = 1-8
+VALORES_LETRAS = {chr(ord('A') + i): i % 9 + 1 for i in range(26)}
+VOGAIS = frozenset('AEIOU')
+
+
+def _letras_normalizadas(texto: str) -> str:
+    """Remove acentos (NFKD) e mantém apenas as letras A-Z, em maiúsculas."""
+    ascii_texto = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+    return ''.join(letra for letra in ascii_texto.upper() if letra in VALORES_LETRAS)
+
+
+@lru_cache(maxsize=None)
+def _tabelas_codepoints() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Soma das letras e das vogais de cada code point do BMP (U+0000-U+FFFF).
+
+    Calculadas uma única vez com a mesma normalização da versão escalar,
+    permitem somar nomes acentuados direto dos bytes UTF-8.
+    """
+    total = np.zeros(0x10000, dtype=np.int64)
+    vogais = np.zeros(0x10000, dtype=np.int64)
+    for codigo in range(0x10000):
+        for letra in _letras_normalizadas(chr(codigo)):
+            total[codigo] += VALORES_LETRAS[letra]
+            if letra in VOGAIS:
+                vogais[codigo] += VALORES_LETRAS[letra]
+    return total, vogais
+
+
+def _valores_por_caractere(texto: str, tipo: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Valor numerológico por posição de byte UTF-8 de um texto.
+
+    O valor de cada caractere fica na posição do seu primeiro byte (bytes de
+    continuação valem 0). Caracteres fora do BMP, raros, fazem o texto
+    inteiro seguir pela normalização NFKD explícita.
+
+    Returns:
+        Tupla (bytes do texto, valores por byte)
+    """
+    buffer = np.frombuffer(texto.encode('utf-8', 'surrogatepass'), dtype=np.uint8)
+    if (buffer >= 0xF0).any():
+        texto = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+        buffer = np.frombuffer(texto.encode('ascii'), dtype=np.uint8)
+
+    total, vogais = _tabelas_codepoints()
+    tabela = {'expressao': total, 'alma': vogais, 'personalidade': total - vogais}[tipo]
+
+    # Bytes ASCII por consulta direta; bytes >= 0x80 começam valendo 0
+    tabela_ascii = np.zeros(256, dtype=np.int16)
+    tabela_ascii[:0x80] = tabela[:0x80]
+    valores = tabela_ascii[buffer]
+
+    # Apenas as posições não ASCII (poucas em rótulos) são decodificadas
+    nao_ascii = np.flatnonzero(buffer >= 0x80)
+    if len(nao_ascii):
+        b = buffer.astype(np.int32)
+        inicio2 = nao_ascii[(b[nao_ascii] >= 0xC0) & (b[nao_ascii] < 0xE0)]
+        valores[inicio2] = tabela[((b[inicio2] & 0x1F) << 6) | (b[inicio2 + 1] & 0x3F)]
+        inicio3 = nao_ascii[(b[nao_ascii] >= 0xE0) & (b[nao_ascii] < 0xF0)]
+        valores[inicio3] = tabela[((b[inicio3] & 0x0F) << 12) | ((b[inicio3 + 1] & 0x3F) << 6)
+                                  | (b[inicio3 + 2] & 0x3F)]
+
+    return buffer, valores
 
 
 class NumerologyCalculator:
@@ -39,6 +109,22 @@ class NumerologyCalculator:
 
         return numero
 
+    def _reduzir_digito_array(self, numeros) -> np.ndarray:
+        """
+        Versão vetorizada de `_reduzir_digito` para arrays de inteiros.
+
+        A soma iterativa de dígitos de n > 9 equivale à raiz digital
+        1 + (n - 1) % 9; valores <= 9 são mantidos, como na versão escalar.
+
+        Args:
+            numeros: Array (ou sequência) de inteiros
+
+        Returns:
+            Array int64 com os dígitos reduzidos
+        """
+        numeros = np.asarray(numeros, dtype=np.int64)
+        return np.where(numeros > 9, 1 + (numeros - 1) % 9, numeros)
+
     def calcular_numero_destino(self, data_nasc: str) -> int:
         """
         Calcula o Número do Destino baseado na data de nascimento completa.
@@ -54,6 +140,27 @@ class NumerologyCalculator:
 
         return self._reduzir_digito(soma_total)
 
+    def calcular_numero_destino_array(self, anos, meses, dias) -> np.ndarray:
+        """
+        Calcula o Número do Destino em lote a partir de arrays de ano, mês e dia.
+
+        A soma dos dígitos de 'YYYY-MM-DD' é congruente (mod 9) a
+        |ano| + mês + dia e só é zero quando eles são, então basta reduzir
+        essa soma: o resultado é idêntico ao de `calcular_numero_destino`.
+        Aceita diretamente a saída de `date_parser.parse_dates`.
+
+        Args:
+            anos: Anos (podem ser negativos ou ter mais de 4 dígitos)
+            meses: Meses (0 = desconhecido)
+            dias: Dias (0 = desconhecido)
+
+        Returns:
+            Array int64 com os Números do Destino
+        """
+        soma = (np.abs(np.asarray(anos, dtype=np.int64)) + np.asarray(meses, dtype=np.int64)
+                + np.asarray(dias, dtype=np.int64))
+        return self._reduzir_digito_array(soma)
+
     def calcular_ano_pessoal(self, data_nasc: str, ano_atual: Union[int, None] = None) -> int:
         """
         Calcula o Ano Pessoal para um ano específico.
@@ -76,6 +183,20 @@ class NumerologyCalculator:
 
         return self._reduzir_digito(ano_pessoal)
 
+    def calcular_ano_pessoal_array(self, data_nasc: str, anos) -> np.ndarray:
+        """
+        Calcula o Ano Pessoal de uma data de nascimento para vários anos.
+
+        Args:
+            data_nasc: Data de nascimento no formato 'YYYY-MM-DD'
+            anos: Array (ou sequência) de anos
+
+        Returns:
+            Array int64 com o Ano Pessoal de cada ano
+        """
+        numero_destino = self.calcular_numero_destino(data_nasc)
+        return self._reduzir_digito_array(numero_destino + np.asarray(anos, dtype=np.int64))
+
     def calcular_mes_pessoal(self, data_nasc: str, ano: int, mes: int) -> int:
         """
         Calcula o Mês Pessoal para um mês específico.
@@ -115,6 +236,119 @@ class NumerologyCalculator:
 
         return self._reduzir_digito(dia_pessoal)
 
+    def calcular_ciclos_pessoais_array(self, destinos, anos, meses,
+                                       dias) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calcula Ano, Mês e Dia Pessoal em lote a partir de Números do Destino.
+
+        Cada posição pode ter uma data de nascimento (destino) diferente,
+        o que permite processar requisições heterogêneas de uma só vez.
+
+        Args:
+            destinos: Números do Destino
+            anos: Anos alvo
+            meses: Meses alvo (1-12)
+            dias: Dias alvo (1-31)
+
+        Returns:
+            Tupla (anos pessoais, meses pessoais, dias pessoais)
+        """
+        destinos = np.asarray(destinos, dtype=np.int64)
+        anos_pessoais = self._reduzir_digito_array(destinos + np.asarray(anos, dtype=np.int64))
+        meses_pessoais = self._reduzir_digito_array(anos_pessoais + np.asarray(meses, dtype=np.int64))
+        dias_pessoais = self._reduzir_digito_array(meses_pessoais + np.asarray(dias, dtype=np.int64))
+        return anos_pessoais, meses_pessoais, dias_pessoais
+
+    @staticmethod
+    def _normalizar_nome(nome: str) -> str:
+        """
+        Remove acentos e caracteres não alfabéticos e converte para maiúsculas.
+
+        Args:
+            nome: Nome (ex: 'José Conceição')
+
+        Returns:
+            Apenas as letras A-Z (ex: 'JOSECONCEICAO')
+        """
+        return _letras_normalizadas(nome)
+
+    def calcular_numero_expressao(self, nome: str) -> int:
+        """
+        Calcula o Número de Expressão (todas as letras do nome).
+
+        Args:
+            nome: Nome completo
+
+        Returns:
+            Número de Expressão (1-9, ou 0 para nome sem letras)
+        """
+        return self._reduzir_digito(sum(VALORES_LETRAS[letra] for letra in self._normalizar_nome(nome)))
+
+    def calcular_numero_alma(self, nome: str) -> int:
+        """
+        Calcula o Número da Alma (apenas as vogais do nome).
+
+        Args:
+            nome: Nome completo
+
+        Returns:
+            Número da Alma (1-9, ou 0 para nome sem vogais)
+        """
+        return self._reduzir_digito(sum(VALORES_LETRAS[letra] for letra in self._normalizar_nome(nome)
+                                        if letra in VOGAIS))
+
+    def calcular_numero_personalidade(self, nome: str) -> int:
+        """
+        Calcula o Número da Personalidade (apenas as consoantes do nome).
+
+        Args:
+            nome: Nome completo
+
+        Returns:
+            Número da Personalidade (1-9, ou 0 para nome sem consoantes)
+        """
+        return self._reduzir_digito(sum(VALORES_LETRAS[letra] for letra in self._normalizar_nome(nome)
+                                        if letra not in VOGAIS))
+
+    def calcular_numeros_nome_array(self, nomes: Iterable, tipo: str = 'expressao') -> np.ndarray:
+        """
+        Calcula números de nome em lote (ex: uma coluna 'personLabel').
+
+        Os nomes são unidos em um único texto e convertidos para bytes UTF-8
+        de uma só vez; o valor de cada caractere (já normalizado, acentos
+        incluídos) vem de uma tabela de consulta por code point e as somas
+        por nome saem de uma soma cumulativa, sem laço por caractere.
+        Valores ausentes (None/NaN) resultam em 0.
+
+        Args:
+            nomes: Sequência de nomes (lista, array ou Series do pandas)
+            tipo: 'expressao', 'alma' ou 'personalidade'
+
+        Returns:
+            Array int64 com um número por nome
+        """
+        if tipo not in ('expressao', 'alma', 'personalidade'):
+            raise ValueError(f"Tipo de número desconhecido: {tipo}")
+
+        if hasattr(nomes, 'fillna'):
+            # Series do pandas: conversão em bloco, sem iterar elemento a elemento
+            textos = nomes.fillna('').astype(str).str.replace('\x00', '', regex=False).tolist()
+        else:
+            textos = [nome.replace('\x00', '') if isinstance(nome, str) else '' for nome in nomes]
+        if not textos:
+            return np.zeros(0, dtype=np.int64)
+
+        # '\x00' separa os nomes e não tem valor numerológico; por isso é
+        # removido de dentro dos nomes acima, sem mudar o resultado deles
+        buffer, valores = _valores_por_caractere('\x00'.join(textos), tipo)
+
+        separadores = np.flatnonzero(buffer == 0)
+        inicios = np.concatenate(([0], separadores + 1))
+        fins = np.concatenate((separadores, [len(buffer)]))
+        acumulado = np.concatenate(([0], np.cumsum(valores, dtype=np.int64)))
+
+        return self._reduzir_digito_array(acumulado[fins] - acumulado[inicios])
+
     def interpretar_ano_pessoal(self, ano_pessoal: int) -> str:
         """
         Interpretação científica do Ano Pessoal baseada em analogia física.
@@ -0,0 +1,319 @@
+"""
+PyNumerology-Matrix: Gravação Particionada e Compactada de Resultados
+
+Este módulo grava resultados de análise à medida que são produzidos, em
+partições por década ou fonte (layout 'coluna=valor/' no estilo Hive) e
+compactados: CSV com gzip (padrão), CSV com zstd (requer `zstandard`) ou
+Parquet (requer `pyarrow`). Cada partição é um fluxo aberto durante toda a
+gravação, então blocos sucessivos são apenas anexados.
+
+A finalização é atômica: cada gravação usa nomes de arquivo próprios
+('part-<run_id>'), escritos com sufixo '.tmp' e renomeados em `close()`
+sem tocar nos arquivos da gravação anterior. A troca do manifesto
+'_manifest.json' é o único ponto de confirmação; só depois dela os
+arquivos que o manifesto anterior referenciava, e o novo não, são
+apagados. Nada mais no diretório é tocado (nem os temporários de outro
+gravador em andamento); se a troca falhar, a gravação apaga os próprios
+arquivos. Leitores confiam apenas no manifesto e podem carregar só as
+partições de que precisam.
+"""
+
+import gzip
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+FORMATS = {
+    'csv.gz': '.csv.gz',
+    'csv.zst': '.csv.zst',
+    'parquet': '.parquet',
+}
+
+MANIFEST = '_manifest.json'
+
+
+def _partition_keys(df: pd.DataFrame, partition_by: Optional[str]) -> pd.Series:
+    """Valor da partição de cada linha ('decade' é derivada de 'year')."""
+    if partition_by is None:
+        return pd.Series('all', index=df.index)
+    if partition_by == 'decade':
+        return (pd.to_numeric(df['year']) // 10 * 10).astype('int64')
+    return df[partition_by].astype(object).where(df[partition_by].notna(), 'unknown')
+
+
+def _safe_value(value) -> str:
+    """Valor de partição seguro para nome de diretório."""
+    return ''.join(c if c.isalnum() or c in '-_.' else '_' for c in str(value))
+
+
+class _CsvStream:
+    """Fluxo CSV compactado de uma partição (cabeçalho escrito uma vez)."""
+
+    def __init__(self, path: str, fmt: str, level: Optional[int]):
+        if fmt == 'csv.gz':
+            self._raw = None
+            self._file = gzip.open(path, 'wt', encoding='utf-8', newline='',
+                                   compresslevel=6 if level is None else level)
+        else:
+            self._raw = open(path, 'wb')
+            compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+            self._file = compressor.stream_writer(self._raw)
+        self._header = True
+
+    def write(self, df: pd.DataFrame):
+        text = df.to_csv(index=False, header=self._header)
+        self._header = False
+        self._file.write(text if self._raw is None else text.encode('utf-8'))
+
+    def close(self):
+        self._file.close()
+        if self._raw is not None and not self._raw.closed:
+            self._raw.close()
+
+
+class _ParquetStream:
+    """Fluxo Parquet de uma partição (um row group por bloco)."""
+
+    def __init__(self, path: str, fmt: str, level: Optional[int]):
+        self._path = path
+        self._level = level
+        self._writer = None
+
+    @staticmethod
+    def _table(df: pd.DataFrame):
+        # Categorias variam entre blocos: grava como texto para o esquema ser estável
+        df = df.copy()
+        for column in df.columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype(object)
+        return pyarrow.Table.from_pandas(df, preserve_index=False)
+
+    def write(self, df: pd.DataFrame):
+        table = self._table(df)
+        if self._writer is None:
+            self._writer = pyarrow.parquet.ParquetWriter(self._path, table.schema, compression='zstd',
+                                                         compression_level=self._level)
+        self._writer.write_table(table.cast(self._writer.schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class PartitionedWriter:
+    """
+    Gravador de resultados particionados e compactados, com finalização atômica.
+    """
+
+    def __init__(self, base_dir: str, partition_by: Optional[str] = 'decade',
+                 fmt: str = 'csv.gz', compression_level: Optional[int] = None):
+        """
+        Inicializa o gravador (a gravação anterior no diretório, se houver,
+        só é substituída em `close()`).
+
+        Args:
+            base_dir: Diretório de saída
+            partition_by: 'decade', nome de coluna (ex: 'source') ou None
+            fmt: 'csv.gz', 'csv.zst' ou 'parquet'
+            compression_level: Nível de compressão (padrão do formato se None)
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Formato não suportado: {fmt}")
+        if fmt == 'csv.zst' and zstandard is None:
+            raise ImportError("Formato 'csv.zst' requer o pacote zstandard")
+        if fmt == 'parquet' and pyarrow is None:
+            raise ImportError("Formato 'parquet' requer o pacote pyarrow")
+
+        self.base_dir = base_dir
+        self.partition_by = partition_by
+        self.fmt = fmt
+        self.compression_level = compression_level
+        self.rows = {}
+        self.run_id = f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self._streams = {}
+        self._closed = False
+        os.makedirs(base_dir, exist_ok=True)
+
+    def _remove_files(self, relative_paths: Iterable[str]):
+        """Remove arquivos gravados por este gravador e os diretórios de partição que esvaziarem."""
+        for relative in relative_paths:
+            path = os.path.join(self.base_dir, relative)
+            if os.path.exists(path):
+                os.remove(path)
+            directory = os.path.dirname(path)
+            if os.path.normpath(directory) != os.path.normpath(self.base_dir) and not os.listdir(directory):
+                os.rmdir(directory)
+
+    def _relative_path(self, key) -> str:
+        filename = f"part-{self.run_id}" + FORMATS[self.fmt]
+        if self.partition_by is None:
+            return filename
+        return os.path.join(f"{self.partition_by}={_safe_value(key)}", filename)
+
+    def _stream(self, key):
+        stream = self._streams.get(key)
+        if stream is None:
+            path = os.path.join(self.base_dir, self._relative_path(key)) + '.tmp'
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            stream_class = _ParquetStream if self.fmt == 'parquet' else _CsvStream
+            stream = self._streams[key] = stream_class(path, self.fmt, self.compression_level)
+        return stream
+
+    def write(self, df: pd.DataFrame):
+        """
+        Anexa um bloco de resultados às partições correspondentes.
+
+        Args:
+            df: Bloco de resultados (ex: saída de `analyze_event_cycles`)
+        """
+        if self._closed:
+            raise ValueError("Gravador já finalizado")
+        if df.empty:
+            return
+        keys = _partition_keys(df, self.partition_by)
+        for key, group in df.groupby(keys.to_numpy(), sort=False):
+            key = key.item() if hasattr(key, 'item') else key
+            self._stream(key).write(group)
+            self.rows[key] = self.rows.get(key, 0) + len(group)
+
+    def close(self) -> Dict:
+        """
+        Fecha os fluxos, dá nome final aos arquivos e grava o manifesto.
+
+        Os arquivos desta gravação têm nomes únicos, então renomeá-los não
+        altera a gravação anterior: até a troca do manifesto, leitores (e
+        uma queda do processo) continuam vendo a gravação antiga por inteiro.
+
+        Returns:
+            Manifesto da gravação
+        """
+        if self._closed:
+            return self.manifest()
+        for stream in self._streams.values():
+            stream.close()
+        files = [self._relative_path(key) for key in self._streams]
+        for relative in files:
+            path = os.path.join(self.base_dir, relative)
+            os.replace(path + '.tmp', path)
+        self._closed = True
+
+        previous = read_manifest(self.base_dir)
+        manifest = self.manifest()
+        tmp_path = os.path.join(self.base_dir, MANIFEST + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, os.path.join(self.base_dir, MANIFEST))
+        except BaseException:
+            # Não confirmada: a gravação anterior segue valendo; descarta a nossa
+            self._remove_files(files)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        # Confirmado: apaga só os arquivos da gravação substituída
+        if previous:
+            current = {os.path.normpath(relative) for relative in files}
+            self._remove_files(entry['file'] for entry in previous['partitions'].values()
+                               if os.path.normpath(entry['file']) not in current)
+        return manifest
+
+    def abort(self):
+        """Descarta a gravação em andamento (a anterior permanece intacta)."""
+        for key, stream in self._streams.items():
+            stream.close()
+            path = os.path.join(self.base_dir, self._relative_path(key)) + '.tmp'
+            if os.path.exists(path):
+                os.remove(path)
+        self._closed = True
+
+    def manifest(self) -> Dict:
+        """Descrição das partições gravadas."""
+        return {
+            'format': self.fmt,
+            'partition_by': self.partition_by,
+            'run_id': self.run_id,
+            'created_at': datetime.now().isoformat(),
+            'total_rows': int(sum(self.rows.values())),
+            'partitions': {
+                str(key): {'rows': int(rows), 'file': self._relative_path(key)}
+                for key, rows in self.rows.items()
+            }
+        }
+
+    def __enter__(self) -> 'PartitionedWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_partitioned(df: pd.DataFrame, base_dir: str, partition_by: Optional[str] = 'decade',
+                      fmt: str = 'csv.gz', chunksize: int = 100_000) -> Dict:
+    """
+    Grava um DataFrame inteiro em blocos, particionado e compactado.
+
+    Returns:
+        Manifesto da gravação
+    """
+    with PartitionedWriter(base_dir, partition_by, fmt) as writer:
+        for start in range(0, len(df), chunksize):
+            writer.write(df.iloc[start:start + chunksize])
+    return writer.manifest()
+
+
+def read_manifest(base_dir: str) -> Optional[Dict]:
+    """Manifesto de uma gravação concluída, ou None se não houver."""
+    path = os.path.join(base_dir, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_partitions(base_dir: str, partitions: Optional[Iterable] = None,
+                    columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Lê as partições de uma gravação concluída.
+
+    Args:
+        base_dir: Diretório da gravação
+        partitions: Valores das partições desejadas (padrão: todas)
+        columns: Colunas a carregar (padrão: todas)
+
+    Returns:
+        DataFrame com as partições pedidas
+    """
+    manifest = read_manifest(base_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"Gravação sem manifesto (incompleta?): {base_dir}")
+    wanted = None if partitions is None else {str(p) for p in partitions}
+    frames = []
+    for key, entry in manifest['partitions'].items():
+        if wanted is not None and key not in wanted:
+            continue
+        path = os.path.join(base_dir, entry['file'])
+        if manifest['format'] == 'parquet':
+            frames.append(pd.read_parquet(path, columns=columns))
+        else:
+            frames.append(pd.read_csv(path, usecols=columns))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
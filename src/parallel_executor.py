@@ -0,0 +1,171 @@
+"""
+PyNumerology-Matrix: Execução Paralela da Análise
+
+Este módulo distribui a análise numerológica entre processos no esquema
+map-reduce: cada partição (arquivo, década, fonte ou bloco de linhas) é
+analisada em um processo, que devolve apenas um acumulador de contagens;
+os acumuladores são somados e a hipótese é calculada uma única vez.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .accumulators import AnoPessoalAccumulator
+    from .data_processor import NumerologyDataAnalyzer
+except ImportError:
+    # Fallback para import direto se executado como script
+    from accumulators import AnoPessoalAccumulator
+    from data_processor import NumerologyDataAnalyzer
+
+
+DEFAULT_SLICES = ('decade', 'category', 'source')
+
+# Analisador reutilizado por todas as tarefas de um mesmo processo
+_worker_analyzer = None
+
+
+def _get_worker_analyzer() -> NumerologyDataAnalyzer:
+    """Retorna o analisador do processo atual, criando-o na primeira chamada."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = NumerologyDataAnalyzer()
+    return _worker_analyzer
+
+
+def analyze_partition(partition: Union[str, pd.DataFrame],
+                      slice_by: Sequence[str] = DEFAULT_SLICES) -> AnoPessoalAccumulator:
+    """
+    Etapa map: analisa uma partição e devolve suas contagens.
+
+    Args:
+        partition: Caminho de um CSV de eventos ou DataFrame de eventos
+        slice_by: Dimensões das fatias acumuladas
+
+    Returns:
+        Acumulador com as contagens da partição
+    """
+    events_df = pd.read_csv(partition) if isinstance(partition, str) else partition
+    analysis_df = _get_worker_analyzer().analyze_event_cycles(events_df, keep_labels=False)
+    return AnoPessoalAccumulator.from_analysis(analysis_df, slice_by)
+
+
+def _analyze_task(task) -> AnoPessoalAccumulator:
+    """Desempacota uma tarefa do pool (função de módulo para ser serializável)."""
+    partition, slice_by = task
+    return analyze_partition(partition, slice_by)
+
+
+def partition_events(events_df: pd.DataFrame, partition_by: str = 'chunks',
+                     n_partitions: int = 8) -> List[pd.DataFrame]:
+    """
+    Divide um DataFrame de eventos em partições independentes.
+
+    Args:
+        events_df: DataFrame de eventos
+        partition_by: 'decade', 'source' ou 'chunks' (blocos de linhas de
+            tamanho igual, que equilibram melhor a carga)
+        n_partitions: Número de blocos quando partition_by='chunks'
+
+    Returns:
+        Lista de DataFrames
+    """
+    if events_df.empty:
+        return []
+    if partition_by == 'chunks':
+        bounds = np.linspace(0, len(events_df), n_partitions + 1).astype(int)
+        return [events_df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])
+                if stop > start]
+    if partition_by == 'decade':
+        if 'year' in events_df.columns:
+            years = pd.to_numeric(events_df['year'], errors='coerce')
+        else:
+            years = pd.to_numeric(events_df['date'].astype(str).str[:4], errors='coerce')
+        keys = (years // 10) * 10
+    elif partition_by in events_df.columns:
+        keys = events_df[partition_by]
+    else:
+        raise ValueError(f"Partição não suportada: {partition_by}")
+    return [group for _, group in events_df.groupby(keys, sort=True, dropna=False)]
+
+
+class ParallelAnalysisExecutor:
+    """
+    Executor map-reduce da análise do NumerologyDataAnalyzer em um pool de processos.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 slice_by: Sequence[str] = DEFAULT_SLICES):
+        """
+        Inicializa o executor.
+
+        Args:
+            max_workers: Número de processos (padrão: núcleos disponíveis);
+                com 1, a análise roda no próprio processo
+            slice_by: Dimensões das fatias acumuladas
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.slice_by = tuple(slice_by)
+        self.analyzer = NumerologyDataAnalyzer()
+
+    def map(self, partitions: Sequence[Union[str, pd.DataFrame]]) -> List[AnoPessoalAccumulator]:
+        """
+        Analisa cada partição, em paralelo quando há mais de um processo.
+
+        Args:
+            partitions: Caminhos de CSV ou DataFrames de eventos
+
+        Returns:
+            Lista de acumuladores, um por partição
+        """
+        tasks = [(partition, self.slice_by) for partition in partitions]
+        if self.max_workers == 1 or len(tasks) <= 1:
+            return [_analyze_task(task) for task in tasks]
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as pool:
+            return list(pool.map(_analyze_task, tasks))
+
+    @staticmethod
+    def reduce(accumulators: Sequence[AnoPessoalAccumulator]) -> AnoPessoalAccumulator:
+        """Soma os acumuladores das partições em um único acumulador."""
+        total = AnoPessoalAccumulator()
+        for accumulator in accumulators:
+            total.merge(accumulator)
+        return total
+
+    def run(self, inputs: Union[pd.DataFrame, Sequence[str]], partition_by: str = 'chunks',
+            n_partitions: Optional[int] = None) -> Dict:
+        """
+        Executa a análise completa (map, reduce e teste da hipótese).
+
+        Args:
+            inputs: DataFrame de eventos ou lista de caminhos de CSV (cada
+                arquivo é uma partição)
+            partition_by: Critério de partição para DataFrames ('decade',
+                'source' ou 'chunks')
+            n_partitions: Número de blocos para 'chunks' (padrão: 4 por processo)
+
+        Returns:
+            Dicionário com a hipótese, as hipóteses por fatia e o acumulador
+        """
+        if isinstance(inputs, pd.DataFrame):
+            partitions = partition_events(inputs, partition_by,
+                                          n_partitions or self.max_workers * 4)
+        else:
+            partitions = list(inputs)
+
+        accumulator = self.reduce(self.map(partitions))
+
+        return {
+            'hypothesis_test': self.analyzer.hypothesis_from_counts(accumulator),
+            'slices': {
+                dimension: self.analyzer.slice_hypotheses(accumulator, dimension)
+                for dimension in self.slice_by
+            },
+            'accumulator': accumulator,
+            'partitions': len(partitions),
+            'workers': self.max_workers
+        }
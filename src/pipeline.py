@@ -0,0 +1,250 @@
+"""
+PyNumerology-Matrix: Pipeline Leitura/Análise/Gravação
+
+Este módulo sobrepõe E/S e cálculo na análise em blocos. Em vez de ler um
+bloco, analisá-lo, gravá-lo e só então ler o próximo, três estágios rodam
+em threads ligadas por filas limitadas:
+
+    leitor (pré-busca) -> analisadores (N threads) -> gravador (assíncrono)
+
+A leitura de CSV, a compressão da saída e as operações vetorizadas do
+numpy/pandas liberam o GIL em boa parte do tempo, então threads bastam
+para que o disco e a CPU trabalhem ao mesmo tempo. O número de blocos em
+circulação é limitado (contrapressão): quando o gravador atrasa, o leitor
+para de ler em vez de acumular blocos em memória. O gravador recebe os
+resultados na ordem da leitura, então a saída é a mesma da execução serial.
+
+Cada estágio mede o tempo ocupado e o tempo parado esperando entrada
+(faminto) ou saída (bloqueado pela contrapressão); a utilização mostra
+qual estágio limita a vazão.
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable
+
+# Intervalo das esperas bloqueantes, para perceber falhas de outros estágios
+POLL_INTERVAL = 0.05
+
+_END = object()
+
+
+class _Aborted(Exception):
+    """Outro estágio falhou; a thread atual deve encerrar."""
+
+
+class StageStats:
+    """
+    Tempos acumulados de um estágio (somados entre as suas threads).
+    """
+
+    def __init__(self, name: str, threads: int = 1):
+        self.name = name
+        self.threads = threads
+        self.items = 0
+        self.busy = 0.0
+        self.wait_input = 0.0
+        self.wait_output = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, busy: float = 0.0, wait_input: float = 0.0, wait_output: float = 0.0,
+            items: int = 0):
+        with self._lock:
+            self.busy += busy
+            self.wait_input += wait_input
+            self.wait_output += wait_output
+            self.items += items
+
+    def as_dict(self, wall_seconds: float) -> Dict:
+        """
+        Resumo do estágio.
+
+        Args:
+            wall_seconds: Duração total do pipeline
+
+        Returns:
+            Dicionário com itens, tempos e utilização (tempo ocupado sobre
+            o tempo disponível das threads do estágio)
+        """
+        capacity = max(wall_seconds * self.threads, 1e-9)
+        return {
+            'threads': self.threads,
+            'items': self.items,
+            'busy_seconds': round(self.busy, 4),
+            'wait_input_seconds': round(self.wait_input, 4),
+            'wait_output_seconds': round(self.wait_output, 4),
+            'utilization': round(min(self.busy / capacity, 1.0), 4)
+        }
+
+
+class Pipeline:
+    """
+    Pipeline de três estágios com filas limitadas e contrapressão.
+    """
+
+    def __init__(self, read: Iterable, process: Callable, consume: Callable,
+                 workers: int = 2, queue_size: int = 4):
+        """
+        Inicializa o pipeline.
+
+        Args:
+            read: Iterável de blocos (ex: `pd.read_csv(..., chunksize=...)`),
+                consumido pela thread leitora
+            process: Função bloco -> resultado, executada pelas threads de análise
+            consume: Função resultado -> None, chamada pela thread gravadora
+                na ordem da leitura
+            workers: Threads de análise
+            queue_size: Capacidade da fila de pré-busca; no máximo
+                `queue_size + workers` blocos circulam ao mesmo tempo
+        """
+        if workers < 1 or queue_size < 1:
+            raise ValueError("workers e queue_size devem ser positivos")
+        self.read = read
+        self.process = process
+        self.consume = consume
+        self.workers = workers
+        self.queue_size = queue_size
+        self.stats = {'read': StageStats('read'), 'analyze': StageStats('analyze', workers),
+                      'write': StageStats('write')}
+        self.max_in_flight = queue_size + workers
+        self._slots = threading.Semaphore(self.max_in_flight)
+        self._read_queue = queue.Queue(maxsize=queue_size)
+        # Sem limite próprio: o semáforo já limita os blocos em circulação
+        self._write_queue = queue.Queue()
+        self._abort = threading.Event()
+        self._error = None
+        self._error_lock = threading.Lock()
+
+    def _check(self):
+        if self._abort.is_set():
+            raise _Aborted()
+
+    def _put(self, q: queue.Queue, item):
+        while True:
+            try:
+                q.put(item, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                self._check()
+
+    def _get(self, q: queue.Queue):
+        while True:
+            try:
+                return q.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                self._check()
+
+    def _acquire_slot(self):
+        while not self._slots.acquire(timeout=POLL_INTERVAL):
+            self._check()
+
+    def _run_stage(self, body: Callable):
+        """Executa o corpo de uma thread, registrando a primeira falha e abortando as demais."""
+        try:
+            body()
+        except _Aborted:
+            pass
+        except BaseException as e:
+            with self._error_lock:
+                if self._error is None:
+                    self._error = e
+            self._abort.set()
+
+    def _reader(self):
+        stats = self.stats['read']
+        iterator = iter(self.read)
+        seq = 0
+        while True:
+            start = time.perf_counter()
+            self._acquire_slot()
+            waited = time.perf_counter() - start
+
+            start = time.perf_counter()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                self._slots.release()
+                break
+            busy = time.perf_counter() - start
+
+            start = time.perf_counter()
+            self._put(self._read_queue, (seq, chunk))
+            stats.add(busy=busy, wait_output=waited + time.perf_counter() - start, items=1)
+            seq += 1
+        for _ in range(self.workers):
+            self._put(self._read_queue, _END)
+
+    def _analyzer(self):
+        stats = self.stats['analyze']
+        while True:
+            start = time.perf_counter()
+            item = self._get(self._read_queue)
+            waited = time.perf_counter() - start
+            if item is _END:
+                stats.add(wait_input=waited)
+                self._put(self._write_queue, _END)
+                return
+            seq, chunk = item
+
+            start = time.perf_counter()
+            result = self.process(chunk)
+            busy = time.perf_counter() - start
+            self._put(self._write_queue, (seq, result))
+            stats.add(busy=busy, wait_input=waited, items=1)
+
+    def _writer(self):
+        stats = self.stats['write']
+        pending = {}
+        next_seq = 0
+        finished = 0
+        while finished < self.workers:
+            start = time.perf_counter()
+            item = self._get(self._write_queue)
+            stats.add(wait_input=time.perf_counter() - start)
+            if item is _END:
+                finished += 1
+                continue
+            pending[item[0]] = item[1]
+            # Reordena: grava apenas a sequência contígua a partir de next_seq
+            while next_seq in pending:
+                result = pending.pop(next_seq)
+                start = time.perf_counter()
+                self.consume(result)
+                stats.add(busy=time.perf_counter() - start, items=1)
+                self._slots.release()
+                next_seq += 1
+
+    def run(self) -> Dict:
+        """
+        Executa o pipeline até o fim da leitura.
+
+        Returns:
+            Dicionário com 'wall_seconds', 'chunks', 'stages' (resumo de cada
+            estágio) e 'bottleneck' (estágio de maior utilização)
+
+        Raises:
+            A primeira exceção levantada por qualquer estágio
+        """
+        start = time.perf_counter()
+        threads = [threading.Thread(target=self._run_stage, args=(self._reader,), name='pipeline-read')]
+        threads += [threading.Thread(target=self._run_stage, args=(self._analyzer,),
+                                     name=f'pipeline-analyze-{i}') for i in range(self.workers)]
+        threads.append(threading.Thread(target=self._run_stage, args=(self._writer,),
+                                        name='pipeline-write'))
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self._error is not None:
+            raise self._error
+
+        wall = time.perf_counter() - start
+        stages = {name: stats.as_dict(wall) for name, stats in self.stats.items()}
+        return {
+            'wall_seconds': round(wall, 4),
+            'chunks': self.stats['write'].items,
+            'stages': stages,
+            'bottleneck': max(stages, key=lambda name: stages[name]['utilization'])
+        }
@@ -0,0 +1,317 @@
+"""
+PyNumerology-Matrix: Limitador de Taxa e Política de Novas Tentativas
+
+Este módulo controla o ritmo das requisições dos coletores. Cada host tem
+um limitador compartilhado por todos os coletores do processo: um balde de
+fichas (token bucket) define a taxa de requisições e um limite de
+concorrência define quantas podem estar em andamento ao mesmo tempo.
+
+Os dois limites são adaptativos: respostas 429/503 (ou falhas de rede)
+reduzem taxa e concorrência pela metade e respeitam o cabeçalho
+`Retry-After`; uma sequência de respostas saudáveis volta a aumentá-los
+aos poucos. Há no máximo uma redução por janela: as respostas de
+requisições enviadas antes da última redução (uma rajada de 429
+concorrentes) não a repetem. As novas tentativas usam backoff exponencial com jitter.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+
+class TokenBucket:
+    """
+    Balde de fichas: até `burst` requisições imediatas, depois `rate` por segundo.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        """
+        Inicializa o balde cheio.
+
+        Args:
+            rate: Fichas repostas por segundo
+            burst: Capacidade máxima do balde
+        """
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Consome uma ficha, esperando a reposição se o balde estiver vazio."""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def set_rate(self, rate: float):
+        """Altera a taxa, contabilizando antes as fichas da taxa anterior."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+
+class HostLimiter:
+    """
+    Limitador adaptativo de um host (aumento aditivo, redução multiplicativa).
+    """
+
+    THROTTLE_STATUSES = frozenset({429, 503})
+
+    def __init__(self, rate: float = 5.0, burst: Optional[float] = None, max_rate: Optional[float] = None,
+                 min_rate: float = 0.1, concurrency: int = 4, max_concurrency: Optional[int] = None,
+                 ramp_after: int = 20, backoff_factor: float = 0.5):
+        """
+        Inicializa o limitador.
+
+        Args:
+            rate: Taxa inicial, em requisições por segundo
+            burst: Capacidade do balde (padrão: igual à taxa, mínimo 1)
+            max_rate: Taxa máxima alcançável ao aumentar (padrão: a inicial)
+            min_rate: Taxa mínima ao reduzir
+            concurrency: Requisições simultâneas iniciais
+            max_concurrency: Concorrência máxima ao aumentar (padrão: a inicial)
+            ramp_after: Respostas saudáveis seguidas antes de cada aumento
+            backoff_factor: Fator aplicado à taxa a cada sinal de sobrecarga
+        """
+        self.max_rate = max_rate or rate
+        self.min_rate = min_rate
+        self.max_concurrency = max_concurrency or concurrency
+        self.concurrency = concurrency
+        self.ramp_after = ramp_after
+        self.backoff_factor = backoff_factor
+        self.bucket = TokenBucket(rate, burst or max(1.0, rate))
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.healthy_streak = 0
+        self.throttled = 0
+        self.decreases = 0
+        self.last_decrease = float('-inf')
+        # Janela sem nova redução (para liberações sem instante de envio)
+        self.cooldown_until = float('-inf')
+        # Média móvel da duração das requisições
+        self.rtt = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def acquire(self) -> float:
+        """
+        Espera uma vaga de concorrência, o fim de um `Retry-After` e uma ficha.
+
+        Returns:
+            Instante (monotônico) de envio, para repassar a `release`
+        """
+        with self._cond:
+            while self.in_flight >= self.concurrency:
+                self._cond.wait()
+            self.in_flight += 1
+        wait = self.blocked_until - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self.bucket.acquire()
+        return time.monotonic()
+
+    def release(self, status: Optional[int], retry_after: Optional[float] = None,
+                sent_at: Optional[float] = None):
+        """
+        Libera a vaga e ajusta os limites conforme a resposta.
+
+        Uma sobrecarga só reduz os limites se a requisição foi enviada
+        depois da última redução; sem `sent_at`, se a última redução é mais
+        antiga que uma duração média de requisição ou que o `Retry-After`.
+
+        Args:
+            status: Código HTTP da resposta (None para falha de rede/timeout)
+            retry_after: Segundos pedidos pelo servidor em `Retry-After`
+            sent_at: Instante de envio devolvido por `acquire`
+        """
+        with self._cond:
+            now = time.monotonic()
+            self.in_flight -= 1
+            if sent_at is not None:
+                self.rtt = 0.8 * self.rtt + 0.2 * (now - sent_at) if self.rtt else now - sent_at
+            if status is None or status in self.THROTTLE_STATUSES:
+                self.throttled += 1
+                self.healthy_streak = 0
+                fresh = sent_at >= self.last_decrease if sent_at is not None else now >= self.cooldown_until
+                if fresh:
+                    self.decreases += 1
+                    self.last_decrease = now
+                    self.cooldown_until = now + max(self.rtt, retry_after or 0.0)
+                    self.bucket.set_rate(max(self.min_rate, self.rate * self.backoff_factor))
+                    self.concurrency = max(1, self.concurrency // 2)
+                if retry_after:
+                    self.blocked_until = max(self.blocked_until, now + retry_after)
+            elif status < 500:
+                self.healthy_streak += 1
+                if self.healthy_streak >= self.ramp_after:
+                    self.healthy_streak = 0
+                    step = max(self.min_rate, self.max_rate / 10)
+                    self.bucket.set_rate(min(self.max_rate, self.rate + step))
+                    self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """Contexto que adquire o limitador e o libera como falha se houver exceção."""
+        sent_at = self.acquire()
+        outcome = {'status': None, 'retry_after': None}
+        try:
+            yield outcome
+        finally:
+            self.release(outcome['status'], outcome['retry_after'], sent_at)
+
+
+class RetryPolicy:
+    """
+    Novas tentativas com backoff exponencial e jitter completo.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, max_retries: int = 5, base_delay: float = 0.5, max_delay: float = 60.0,
+                 seed: Optional[int] = None):
+        """
+        Inicializa a política.
+
+        Args:
+            max_retries: Número máximo de novas tentativas
+            base_delay: Espera base, em segundos
+            max_delay: Espera máxima, em segundos
+            seed: Semente do jitter (para testes reprodutíveis)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = random.Random(seed)
+
+    def delay(self, attempt: int) -> float:
+        """Espera antes da nova tentativa `attempt` (0 = primeira): U(0, base * 2^attempt)."""
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Converte o cabeçalho `Retry-After` (segundos ou data HTTP) em segundos.
+
+    Returns:
+        Segundos de espera, ou None se ausente ou inválido
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class LimiterRegistry:
+    """
+    Limitadores por host, compartilhados por todas as sessões que usam o registro.
+    """
+
+    def __init__(self, defaults: Optional[Dict] = None, host_settings: Optional[Dict[str, Dict]] = None):
+        """
+        Inicializa o registro.
+
+        Args:
+            defaults: Parâmetros de HostLimiter para hosts sem configuração
+            host_settings: Parâmetros específicos por host
+        """
+        self.defaults = defaults or {}
+        self.host_settings = dict(host_settings or {})
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, **settings):
+        """Define os parâmetros de um host (substitui um limitador já criado)."""
+        with self._lock:
+            self.host_settings[host] = settings
+            self._limiters.pop(host, None)
+
+    def get(self, host: str) -> HostLimiter:
+        """Retorna o limitador do host, criando-o no primeiro uso."""
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                settings = {**self.defaults, **self.host_settings.get(host, {})}
+                limiter = self._limiters[host] = HostLimiter(**settings)
+            return limiter
+
+
+# Limites conhecidos dos endpoints usados pelos coletores. O serviço de
+# consultas do Wikidata aceita poucas consultas paralelas por cliente.
+HOST_SETTINGS = {
+    'query.wikidata.org': {'rate': 2.0, 'concurrency': 5},
+    'raw.githubusercontent.com': {'rate': 10.0, 'concurrency': 4},
+    'data.gdeltproject.org': {'rate': 5.0, 'concurrency': 4},
+}
+
+# Registro compartilhado pelos coletores do processo
+default_registry = LimiterRegistry(host_settings=HOST_SETTINGS)
+
+
+class RateLimitedSession(requests.Session):
+    """
+    Sessão `requests` que passa cada requisição pelo limitador do host e
+    repete as que falham de forma transitória.
+    """
+
+    def __init__(self, registry: Optional[LimiterRegistry] = None,
+                 retry: Optional[RetryPolicy] = None):
+        """
+        Inicializa a sessão.
+
+        Args:
+            registry: Registro de limitadores (padrão: o compartilhado)
+            retry: Política de novas tentativas
+        """
+        super().__init__()
+        self.registry = registry or default_registry
+        self.retry = retry or RetryPolicy()
+
+    def request(self, method, url, *args, **kwargs):
+        limiter = self.registry.get(urlsplit(url).netloc)
+        attempt = 0
+        while True:
+            with limiter.slot() as outcome:
+                try:
+                    response = super().request(method, url, *args, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    if attempt >= self.retry.max_retries:
+                        raise
+                    response = None
+                else:
+                    outcome['status'] = response.status_code
+                    outcome['retry_after'] = parse_retry_after(response.headers.get('Retry-After'))
+
+            if response is not None and (response.status_code not in self.retry.RETRY_STATUSES
+                                         or attempt >= self.retry.max_retries):
+                return response
+            if response is not None:
+                response.close()
+            # O próprio limitador espera o `Retry-After`; aqui só o jitter
+            time.sleep(self.retry.delay(attempt))
+            attempt += 1
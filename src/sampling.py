@@ -0,0 +1,179 @@
+"""
+PyNumerology-Matrix: Amostragem para Análise Aproximada
+
+Este módulo fornece as peças do modo aproximado do analisador: amostra de
+reservatório em uma única passada sobre blocos (para fontes lidas em
+fluxo), sorteio estratificado com alocação proporcional (para dados em
+memória) e estimativas das proporções por Ano Pessoal com intervalos de
+confiança, que decidem quando a amostra já atingiu a precisão pedida.
+"""
+
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+N_CELLS = 10
+
+
+def reservoir_sample(chunks: Iterable[pd.DataFrame], k: int,
+                     seed: Optional[int] = None) -> pd.DataFrame:
+    """
+    Amostra uniforme de até `k` linhas em uma única passada (algoritmo R).
+
+    Cada bloco é processado de forma vetorizada: a linha de índice global
+    i >= k entra com probabilidade k/(i+1), em uma posição sorteada do
+    reservatório.
+
+    Args:
+        chunks: Blocos de linhas (ex: `pd.read_csv(..., chunksize=...)`)
+        k: Tamanho do reservatório
+        seed: Semente do sorteio
+
+    Returns:
+        DataFrame com a amostra e atributo `attrs['population_size']`
+    """
+    rng = np.random.default_rng(seed)
+    # O reservatório guarda ponteiros para as linhas aceitas (pieces); as
+    # peças são compactadas quando crescem demais, limitando a memória
+    pieces = []
+    piece_rows = 0
+    slots = np.empty(k, dtype=np.int64)
+    filled = 0
+    seen = 0
+    for chunk in chunks:
+        n = len(chunk)
+        if n == 0:
+            continue
+        fill = min(k - filled, n)
+        take_slots = np.arange(filled, filled + fill)
+        take_rows = np.arange(fill)
+        if fill < n:
+            positions = np.arange(seen + fill, seen + n)
+            drawn = (rng.random(n - fill) * (positions + 1)).astype(np.int64)
+            accepted = np.flatnonzero(drawn < k)
+            # Com sorteios repetidos vale a última linha, como no algoritmo sequencial
+            drawn = drawn[accepted]
+            last = len(drawn) - 1 - np.unique(drawn[::-1], return_index=True)[1]
+            take_slots = np.concatenate([take_slots, drawn[last]])
+            take_rows = np.concatenate([take_rows, fill + accepted[last]])
+        filled += fill
+        seen += n
+
+        if len(take_rows):
+            pieces.append(chunk.iloc[take_rows])
+            slots[take_slots] = piece_rows + np.arange(len(take_rows))
+            piece_rows += len(take_rows)
+        if piece_rows > 4 * k:
+            pieces = [pd.concat(pieces, ignore_index=True).iloc[slots[:filled]]]
+            slots[:filled] = np.arange(filled)
+            piece_rows = filled
+
+    sample = (pd.concat(pieces, ignore_index=True).iloc[slots[:filled]].reset_index(drop=True)
+              if pieces else pd.DataFrame())
+    sample.attrs['population_size'] = seen
+    return sample
+
+
+class StratifiedSampler:
+    """
+    Sorteio com reposição, estratificado e com alocação proporcional.
+
+    Sem estratos, é uma amostra aleatória simples com reposição. O custo
+    de cada rodada depende apenas do número de linhas sorteadas.
+    """
+
+    def __init__(self, n_rows: int, strata=None, seed: Optional[int] = None):
+        """
+        Inicializa o sorteador.
+
+        Args:
+            n_rows: Tamanho da população
+            strata: Rótulo do estrato de cada linha (opcional)
+            seed: Semente do sorteio
+        """
+        self.rng = np.random.default_rng(seed)
+        self.n_rows = n_rows
+        if strata is None:
+            self.order = None
+            self.sizes = np.array([n_rows])
+        else:
+            codes, _ = pd.factorize(pd.Series(strata), use_na_sentinel=False)
+            self.order = np.argsort(codes, kind='stable')
+            self.sizes = np.bincount(codes)
+        self.starts = np.concatenate([[0], np.cumsum(self.sizes)[:-1]])
+        self.weights = self.sizes / n_rows
+
+    @property
+    def n_strata(self) -> int:
+        return len(self.sizes)
+
+    def draw(self, size: int):
+        """
+        Sorteia cerca de `size` linhas (ao menos uma por estrato).
+
+        Returns:
+            Tupla (posições das linhas, estrato de cada posição)
+        """
+        per_stratum = np.maximum(1, np.ceil(self.weights * size)).astype(np.int64)
+        stratum = np.repeat(np.arange(self.n_strata), per_stratum)
+        offsets = (self.rng.random(len(stratum)) * self.sizes[stratum]).astype(np.int64)
+        positions = self.starts[stratum] + offsets
+        if self.order is not None:
+            positions = self.order[positions]
+        return positions, stratum
+
+
+class ProportionEstimate(NamedTuple):
+    """Proporções estimadas por Ano Pessoal (índices 0-9) e seus erros."""
+    proportions: np.ndarray
+    standard_errors: np.ndarray
+    margin: np.ndarray
+    valid_fraction: float
+    sample_size: int
+
+
+def estimate_proportions(anos: np.ndarray, stratum: np.ndarray, weights: np.ndarray,
+                         confidence: float = 0.95) -> ProportionEstimate:
+    """
+    Estima as proporções por Ano Pessoal a partir de uma amostra estratificada.
+
+    Linhas com Ano Pessoal fora de 0-9 (datas inválidas, marcadas como -1)
+    ficam fora das proporções e entram apenas na fração válida. O erro
+    padrão é o do estimador estratificado, Σ W_h² p_h(1-p_h)/n_h.
+
+    Args:
+        anos: Ano Pessoal de cada linha sorteada
+        stratum: Estrato de cada linha sorteada
+        weights: Peso (fração da população) de cada estrato
+        confidence: Nível de confiança dos intervalos
+
+    Returns:
+        ProportionEstimate
+    """
+    n_strata = len(weights)
+    valid = (anos >= 0) & (anos < N_CELLS)
+    drawn = np.bincount(stratum, minlength=n_strata)
+    n_valid = np.bincount(stratum[valid], minlength=n_strata)
+    table = np.bincount(stratum[valid] * N_CELLS + anos[valid],
+                        minlength=n_strata * N_CELLS).reshape(n_strata, N_CELLS)
+
+    # Pesos dos estratos entre as linhas válidas
+    valid_share = np.divide(n_valid, drawn, out=np.zeros(n_strata), where=drawn > 0)
+    valid_weights = weights * valid_share
+    valid_fraction = float(valid_weights.sum())
+    if valid_fraction == 0:
+        zeros = np.zeros(N_CELLS)
+        return ProportionEstimate(zeros, zeros, zeros, 0.0, int(valid.sum()))
+    valid_weights = valid_weights / valid_fraction
+
+    p_h = np.divide(table, n_valid[:, None], out=np.zeros(table.shape, dtype=float),
+                    where=n_valid[:, None] > 0)
+    proportions = valid_weights @ p_h
+    variance = (valid_weights ** 2 / np.maximum(n_valid, 1)) @ (p_h * (1 - p_h))
+    standard_errors = np.sqrt(variance)
+    z = stats.norm.ppf(0.5 + confidence / 2)
+    return ProportionEstimate(proportions, standard_errors, z * standard_errors,
+                              valid_fraction, int(valid.sum()))
@@ -0,0 +1,423 @@
+"""
+PyNumerology-Matrix: Serviço HTTP Local
+
+Este módulo expõe a calculadora e o analisador por HTTP/JSON usando apenas
+a biblioteca padrão. Requisições concorrentes são agrupadas em micro-lotes
+e calculadas pelo caminho vetorizado da calculadora; Números do Destino de
+datas de nascimento frequentes ficam em cache. Inclui um teste de carga que
+mede latência (p50/p99) e requisições por segundo.
+
+Uso:
+    python src/service.py serve --port 8765
+    python src/service.py bench --url http://127.0.0.1:8765 --requests 5000
+"""
+
+import argparse
+import datetime
+import http.client
+import json
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .accumulators import AnoPessoalAccumulator
+    from .data_processor import NumerologyDataAnalyzer
+except ImportError:
+    # Fallback para import direto se executado como script
+    from accumulators import AnoPessoalAccumulator
+    from data_processor import NumerologyDataAnalyzer
+
+
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+class MicroBatcher:
+    """
+    Agrupa cálculos pessoais concorrentes em lotes vetorizados.
+
+    Uma thread dedicada espera o primeiro item, recolhe os demais que
+    chegarem dentro da janela `max_wait` (até `max_batch` itens) e calcula
+    o lote inteiro com uma única chamada a `calcular_ciclos_pessoais_array`.
+    """
+
+    def __init__(self, calc, max_batch: int = 512, max_wait: float = 0.002,
+                 cache_size: int = 65536):
+        """
+        Inicializa o agrupador.
+
+        Args:
+            calc: Instância de NumerologyCalculator
+            max_batch: Tamanho máximo do lote
+            max_wait: Janela de espera por itens adicionais, em segundos
+            cache_size: Número de datas de nascimento mantidas em cache
+        """
+        self.calc = calc
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.destino = lru_cache(maxsize=cache_size)(calc.calcular_numero_destino)
+        self.batches = 0
+        self.items = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, data_nasc: str, ano: int, mes: int = 0, dia: int = 0) -> Future:
+        """
+        Agenda o cálculo de Ano, Mês e Dia Pessoal.
+
+        Returns:
+            Future com o dicionário {'destino', 'ano_pessoal', 'mes_pessoal', 'dia_pessoal'}
+        """
+        future = Future()
+        self._queue.put((data_nasc, ano, mes, dia, future))
+        return future
+
+    def _run(self):
+        """Laço da thread de lotes."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                                 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch: List):
+        """Calcula um lote e resolve os futures correspondentes."""
+        try:
+            destinos = np.array([self.destino(item[0]) for item in batch], dtype=np.int64)
+            anos, meses, dias = (np.array([item[i] for item in batch], dtype=np.int64)
+                                 for i in (1, 2, 3))
+            anos_p, meses_p, dias_p = self.calc.calcular_ciclos_pessoais_array(destinos, anos, meses, dias)
+        except Exception as e:
+            for item in batch:
+                item[4].set_exception(e)
+            return
+
+        self.batches += 1
+        self.items += len(batch)
+        for i, item in enumerate(batch):
+            item[4].set_result({
+                'destino': int(destinos[i]),
+                'ano_pessoal': int(anos_p[i]),
+                'mes_pessoal': int(meses_p[i]),
+                'dia_pessoal': int(dias_p[i])
+            })
+
+
+class NumerologyService:
+    """
+    Lógica dos endpoints do serviço, independente do transporte HTTP.
+    """
+
+    def __init__(self, max_batch: int = 512, max_wait: float = 0.002, timeout: float = 5.0):
+        """
+        Inicializa o serviço.
+
+        Args:
+            max_batch: Tamanho máximo dos micro-lotes
+            max_wait: Janela de formação dos micro-lotes, em segundos
+            timeout: Tempo máximo de espera por um resultado, em segundos
+        """
+        self.analyzer = NumerologyDataAnalyzer()
+        self.calc = self.analyzer.calc
+        self.batcher = MicroBatcher(self.calc, max_batch, max_wait)
+        self.timeout = timeout
+        self.routes = {
+            '/destino': self.destino,
+            '/ano': self.ano,
+            '/mes': self.mes,
+            '/dia': self.dia,
+            '/ciclo-vida': self.ciclo_vida,
+            '/hipotese': self.hipotese,
+            '/status': self.status
+        }
+
+    @staticmethod
+    def _data(params: Dict, key: str) -> str:
+        """Valida um parâmetro de data 'YYYY-MM-DD'."""
+        value = str(params.get(key, ''))
+        if not DATE_PATTERN.match(value):
+            raise ValueError(f"Parâmetro '{key}' deve estar no formato YYYY-MM-DD")
+        return value
+
+    @staticmethod
+    def _inteiro(params: Dict, key: str, default: Optional[int] = None) -> int:
+        """Valida um parâmetro inteiro."""
+        value = params.get(key, default)
+        if value is None:
+            raise ValueError(f"Parâmetro '{key}' é obrigatório")
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Parâmetro '{key}' deve ser inteiro")
+
+    @staticmethod
+    def _lista(params: Dict, key: str) -> List:
+        """
+        Valida um parâmetro de lista: lista JSON (POST) ou valores separados
+        por vírgula na query string (GET, ex: '?anos=1999,2008').
+        """
+        value = params[key]
+        if isinstance(value, str):
+            return [parte.strip() for parte in value.split(',') if parte.strip()]
+        if not isinstance(value, list):
+            raise ValueError(f"Parâmetro '{key}' deve ser uma lista")
+        return value
+
+    def _calcular(self, data_nasc: str, ano: int, mes: int = 0, dia: int = 0) -> Dict:
+        """Envia um cálculo ao micro-lote e aguarda o resultado."""
+        return self.batcher.submit(data_nasc, ano, mes, dia).result(self.timeout)
+
+    def destino(self, params: Dict) -> Dict:
+        """Número do Destino de 'data_nasc' (direto do cache)."""
+        data_nasc = self._data(params, 'data_nasc')
+        return {'data_nasc': data_nasc, 'destino': self.batcher.destino(data_nasc)}
+
+    def ano(self, params: Dict) -> Dict:
+        """Ano Pessoal de 'data_nasc' em 'ano' (padrão: ano atual)."""
+        data_nasc = self._data(params, 'data_nasc')
+        ano = self._inteiro(params, 'ano', datetime.datetime.now().year)
+        result = self._calcular(data_nasc, ano)
+        return {'data_nasc': data_nasc, 'ano': ano, 'ano_pessoal': result['ano_pessoal']}
+
+    def mes(self, params: Dict) -> Dict:
+        """Mês Pessoal de 'data_nasc' em 'ano'/'mes'."""
+        data_nasc = self._data(params, 'data_nasc')
+        ano = self._inteiro(params, 'ano')
+        mes = self._inteiro(params, 'mes')
+        if not 1 <= mes <= 12:
+            raise ValueError("Parâmetro 'mes' deve estar entre 1 e 12")
+        result = self._calcular(data_nasc, ano, mes)
+        return {'data_nasc': data_nasc, 'ano': ano, 'mes': mes, 'mes_pessoal': result['mes_pessoal']}
+
+    def dia(self, params: Dict) -> Dict:
+        """Dia Pessoal de 'data_nasc' na data alvo 'data'."""
+        data_nasc = self._data(params, 'data_nasc')
+        data = self._data(params, 'data')
+        ano, mes, dia = (int(parte) for parte in data.split('-'))
+        result = self._calcular(data_nasc, ano, mes, dia)
+        return {'data_nasc': data_nasc, 'data': data, 'dia_pessoal': result['dia_pessoal']}
+
+    def ciclo_vida(self, params: Dict) -> Dict:
+        """Ciclo de vida de 'data_nasc' para 'anos_a_frente' anos."""
+        data_nasc = self._data(params, 'data_nasc')
+        anos_a_frente = self._inteiro(params, 'anos_a_frente', 10)
+        if not 0 <= anos_a_frente <= 100:
+            raise ValueError("Parâmetro 'anos_a_frente' deve estar entre 0 e 100")
+        ciclo = self.calc.analisar_ciclo_vida(data_nasc, anos_a_frente)
+        return {'data_nasc': data_nasc, 'ciclo': {str(ano): dados for ano, dados in ciclo.items()}}
+
+    def hipotese(self, params: Dict) -> Dict:
+        """Testa a hipótese do Ano 9 para uma lista de anos ou datas de eventos."""
+        if 'datas' in params:
+            datas = [str(data) for data in self._lista(params, 'datas')]
+            analysis_df = self.analyzer.analyze_event_cycles(pd.DataFrame({'date': datas}))
+            accumulator = AnoPessoalAccumulator.from_analysis(analysis_df)
+        elif 'anos' in params:
+            try:
+                anos = np.asarray([int(ano) for ano in self._lista(params, 'anos')], dtype=np.int64)
+            except (TypeError, ValueError):
+                raise ValueError("Parâmetro 'anos' deve ser uma lista de inteiros")
+            accumulator = AnoPessoalAccumulator().update(
+                self.calc.calcular_ano_pessoal_array("2000-01-01", anos))
+        else:
+            raise ValueError("Informe 'anos' ou 'datas'")
+        return self.analyzer.hypothesis_from_counts(accumulator)
+
+    def status(self, params: Dict) -> Dict:
+        """Métricas dos micro-lotes e do cache de destinos."""
+        cache = self.batcher.destino.cache_info()
+        return {
+            'batches': self.batcher.batches,
+            'items': self.batcher.items,
+            'cache_hits': cache.hits,
+            'cache_misses': cache.misses
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Handler HTTP/1.1 (keep-alive) que despacha para NumerologyService."""
+
+    protocol_version = 'HTTP/1.1'
+    # Cabeçalhos e corpo saem em escritas separadas; sem Nagle, evita o
+    # atraso de ACK atrasado (~40 ms) em conexões persistentes
+    disable_nagle_algorithm = True
+    service: NumerologyService = None
+
+    def _send(self, status: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False,
+                          default=lambda o: o.item() if hasattr(o, 'item') else str(o)).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, params: Dict):
+        path = urlsplit(self.path).path.rstrip('/') or '/'
+        endpoint = self.service.routes.get(path)
+        if endpoint is None:
+            self._send(404, {'error': f'Endpoint não encontrado: {path}'})
+            return
+        try:
+            self._send(200, endpoint(params))
+        except ValueError as e:
+            self._send(400, {'error': str(e)})
+        except Exception as e:
+            self._send(500, {'error': f'Erro interno: {e}'})
+
+    def do_GET(self):
+        self._dispatch(dict(parse_qsl(urlsplit(self.path).query)))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            params = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError:
+            self._send(400, {'error': 'Corpo JSON inválido'})
+            return
+        if not isinstance(params, dict):
+            self._send(400, {'error': 'Corpo JSON deve ser um objeto'})
+            return
+        self._dispatch(params)
+
+    def log_message(self, format, *args):
+        """Silencia o log por requisição."""
+        pass
+
+
+def create_server(host: str = '127.0.0.1', port: int = 8765,
+                  service: Optional[NumerologyService] = None) -> ThreadingHTTPServer:
+    """
+    Cria o servidor HTTP (sem iniciá-lo).
+
+    Args:
+        host: Endereço de escuta
+        port: Porta (0 escolhe uma porta livre)
+        service: Serviço a expor (padrão: um novo NumerologyService)
+
+    Returns:
+        Servidor pronto para `serve_forever`
+    """
+    handler = type('NumerologyHandler', (_Handler,), {'service': service or NumerologyService()})
+    server_class = type('NumerologyServer', (ThreadingHTTPServer,), {'request_queue_size': 128})
+    return server_class((host, port), handler)
+
+
+def run_load_test(url: str, n_requests: int = 5000, concurrency: int = 32,
+                  path: str = '/dia', payload: Optional[Dict] = None) -> Dict:
+    """
+    Teste de carga com conexões persistentes concorrentes.
+
+    Args:
+        url: URL base do serviço (ex: 'http://127.0.0.1:8765')
+        n_requests: Total de requisições
+        concurrency: Número de clientes simultâneos
+        path: Endpoint exercitado
+        payload: Corpo JSON (padrão: datas de nascimento variadas)
+
+    Returns:
+        Dicionário com p50/p99 (ms), requisições por segundo e erros
+    """
+    parts = urlsplit(url)
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    counter = iter(range(n_requests))
+
+    def client():
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=10)
+        local = []
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            body = payload or {'data_nasc': f"{1950 + i % 60}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+                               'data': '2025-06-15'}
+            start = time.perf_counter()
+            try:
+                conn.request('POST', path, json.dumps(body).encode('utf-8'),
+                             {'Content-Type': 'application/json'})
+                response = conn.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                ok = False
+                conn.close()
+                conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=10)
+            local.append(time.perf_counter() - start)
+            if not ok:
+                with lock:
+                    errors[0] += 1
+        conn.close()
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'concurrency': concurrency,
+        'elapsed_s': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 3) if len(latencies) else None,
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 3) if len(latencies) else None
+    }
+
+
+def main():
+    """Ponto de entrada de linha de comando."""
+    parser = argparse.ArgumentParser(description='Serviço HTTP do PyNumerology-Matrix')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help='Inicia o serviço')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--max-batch', type=int, default=512)
+    serve.add_argument('--max-wait-ms', type=float, default=2.0)
+
+    bench = commands.add_parser('bench', help='Executa o teste de carga')
+    bench.add_argument('--url', default='http://127.0.0.1:8765')
+    bench.add_argument('--requests', type=int, default=5000)
+    bench.add_argument('--concurrency', type=int, default=32)
+    bench.add_argument('--path', default='/dia')
+
+    args = parser.parse_args()
+    if args.command == 'serve':
+        service = NumerologyService(args.max_batch, args.max_wait_ms / 1000)
+        server = create_server(args.host, args.port, service)
+        print(f"Servindo em http://{args.host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        print(json.dumps(run_load_test(args.url, args.requests, args.concurrency, args.path), indent=2))
+
+
+if __name__ == "__main__":
+    main()
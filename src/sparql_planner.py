@@ -0,0 +1,201 @@
+"""
+PyNumerology-Matrix: Planejador de Consultas SPARQL
+
+Este módulo monta as consultas de eventos do Wikidata sem o caminho de
+propriedade `wdt:P31/wdt:P279*` avaliado por evento. O fecho de subclasses
+da classe raiz é resolvido uma única vez (e cacheado pelo coletor), já
+podado às classes com alguma instância datada (P585): o fecho completo de
+'occurrence' tem dezenas de milhares de classes, quase todas sem eventos
+com data, e cada lote delas custaria uma consulta. As consultas de eventos
+recebem as classes em lotes de `VALUES` e agregam os tipos de cada evento
+com GROUP_CONCAT, devolvendo uma linha por (evento, data) em vez de uma
+linha por (evento, data, tipo).
+"""
+
+from typing import Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+
+# Classe raiz dos eventos (occurrence)
+EVENT_CLASS = 'Q1190554'
+
+# Separador dos tipos agregados em 'typeLabel'
+TYPE_SEPARATOR = '|'
+
+ENTITY_PREFIX = 'http://www.wikidata.org/entity/'
+
+
+def closure_query(root: str = EVENT_CLASS, dated_by: Optional[str] = 'P585') -> str:
+    """
+    Consulta do fecho de subclasses de `root` (inclusive a própria raiz).
+
+    Com `dated_by`, só as classes com alguma instância direta que tenha
+    essa propriedade de data (as únicas que `events_query` pode retornar).
+    """
+    dated = (f"FILTER EXISTS {{ ?instance wdt:P31 ?class ; wdt:{dated_by} ?date . }}"
+             if dated_by else '')
+    return f"""
+    SELECT DISTINCT ?class WHERE {{
+      ?class wdt:P279* wd:{root} .
+      {dated}
+    }}
+    """
+
+
+def qid(uri: str) -> str:
+    """Extrai o QID de uma URI de entidade do Wikidata."""
+    return uri.rsplit('/', 1)[-1]
+
+
+def batched(items: Sequence, size: int) -> List[Sequence]:
+    """Divide uma sequência em lotes de até `size` itens."""
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def events_query(classes: Iterable[str], limit: Optional[int] = None, offset: int = 0,
+                 year_min: Optional[int] = 1900, year_max: Optional[int] = None,
+                 order_by: str = 'DESC(?date)') -> str:
+    """
+    Consulta de eventos instâncias diretas de um lote de classes.
+
+    Mesma semântica da consulta original (evento instância de alguma
+    subclasse da raiz, com data P585; tipos = todos os P31 do evento;
+    rótulos em inglês com o QID como alternativa), mas com uma linha por
+    (evento, data) e os rótulos dos tipos agregados por TYPE_SEPARATOR.
+
+    Args:
+        classes: QIDs das classes do lote
+        limit: Número máximo de linhas (None = sem limite)
+        offset: Deslocamento para paginação
+        year_min: Ano mínimo (inclusivo)
+        year_max: Ano máximo (exclusivo)
+        order_by: Ordenação SPARQL
+
+    Returns:
+        Texto da consulta
+    """
+    values = ' '.join(f"wd:{cls}" for cls in classes)
+    filters = []
+    if year_min is not None:
+        filters.append(f"YEAR(?date) >= {year_min}")
+    if year_max is not None:
+        filters.append(f"YEAR(?date) < {year_max}")
+    filter_clause = f"FILTER({' && '.join(filters)})" if filters else ''
+    limit_clause = f"LIMIT {limit}" if limit is not None else ''
+    offset_clause = f"OFFSET {offset}" if offset else ''
+    return f"""
+    SELECT ?event ?date (SAMPLE(?label) AS ?eventLabel)
+           (GROUP_CONCAT(DISTINCT ?typeName; separator="{TYPE_SEPARATOR}") AS ?typeLabel) WHERE {{
+      VALUES ?class {{ {values} }}
+      ?event wdt:P31 ?class ;
+             wdt:P585 ?date ;
+             wdt:P31 ?type .
+      {filter_clause}
+      OPTIONAL {{ ?event rdfs:label ?label . FILTER(LANG(?label) = "en") }}
+      OPTIONAL {{ ?type rdfs:label ?typeEn . FILTER(LANG(?typeEn) = "en") }}
+      BIND(COALESCE(?typeEn, STRAFTER(STR(?type), "{ENTITY_PREFIX}")) AS ?typeName)
+    }}
+    GROUP BY ?event ?date
+    ORDER BY {order_by}
+    {limit_clause}
+    {offset_clause}
+    """
+
+
+def people_query(year_min: int, year_max: int, limit: Optional[int] = None, offset: int = 0,
+                 require_death: bool = True) -> str:
+    """
+    Consulta de humanos (P31 Q5) nascidos em uma faixa de anos.
+
+    A faixa é filtrada por comparação direta de xsd:dateTime, que o
+    serviço resolve por intervalo no índice de P569, em vez de YEAR() por
+    pessoa. A ordem por ?person torna a paginação LIMIT/OFFSET estável.
+
+    Args:
+        year_min: Primeiro ano de nascimento (inclusivo)
+        year_max: Último ano de nascimento (exclusivo)
+        limit: Número máximo de linhas (None = sem limite)
+        offset: Deslocamento para paginação
+        require_death: Se True, só pessoas com data de morte (P570)
+
+    Returns:
+        Texto da consulta
+    """
+    death = "?person wdt:P570 ?deathDate ." if require_death else \
+        "OPTIONAL { ?person wdt:P570 ?deathDate . }"
+    limit_clause = f"LIMIT {limit}" if limit is not None else ''
+    offset_clause = f"OFFSET {offset}" if offset else ''
+    return f"""
+    SELECT ?person ?personLabel ?birthDate ?deathDate WHERE {{
+      ?person wdt:P569 ?birthDate .
+      FILTER(?birthDate >= "{_xsd_year(year_min)}"^^xsd:dateTime &&
+             ?birthDate < "{_xsd_year(year_max)}"^^xsd:dateTime)
+      ?person wdt:P31 wd:Q5 .
+      {death}
+      OPTIONAL {{ ?person rdfs:label ?personLabel . FILTER(LANG(?personLabel) = "en") }}
+    }}
+    ORDER BY ?person
+    {limit_clause}
+    {offset_clause}
+    """
+
+
+def _xsd_year(year: int) -> str:
+    """Início de um ano no formato xsd:dateTime do Wikidata (anos com sinal)."""
+    sign = '-' if year < 0 else ''
+    return f"{sign}{abs(year):04d}-01-01T00:00:00Z"
+
+
+def _join_types(values: pd.Series) -> str:
+    """União ordenada dos tipos agregados de um mesmo evento."""
+    types = set()
+    for value in values.dropna():
+        types.update(t for t in str(value).split(TYPE_SEPARATOR) if t)
+    return TYPE_SEPARATOR.join(sorted(types))
+
+
+def merge_event_batches(frames: Sequence[pd.DataFrame], limit: Optional[int] = None) -> pd.DataFrame:
+    """
+    Junta os resultados dos lotes de classes em uma linha por (evento, data).
+
+    Um evento instância de classes de lotes diferentes aparece em mais de
+    um lote: as linhas são unidas e os tipos, combinados. Eventos sem
+    rótulo em inglês recebem o QID, como faz o serviço de rótulos.
+
+    Args:
+        frames: Resultados de `events_query`, um por lote
+        limit: Se dado, mantém as `limit` linhas mais recentes (como
+            ORDER BY DESC(?date) LIMIT na consulta original)
+
+    Returns:
+        DataFrame com colunas 'event', 'eventLabel', 'date' e 'typeLabel'
+    """
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=['event', 'eventLabel', 'date', 'typeLabel'])
+    df = pd.concat(frames, ignore_index=True)
+    if 'eventLabel' not in df.columns:
+        df['eventLabel'] = None
+    if 'typeLabel' not in df.columns:
+        df['typeLabel'] = ''
+
+    merged = df.groupby(['event', 'date'], sort=False, as_index=False).agg(
+        eventLabel=('eventLabel', 'first'), typeLabel=('typeLabel', _join_types))
+    missing = merged['eventLabel'].isna() | (merged['eventLabel'] == '')
+    merged.loc[missing, 'eventLabel'] = merged.loc[missing, 'event'].map(qid)
+    merged = merged[['event', 'eventLabel', 'date', 'typeLabel']]
+
+    if limit is not None:
+        merged = merged.sort_values('date', ascending=False, kind='stable').head(limit)
+    return merged.reset_index(drop=True)
+
+
+def explode_types(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Expande os tipos agregados em uma linha por (evento, data, tipo).
+
+    Reproduz o formato da consulta original, útil para comparar resultados.
+    """
+    exploded = df.assign(typeLabel=df['typeLabel'].fillna('').str.split(TYPE_SEPARATOR))
+    return exploded.explode('typeLabel', ignore_index=True)
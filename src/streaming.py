@@ -0,0 +1,319 @@
+"""
+PyNumerology-Matrix: Monitoramento Contínuo de Eventos (Streaming)
+
+Este módulo acompanha a distribuição de Anos Pessoais de eventos que
+chegam em micro-lotes, como as atualizações de 15 minutos do GDELT 2.0.
+Cada lote é analisado assim que chega e somado a dois acumuladores: uma
+janela deslizante (lotes dos últimos N segundos, com remoção dos que saem
+da janela) e contagens com decaimento exponencial (meia-vida
+configurável). As estatísticas (qui-quadrado e z-score do Ano 9) são
+recalculadas a partir das 10 contagens, com custo constante por lote.
+
+O tempo de cada lote é o carimbo do próprio arquivo de atualização
+('YYYYMMDDHHMMSS.export.CSV.zip'), o que torna a reprodução de um diretório
+de arquivos determinística.
+"""
+
+import bisect
+import collections
+import os
+import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+try:
+    from .accumulators import AnoPessoalAccumulator
+    from .date_parser import parse_dates
+    from .numerology_calculator import NumerologyCalculator
+except ImportError:
+    # Fallback para import direto se executado como script
+    from accumulators import AnoPessoalAccumulator
+    from date_parser import parse_dates
+    from numerology_calculator import NumerologyCalculator
+
+
+LAST_UPDATE_URL = "http://data.gdeltproject.org/gdeltv2/lastupdate.txt"
+BATCH_ID_PATTERN = re.compile(r'(\d{14})\.export\.CSV\.zip$')
+
+N_CELLS = AnoPessoalAccumulator.N_CELLS
+
+
+def batch_timestamp(batch_id: str) -> float:
+    """Carimbo (segundos desde a época, UTC) de um lote 'YYYYMMDDHHMMSS'."""
+    return datetime.strptime(batch_id, '%Y%m%d%H%M%S').replace(tzinfo=timezone.utc).timestamp()
+
+
+def online_statistics(counts: np.ndarray) -> Dict:
+    """
+    Estatísticas da hipótese do Ano 9 a partir de contagens por Ano Pessoal.
+
+    Aceita contagens fracionárias (acumuladores com decaimento); nesse caso
+    o total é o tamanho efetivo da amostra.
+
+    Args:
+        counts: Contagens indexadas por Ano Pessoal (0-9)
+
+    Returns:
+        Dicionário com total, percentual e z-score do Ano 9, qui-quadrado e p-valor
+    """
+    observed = np.asarray(counts, dtype=float)[1:N_CELLS]
+    n = float(observed.sum())
+    if n <= 0:
+        return {'events': 0.0, 'ano_9_percentage': 0.0, 'z_score': 0.0,
+                'chi_square_stat': 0.0, 'p_value': 1.0}
+    expected = n / 9
+    chi_square = float(((observed - expected) ** 2).sum() / expected)
+    return {
+        'events': round(n, 3),
+        'ano_9_percentage': round(observed[-1] / n * 100, 2),
+        'z_score': float((observed[-1] - expected) / np.sqrt(n * (1 / 9) * (8 / 9))),
+        'chi_square_stat': chi_square,
+        'p_value': float(stats.chi2.sf(chi_square, 8))
+    }
+
+
+class SlidingWindowCounts:
+    """
+    Contagens dos lotes dentro de uma janela de tempo deslizante.
+
+    Cada lote guarda suas 10 contagens; ao entrar um lote novo, os que
+    saíram da janela são subtraídos da soma corrente.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self.batches = collections.deque()
+        self.counts = np.zeros(N_CELLS, dtype=np.int64)
+        self.latest = None
+
+    def add(self, timestamp: float, counts: np.ndarray) -> np.ndarray:
+        """
+        Adiciona um lote e remove os anteriores a `timestamp - janela`.
+
+        Os lotes ficam em ordem de carimbo: um lote atrasado entra na sua
+        posição, e um que já chega fora da janela é descartado.
+        """
+        self.latest = timestamp if self.latest is None else max(self.latest, timestamp)
+        cutoff = self.latest - self.window_seconds
+        if timestamp <= cutoff:
+            return self.counts
+        position = bisect.bisect_right(self.batches, timestamp, key=lambda batch: batch[0])
+        self.batches.insert(position, (timestamp, counts))
+        self.counts += counts
+        while self.batches and self.batches[0][0] <= cutoff:
+            _, old = self.batches.popleft()
+            self.counts -= old
+        return self.counts
+
+
+class DecayedCounts:
+    """
+    Contagens com decaimento exponencial: o peso de um evento cai à metade
+    a cada `half_life_seconds`.
+    """
+
+    def __init__(self, half_life_seconds: float):
+        self.half_life_seconds = half_life_seconds
+        self.counts = np.zeros(N_CELLS, dtype=float)
+        self.timestamp = None
+
+    def add(self, timestamp: float, counts: np.ndarray) -> np.ndarray:
+        """
+        Decai as contagens até `timestamp` e soma o lote.
+
+        Um lote atrasado (anterior ao último carimbo) entra já decaído pelo
+        seu atraso, como se tivesse chegado na ordem.
+        """
+        if self.timestamp is not None and timestamp > self.timestamp:
+            self.counts *= 0.5 ** ((timestamp - self.timestamp) / self.half_life_seconds)
+        elif self.timestamp is not None and timestamp < self.timestamp:
+            counts = counts * 0.5 ** ((self.timestamp - timestamp) / self.half_life_seconds)
+        self.timestamp = timestamp if self.timestamp is None else max(self.timestamp, timestamp)
+        self.counts += counts
+        return self.counts
+
+
+class DirectoryFeed:
+    """
+    Substituto local do feed: arquivos de exportação que aparecem em um diretório.
+
+    Os arquivos devem surgir já completos (ex: gravados com outro nome e
+    renomeados), como faz o espelhamento do GDELT.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.seen = set()
+
+    def poll(self) -> List[Tuple[str, bytes]]:
+        """
+        Lotes novos desde a última consulta, em ordem de carimbo.
+
+        Returns:
+            Lista de (carimbo do lote, conteúdo do .zip)
+        """
+        batches = []
+        for filename in sorted(os.listdir(self.directory)):
+            match = BATCH_ID_PATTERN.search(filename)
+            if match is None or filename in self.seen:
+                continue
+            with open(os.path.join(self.directory, filename), 'rb') as f:
+                batches.append((match.group(1), f.read()))
+            self.seen.add(filename)
+        return batches
+
+
+class GDELTUpdateFeed:
+    """
+    Feed de atualizações de 15 minutos do GDELT 2.0 (arquivo 'lastupdate.txt').
+    """
+
+    def __init__(self, session, url: str = LAST_UPDATE_URL, timeout: float = 60):
+        """
+        Inicializa o feed.
+
+        Args:
+            session: Sessão HTTP (ex: a do GDELTCollector)
+            url: URL do índice da última atualização
+            timeout: Timeout das requisições, em segundos
+        """
+        self.session = session
+        self.url = url
+        self.timeout = timeout
+        self.last_batch = None
+
+    def poll(self) -> List[Tuple[str, bytes]]:
+        """
+        Baixa a exportação mais recente, se ainda não foi vista.
+
+        Returns:
+            Lista com zero ou um (carimbo do lote, conteúdo do .zip)
+        """
+        response = self.session.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        # Linhas 'tamanho md5 url' para export, mentions e gkg
+        for line in response.text.splitlines():
+            parts = line.split()
+            match = BATCH_ID_PATTERN.search(parts[-1]) if parts else None
+            if match is None:
+                continue
+            if match.group(1) == self.last_batch:
+                return []
+            payload = self.session.get(parts[-1], timeout=self.timeout)
+            payload.raise_for_status()
+            self.last_batch = match.group(1)
+            return [(match.group(1), payload.content)]
+        return []
+
+
+class StreamingMonitor:
+    """
+    Acumuladores de janela deslizante, com decaimento e totais de um fluxo de lotes.
+    """
+
+    def __init__(self, window_seconds: float = 24 * 3600, half_life_seconds: float = 6 * 3600,
+                 data_nasc: str = "2000-01-01"):
+        """
+        Inicializa o monitor.
+
+        Args:
+            window_seconds: Largura da janela deslizante
+            half_life_seconds: Meia-vida do decaimento exponencial
+            data_nasc: Data de nascimento genérica da análise coletiva
+        """
+        self.calc = NumerologyCalculator()
+        self.data_nasc = data_nasc
+        self.window = SlidingWindowCounts(window_seconds)
+        self.decayed = DecayedCounts(half_life_seconds)
+        self.cumulative = AnoPessoalAccumulator()
+        self.batches = 0
+
+    def process(self, batch_id: str, events: pd.DataFrame) -> Dict:
+        """
+        Analisa um micro-lote e atualiza os acumuladores.
+
+        Args:
+            batch_id: Carimbo do lote ('YYYYMMDDHHMMSS')
+            events: Eventos do lote, com coluna 'date'
+
+        Returns:
+            Instantâneo com as estatísticas do lote, da janela, do
+            decaimento e do total acumulado, e a latência do lote
+        """
+        start = time.perf_counter()
+        parsed = parse_dates(events['date']) if len(events) else parse_dates([])
+        anos = self.calc.calcular_ano_pessoal_array(self.data_nasc, parsed.year[parsed.valid])
+        counts = np.bincount(anos, minlength=N_CELLS)[:N_CELLS].astype(np.int64)
+
+        timestamp = batch_timestamp(batch_id)
+        self.window.add(timestamp, counts)
+        self.decayed.add(timestamp, counts)
+        self.cumulative.update(anos)
+        self.batches += 1
+
+        return {
+            'batch_id': batch_id,
+            'batch_events': len(events),
+            'batch': online_statistics(counts),
+            'window': dict(online_statistics(self.window.counts), batches=len(self.window.batches)),
+            'decayed': online_statistics(self.decayed.counts),
+            'cumulative': online_statistics(self.cumulative.counts),
+            'latency_ms': round((time.perf_counter() - start) * 1000, 3)
+        }
+
+
+def run_stream(feed, parse, monitor: StreamingMonitor, poll_interval: float = 60.0,
+               max_batches: Optional[int] = None, idle_timeout: Optional[float] = None,
+               sleep=time.sleep) -> Iterator[Dict]:
+    """
+    Laço de streaming: consulta o feed, analisa cada lote novo e produz instantâneos.
+
+    Falhas ao consultar o feed ou ao ler um lote são registradas e o laço
+    continua; um lote ilegível é descartado (o feed já o marcou como visto).
+
+    Args:
+        feed: Objeto com `poll()` -> [(carimbo, conteúdo)]
+        parse: Função conteúdo -> DataFrame de eventos
+        monitor: Monitor que acumula os lotes
+        poll_interval: Segundos entre consultas sem lotes novos
+        max_batches: Para após este número de lotes (None: sem limite)
+        idle_timeout: Para após tantos segundos sem lotes novos (None: nunca)
+        sleep: Função de espera (substituível em testes)
+
+    Yields:
+        Instantâneos de `StreamingMonitor.process`, com a latência total
+        (leitura + análise) em 'total_latency_ms'
+    """
+    processed = 0
+    idle_since = time.monotonic()
+    while max_batches is None or processed < max_batches:
+        try:
+            batches = feed.poll()
+        except Exception as e:
+            print(f"Erro ao consultar o feed: {e}")
+            batches = []
+        for batch_id, payload in batches:
+            start = time.perf_counter()
+            try:
+                events = parse(payload)
+            except Exception as e:
+                # Arquivo corrompido ou truncado: descarta o lote, sem encerrar o fluxo
+                print(f"Erro ao ler o lote {batch_id}: {e}")
+                continue
+            snapshot = monitor.process(batch_id, events)
+            snapshot['total_latency_ms'] = round((time.perf_counter() - start) * 1000, 3)
+            processed += 1
+            yield snapshot
+            if max_batches is not None and processed >= max_batches:
+                return
+        if batches:
+            idle_since = time.monotonic()
+        elif idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+            return
+        else:
+            sleep(poll_interval)
@@ -0,0 +1,204 @@
+"""
+PyNumerology-Matrix: Leitura de Dumps JSON do Wikidata
+
+Alternativa offline às consultas SPARQL (limitadas por tempo e por número
+de linhas): lê um dump de entidades do Wikidata ('latest-all.json.bz2',
+'.gz' ou sem compressão) em fluxo e extrai apenas as entidades com data
+pontual (P585) e os humanos com data de nascimento (P569) e de morte
+(P570), no mesmo formato das tabelas coletadas via SPARQL.
+
+O dump tem uma entidade por linha (entre '[' e ']', com vírgula no fim de
+cada linha). O processo principal descompacta o arquivo e o corta em
+blocos de linhas de ~`chunk_bytes`; a decodificação do JSON, que domina o
+custo, é feita em paralelo por um pool de processos. Linhas sem nenhuma
+das propriedades procuradas são descartadas por busca de bytes, antes do
+`json.loads`. No máximo `max_pending` blocos ficam em memória ao mesmo
+tempo e os resultados são entregues na ordem do dump, então a memória
+não cresce com o tamanho do arquivo.
+"""
+
+import bz2
+import collections
+import gzip
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    from .sparql_planner import ENTITY_PREFIX, TYPE_SEPARATOR
+except ImportError:
+    # Fallback para import direto se executado como script
+    from sparql_planner import ENTITY_PREFIX, TYPE_SEPARATOR
+
+
+EVENT_PROPERTY = 'P585'     # point in time
+BIRTH_PROPERTY = 'P569'     # date of birth
+DEATH_PROPERTY = 'P570'     # date of death
+INSTANCE_OF = 'P31'
+HUMAN = 'Q5'
+
+EVENT_COLUMNS = ['event', 'eventLabel', 'date', 'typeLabel']
+PEOPLE_COLUMNS = ['person', 'personLabel', 'birthDate', 'deathDate']
+
+# Pré-filtro por bytes: só linhas com uma destas chaves passam pelo json.loads
+_MARKERS = tuple(f'"{prop}"'.encode() for prop in (EVENT_PROPERTY, BIRTH_PROPERTY))
+
+
+class DumpRecords(NamedTuple):
+    """Registros extraídos de um bloco do dump."""
+    lines: int
+    events: List[Tuple]
+    people: List[Tuple]
+
+
+def open_dump(path: str):
+    """Abre um dump em modo binário, descompactando '.bz2' e '.gz' em fluxo."""
+    if path.endswith('.bz2'):
+        return bz2.open(path, 'rb')
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def iter_line_chunks(stream, chunk_bytes: int = 8 << 20) -> Iterator[List[bytes]]:
+    """
+    Corta um fluxo em blocos de linhas completas de ~`chunk_bytes` bytes.
+
+    Args:
+        stream: Arquivo binário
+        chunk_bytes: Tamanho aproximado de cada bloco
+
+    Yields:
+        Listas de linhas (bytes)
+    """
+    while True:
+        lines = stream.readlines(chunk_bytes)
+        if not lines:
+            return
+        yield lines
+
+
+def _time_value(time: str) -> str:
+    """
+    Converte um valor de tempo do Wikidata ('+1969-07-20T00:00:00Z', com
+    mês e dia '00' nas precisões de ano e de mês) para o formato que o
+    SPARQL devolve ('1969-07-20T00:00:00Z', mês e dia mínimos 1).
+    """
+    sign = '-' if time.startswith('-') else ''
+    year, month, rest = time.lstrip('+-').split('-', 2)
+    day = rest[:2]
+    return f"{sign}{year}-{month if month != '00' else '01'}-{day if day != '00' else '01'}T00:00:00Z"
+
+
+def _truthy_values(claims: Dict, prop: str) -> List:
+    """
+    Valores "verdadeiros" de uma propriedade, como o prefixo wdt: do SPARQL:
+    as declarações de posto preferido, ou, sem elas, as de posto normal.
+    """
+    statements = [s for s in claims.get(prop, ()) if s.get('rank') != 'deprecated']
+    preferred = [s for s in statements if s.get('rank') == 'preferred']
+    values = []
+    for statement in preferred or statements:
+        snak = statement.get('mainsnak', {})
+        if snak.get('snaktype') == 'value':
+            values.append(snak['datavalue']['value'])
+    return values
+
+
+def _dates(claims: Dict, prop: str) -> List[str]:
+    """Datas (formato SPARQL) dos valores verdadeiros de uma propriedade de tempo."""
+    return [_time_value(value['time']) for value in _truthy_values(claims, prop)
+            if isinstance(value, dict) and 'time' in value]
+
+
+def extract_records(lines: Sequence[bytes], event_classes: Optional[frozenset] = None,
+                    language: str = 'en') -> DumpRecords:
+    """
+    Extrai eventos e pessoas de um bloco de linhas do dump.
+
+    Eventos são entidades com P585 (uma linha por data, como no SPARQL),
+    opcionalmente restritas às instâncias de `event_classes`; pessoas são
+    instâncias de Q5 (humano) com P569 (a primeira data de nascimento e a
+    primeira de morte, como `WikidataCollector._clean_people`).
+
+    Args:
+        lines: Linhas do dump (uma entidade JSON por linha)
+        event_classes: QIDs aceitos em P31 para eventos (None: qualquer)
+        language: Idioma dos rótulos (sem rótulo, fica o QID)
+
+    Returns:
+        DumpRecords com tuplas nas ordens de EVENT_COLUMNS e PEOPLE_COLUMNS
+    """
+    events, people = [], []
+    for line in lines:
+        if not any(marker in line for marker in _MARKERS):
+            continue
+        line = line.strip().rstrip(b',')
+        if not line.startswith(b'{'):
+            continue
+        entity = json.loads(line)
+        claims = entity.get('claims') or {}
+        entity_id = entity['id']
+        label = (entity.get('labels') or {}).get(language, {}).get('value') or entity_id
+        types = [value['id'] for value in _truthy_values(claims, INSTANCE_OF)
+                 if isinstance(value, dict) and 'id' in value]
+
+        if EVENT_PROPERTY in claims and (event_classes is None or event_classes.intersection(types)):
+            type_label = TYPE_SEPARATOR.join(sorted(types))
+            for date in dict.fromkeys(_dates(claims, EVENT_PROPERTY)):
+                events.append((ENTITY_PREFIX + entity_id, label, date, type_label))
+
+        if BIRTH_PROPERTY in claims and HUMAN in types:
+            births = _dates(claims, BIRTH_PROPERTY)
+            deaths = _dates(claims, DEATH_PROPERTY)
+            if births:
+                people.append((ENTITY_PREFIX + entity_id, label, births[0],
+                               deaths[0] if deaths else None))
+    return DumpRecords(len(lines), events, people)
+
+
+def _extract_task(task) -> DumpRecords:
+    """Desempacota uma tarefa do pool (função de módulo para ser serializável)."""
+    lines, event_classes, language = task
+    return extract_records(lines, event_classes, language)
+
+
+def iter_dump_records(path: str, workers: Optional[int] = None, chunk_bytes: int = 8 << 20,
+                      max_pending: Optional[int] = None,
+                      event_classes: Optional[Iterable[str]] = None,
+                      language: str = 'en') -> Iterator[DumpRecords]:
+    """
+    Lê um dump e produz os registros de cada bloco, na ordem do arquivo.
+
+    Args:
+        path: Caminho do dump ('.json', '.json.bz2' ou '.json.gz')
+        workers: Processos de decodificação (padrão: os.cpu_count(); 0 ou 1
+            decodifica no próprio processo)
+        chunk_bytes: Tamanho aproximado de cada bloco de linhas
+        max_pending: Blocos em processamento ao mesmo tempo (padrão:
+            2 * workers); limita a memória usada
+        event_classes: QIDs aceitos em P31 para eventos (None: qualquer)
+        language: Idioma dos rótulos
+
+    Yields:
+        DumpRecords de cada bloco
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    classes = frozenset(event_classes) if event_classes is not None else None
+    with open_dump(path) as stream:
+        chunks = iter_line_chunks(stream, chunk_bytes)
+        if workers <= 1:
+            for lines in chunks:
+                yield extract_records(lines, classes, language)
+            return
+
+        max_pending = max_pending or 2 * workers
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = collections.deque()
+            for lines in chunks:
+                pending.append(pool.submit(_extract_task, (lines, classes, language)))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
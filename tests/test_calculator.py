@@ -6,6 +6,8 @@ import sys
 import os
 import unittest
 
+import pandas as pd
+
 # Adicionar src ao path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
@@ -26,6 +28,12 @@ class TestNumerologyCalculator(unittest.TestCase):
         self.assertEqual(self.calc._reduzir_digito(9), 9)
         self.assertEqual(self.calc._reduzir_digito(0), 0)
 
+    def test_reduzir_digito_array(self):
+        """Testa a redução vetorizada contra a versão escalar."""
+        numeros = list(range(-5, 5000))
+        esperado = [self.calc._reduzir_digito(n) for n in numeros]
+        self.assertEqual(self.calc._reduzir_digito_array(numeros).tolist(), esperado)
+
     def test_calcular_numero_destino(self):
         """Testa cálculo do Número do Destino."""
         # 1995-08-16: 1+9+9+5+0+8+1+6 = 39 -> 3+9 = 12 -> 1+2 = 3
@@ -42,6 +50,42 @@ class TestNumerologyCalculator(unittest.TestCase):
         # Mesmo ano, deve ser consistente
         self.assertEqual(self.calc.calcular_ano_pessoal("1995-08-16", 2025), 3)
 
+    def test_calcular_ano_pessoal_array(self):
+        """Testa o Ano Pessoal vetorizado."""
+        anos = list(range(1900, 2101))
+        esperado = [self.calc.calcular_ano_pessoal("1995-08-16", ano) for ano in anos]
+        self.assertEqual(self.calc.calcular_ano_pessoal_array("1995-08-16", anos).tolist(), esperado)
+
+    def test_numeros_nome(self):
+        """Testa os números de nome com acentos."""
+        # JOSE CONCEICAO: 1+6+1+5 + 3+6+5+3+5+9+3+1+6 = 54 -> 9
+        self.assertEqual(self.calc.calcular_numero_expressao("José Conceição"), 9)
+        # Vogais O E O E I A O: 6+5+6+5+9+1+6 = 38 -> 11 -> 2
+        self.assertEqual(self.calc.calcular_numero_alma("José Conceição"), 2)
+        self.assertEqual(self.calc.calcular_numero_personalidade("José Conceição"), 7)
+        self.assertEqual(self.calc.calcular_numero_expressao("123"), 0)
+
+    def test_numeros_nome_array(self):
+        """Testa o cálculo em lote contra a versão escalar."""
+        nomes = ["José Conceição", "Łódź", "Ｆｕｌｌ", "𝐀𝐁 ábc", "", None, "Straße", "São Paulo"]
+        escalares = {
+            'expressao': self.calc.calcular_numero_expressao,
+            'alma': self.calc.calcular_numero_alma,
+            'personalidade': self.calc.calcular_numero_personalidade,
+        }
+        for tipo, funcao in escalares.items():
+            esperado = [funcao(nome) if isinstance(nome, str) else 0 for nome in nomes]
+            self.assertEqual(self.calc.calcular_numeros_nome_array(nomes, tipo).tolist(), esperado)
+
+    def test_numeros_nome_array_com_nul(self):
+        """Testa que um NUL dentro de um nome não desloca os nomes seguintes."""
+        nomes = ['a\x00b', 'ab', '\x00', 'Maria']
+        esperado = [self.calc.calcular_numero_expressao(nome) for nome in nomes]
+        for entrada in (nomes, pd.Series(nomes)):
+            resultado = self.calc.calcular_numeros_nome_array(entrada)
+            self.assertEqual(len(resultado), len(nomes))
+            self.assertEqual(resultado.tolist(), esperado)
+
     def test_interpretar_ano_pessoal(self):
         """Testa interpretações."""
         interpretacao_9 = self.calc.interpretar_ano_pessoal(9)
@@ -0,0 +1,106 @@
+"""
+Testes do perfil exaustivo do calendário e da linha de base exata
+"""
+
+import sys
+import os
+import datetime
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import calendar_profile
+from calendar_profile import CalendarProfiler, calendar_cycles
+from data_processor import NumerologyDataAnalyzer
+from numerology_calculator import NumerologyCalculator
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+class TestCalendarProfile(unittest.TestCase):
+    """Testes dos ciclos de todo o calendário, do cache e das hipóteses exatas."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cycles_match_calculator(self):
+        """Testa os arrays do calendário contra a calculadora escalar."""
+        cycles = calendar_cycles(1999, 2001)
+        calc = NumerologyCalculator()
+        self.assertEqual(len(cycles.year), 365 + 366 + 365)
+        for i in np.random.default_rng(0).integers(0, len(cycles.year), 50):
+            date = datetime.date(int(cycles.year[i]), int(cycles.month[i]), int(cycles.day[i]))
+            iso = date.isoformat()
+            self.assertEqual(cycles.weekday[i], date.weekday())
+            self.assertEqual(cycles.destino[i], calc.calcular_numero_destino(iso))
+            self.assertEqual(cycles.ano_pessoal[i], calc.calcular_ano_pessoal('2000-01-01', date.year))
+            self.assertEqual(cycles.dia_pessoal[i], calc.calcular_dia_pessoal('2000-01-01', iso))
+
+    def test_profile_and_cache(self):
+        """Testa marginais, autocorrelação e a releitura do perfil do disco."""
+        profile = CalendarProfiler(self.tmp.name).profile(1900, 2099)
+        self.assertEqual(profile['days'], 73049)
+        self.assertAlmostEqual(sum(profile['marginals']['destino']['probabilities']), 1.0)
+        # O Mês Pessoal só muda na virada do mês: quase sempre se repete no dia seguinte
+        self.assertGreater(profile['autocorrelation']['daily']['mes_pessoal']['1']['repeat_rate'], 0.95)
+        self.assertLess(profile['autocorrelation']['daily']['dia_pessoal']['1']['repeat_rate'], 0.05)
+        self.assertIn('dia_pessoal|weekday', profile['conditionals'])
+
+        with mock.patch.object(calendar_profile, 'calendar_cycles', side_effect=AssertionError):
+            self.assertEqual(CalendarProfiler(self.tmp.name).profile(1900, 2099), profile)
+
+    def test_exact_baseline(self):
+        """Testa que a linha de base só é ~1/9 quando o número de anos é múltiplo de 9."""
+        profiler = CalendarProfiler(self.tmp.name)
+        nine_years = profiler.expected_probabilities(2001, 2009)
+        np.testing.assert_allclose(nine_years, 1 / 9, atol=1e-3)
+        uneven = profiler.expected_probabilities(1905, 2024)
+        self.assertGreater(np.abs(uneven - 1 / 9).max(), 0.005)
+        self.assertAlmostEqual(uneven.sum(), 1.0)
+
+    def test_hypothesis_with_exact_baseline(self):
+        """Testa a hipótese contra a linha de base exata do calendário."""
+        analyzer = NumerologyDataAnalyzer(state_dir=self.tmp.name)
+        analysis = analyzer.analyze_event_cycles(
+            pd.read_csv(os.path.join(DATA_DIR, 'historical_events_5000_synthetic.csv')))
+        uniform = analyzer.test_hypothesis_ano_9(analysis)
+        explicit = analyzer.test_hypothesis_ano_9(analysis, expected=np.full(9, 1 / 9))
+        exact = analyzer.test_hypothesis_ano_9(analysis, expected='calendar')
+
+        self.assertAlmostEqual(explicit['chi_square_stat'], uniform['chi_square_stat'])
+        self.assertAlmostEqual(explicit['z_score'], uniform['z_score'])
+        baseline = analyzer.calendar_baseline(int(analysis['year'].min()), int(analysis['year'].max()))
+        self.assertAlmostEqual(exact['expected_ano_9'], round(5000 * baseline[8], 2))
+        self.assertNotAlmostEqual(exact['chi_square_stat'], uniform['chi_square_stat'])
+        with self.assertRaises(ValueError):
+            analyzer.test_hypothesis_ano_9(analysis, expected='lunar')
+
+    def test_negative_years(self):
+        """Testa eventos antes de Cristo: ciclos fora de 1-9 ficam fora da linha de base."""
+        analyzer = NumerologyDataAnalyzer(state_dir=self.tmp.name)
+        analysis = analyzer.analyze_event_cycles(pd.DataFrame({
+            'event': ['Batalha de Maratona', 'Virada do século', 'Armistício'],
+            'date': ['-0490-05-01', '1900-01-01', '1918-11-11']}))
+        self.assertLess(analysis['ano_pessoal'].min(), 1)
+
+        exact = analyzer.test_hypothesis_ano_9(analysis, expected='calendar')
+        baseline = analyzer.calendar_baseline(1900, 1918)
+        self.assertEqual(exact['total_events'], 3)
+        self.assertAlmostEqual(exact['expected_ano_9'], round(3 * baseline[8], 2))
+
+        profile = CalendarProfiler(self.tmp.name).profile(-500, -490, day_lags=(1,), year_lags=(1,))
+        self.assertEqual(sum(profile['marginals']['ano_pessoal']['counts']), 0)
+        self.assertEqual(sum(profile['marginals']['destino']['counts']), profile['days'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Testes unitários para coletas retomáveis com checkpoints
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from checkpoint import CollectionCheckpoint
+from data_processor import DataProcessor
+
+
+class TestCollectionCheckpoint(unittest.TestCase):
+    """Testes para o checkpoint e a coleta paginada."""
+
+    def setUp(self):
+        """Processador com diretório de cache temporário."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.processor = DataProcessor(cache_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_manifest_roundtrip(self):
+        """Testa que partições (inclusive vazias) sobrevivem a reabrir o checkpoint."""
+        checkpoint = CollectionCheckpoint(self.tmp.name, 'job')
+        checkpoint.save_partition('a', pd.DataFrame({'x': [1, 2]}))
+        checkpoint.save_partition('b', pd.DataFrame())
+
+        reopened = CollectionCheckpoint(self.tmp.name, 'job')
+        self.assertEqual(reopened.rows('a'), 2)
+        self.assertEqual(reopened.rows('b'), 0)
+        self.assertEqual(reopened.pending(['a', 'b', 'c']), ['c'])
+        self.assertEqual(reopened.load()['x'].tolist(), [1, 2])
+
+    def test_resume_after_failure(self):
+        """Testa que a coleta retoma da página que falhou sem refazer as demais."""
+        pages = {('1900', 0): [1, 2], ('1900', 1): [3], ('1910', 0): [4, 5], ('1910', 1): []}
+        calls = []
+        fail = {'1910'}
+
+        def fetch_page(partition, page):
+            calls.append((partition, page))
+            if partition in fail:
+                raise ConnectionError("falha simulada")
+            return pd.DataFrame({'x': pages[(partition, page)]})
+
+        args = ('job', ['1900', '1910'], fetch_page, 2, 'job.csv')
+        self.assertTrue(self.processor._collect_paginated(*args).empty)
+        self.assertIsNone(self.processor._load_cache('job.csv'))
+
+        fail.clear()
+        calls.clear()
+        result = self.processor._collect_paginated(*args)
+        self.assertEqual(calls, [('1910', 0), ('1910', 1)])
+        self.assertEqual(result['x'].tolist(), [1, 2, 3, 4, 5])
+        self.assertIsNotNone(self.processor._load_cache('job.csv'))
+
+    def test_empty_result_not_cached(self):
+        """Testa que resultados vazios não são salvos em cache."""
+        self.processor._save_cache(pd.DataFrame(), 'vazio.csv')
+        self.assertIsNone(self.processor._load_cache('vazio.csv'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+"""
+Testes dos modelos de contagem (GLM Poisson e binomial negativa em lote)
+"""
+
+import sys
+import os
+import json
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from scipy import optimize
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from accumulators import AnoPessoalAccumulator
+from count_models import (CountTable, calendar_exposure, count_table, design_matrix, fit_batched_glm,
+                          fit_count_models)
+from data_processor import NumerologyDataAnalyzer
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+def _synthetic_table(n_slices: int, seed: int, overdispersion: float = 0.0) -> CountTable:
+    """Tabela (fatias x 3 categorias x 4 décadas x 9 anos) com Ano 9 10% acima dos demais."""
+    rng = np.random.default_rng(seed)
+    category = np.array([1.0, 2.0, 0.5])[:, None, None]
+    decade = np.array([1.0, 1.5, 2.0, 3.0])[None, :, None]
+    ano = np.r_[np.ones(8), 1.1][None, None, :]
+    mu = np.broadcast_to(20 * category * decade * ano, (n_slices, 3, 4, 9))
+    if overdispersion:
+        mu = mu * rng.gamma(1 / overdispersion, overdispersion, size=mu.shape)
+    counts = rng.poisson(mu).astype(float)
+    return CountTable(list(range(n_slices)), ['category', 'decade'],
+                      [['a', 'b', 'c'], [1900, 1910, 1920, 1930]], counts)
+
+
+class TestCountModels(unittest.TestCase):
+    """Testes do IRLS em lote contra soluções exatas e ajustes individuais."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.analyzer = NumerologyDataAnalyzer(state_dir=cls.tmp.name)
+        events = pd.read_csv(os.path.join(DATA_DIR, 'historical_events_5000_synthetic.csv'))
+        cls.analysis = cls.analyzer.analyze_event_cycles(events)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_joint_slices(self):
+        """Testa as fatias cruzadas do acumulador contra um groupby e o JSON."""
+        accumulator = AnoPessoalAccumulator.from_analysis(self.analysis, [('category', 'impact')])
+        cells = accumulator.slices['category+impact']
+        expected = self.analysis.groupby(['category', 'impact', 'ano_pessoal'], observed=True).size()
+        key = ('Guerra/Conflito', 'Alto')
+        self.assertEqual({ano: int(n) for ano, n in enumerate(cells[key]) if n},
+                         expected.loc[key].to_dict())
+        self.assertTrue((sum(cells.values()) == accumulator.counts).all())
+
+        restored = AnoPessoalAccumulator.from_dict(json.loads(json.dumps(accumulator.to_dict())))
+        self.assertIn(key, restored.slices['category+impact'])
+
+    def test_poisson_main_effects_match_margins(self):
+        """Testa a solução exata: na Poisson de efeitos principais, as razões
+        de taxas do Ano Pessoal são as razões das contagens marginais."""
+        result = self.analyzer.count_regression(self.analysis, exposure=False)
+        fit = result['slices']['all']
+        counts = self.analyzer.test_hypothesis_ano_9(self.analysis)['counts_by_ano']
+        self.assertTrue(fit['converged'])
+        for ano in range(2, 10):
+            self.assertAlmostEqual(fit['ano_effects'][ano], counts[ano] / counts[1], places=6)
+        self.assertEqual(fit['events'], len(self.analysis))
+        self.assertEqual(set(result['covariates']), {'category', 'decade', 'impact', 'source'})
+
+    def test_poisson_matches_direct_likelihood(self):
+        """Testa os coeficientes contra a maximização direta da verossimilhança."""
+        table = _synthetic_table(1, seed=1)
+        design = design_matrix(table.levels, table.covariates)
+        y = table.counts.reshape(1, -1)[0]
+        fit = fit_batched_glm(design.X, y[np.newaxis])
+
+        def negative_loglik(beta):
+            eta = design.X @ beta
+            return np.exp(eta).sum() - y @ eta
+
+        def gradient(beta):
+            return design.X.T @ (np.exp(design.X @ beta) - y)
+
+        direct = optimize.minimize(negative_loglik, np.zeros(design.X.shape[1]), jac=gradient,
+                                   method='BFGS', options={'gtol': 1e-10})
+        np.testing.assert_allclose(fit['beta'][0], direct.x, atol=1e-5)
+
+    def test_batched_equals_individual_fits(self):
+        """Testa que ajustar as fatias juntas dá o mesmo que uma a uma."""
+        table = _synthetic_table(12, seed=2, overdispersion=0.3)
+        for family in ('poisson', 'negbin'):
+            batched = fit_count_models(table, family)['slices']
+            for s in (0, 5, 11):
+                single = CountTable([s], table.covariates, table.levels, table.counts[s:s + 1])
+                alone = fit_count_models(single, family)['slices'][s]
+                self.assertAlmostEqual(batched[s]['ano_9']['log_rate_ratio'],
+                                       alone['ano_9']['log_rate_ratio'], places=8)
+                self.assertAlmostEqual(batched[s]['alpha'], alone['alpha'], places=8)
+
+    def test_negative_binomial_overdispersion(self):
+        """Testa alpha ~0 em dados Poisson e erros padrão maiores com superdispersão."""
+        poisson_data = fit_count_models(_synthetic_table(40, seed=3), 'negbin')['slices']
+        self.assertLess(np.median([fit['alpha'] for fit in poisson_data.values()]), 0.02)
+
+        table = _synthetic_table(40, seed=4, overdispersion=0.5)
+        negbin = fit_count_models(table, 'negbin')['slices']
+        poisson = fit_count_models(table, 'poisson')['slices']
+        self.assertGreater(np.median([fit['alpha'] for fit in negbin.values()]), 0.25)
+        self.assertTrue(all(negbin[s]['ano_9']['std_error'] > poisson[s]['ano_9']['std_error']
+                            for s in negbin))
+        self.assertTrue(all(fit['converged'] for fit in negbin.values()))
+        # Efeito simulado do Ano 9: 10% acima da média dos demais
+        mean_ratio = np.exp(np.mean([fit['ano_9']['log_rate_ratio'] for fit in negbin.values()]))
+        self.assertAlmostEqual(mean_ratio, 1.1, delta=0.05)
+
+    def test_empty_level_in_slice(self):
+        """Testa que um nível sem eventos em uma fatia fica fora do ajuste dela."""
+        table = _synthetic_table(2, seed=5)
+        table.counts[1, 2] = 0
+        fits = fit_count_models(table, 'poisson')['slices']
+        self.assertTrue(fits[1]['converged'])
+        self.assertTrue(np.isnan(fits[1]['covariates']['category']['c']))
+        self.assertFalse(np.isnan(fits[0]['covariates']['category']['c']))
+        self.assertTrue(np.isfinite(fits[1]['ano_9']['p_value']))
+        self.assertEqual(fits[1]['cells'], 2 * 4 * 9)
+
+    def test_exposure_adjusts_confounded_decades(self):
+        """Testa que a exposição por década remove um efeito do Ano 9 que
+        vem só da composição do calendário e das décadas mais ativas."""
+        def ano_pessoal(years):
+            return self.analyzer.calc.calcular_ano_pessoal_array("2000-01-01", years)
+
+        decades = [1900, 1910, 1920, 1930]
+        exposure = calendar_exposure([decades], ['decade'], ano_pessoal)
+        # Sem efeito do Ano Pessoal: contagens esperadas = taxa da década x anos no calendário
+        rate = np.array([1.0, 2.0, 8.0, 20.0])[:, np.newaxis]
+        table = CountTable(['all'], ['decade'], [decades], (10 * rate * exposure)[np.newaxis])
+        self.assertTrue((exposure.sum(axis=1) == 10).all())
+
+        adjusted = fit_count_models(table, exposure=exposure)['slices']['all']
+        marginal = fit_count_models(table)['slices']['all']
+        self.assertTrue(adjusted['converged'])
+        self.assertAlmostEqual(adjusted['ano_9']['rate_ratio'], 1.0, places=6)
+        self.assertGreater(abs(np.log(marginal['ano_9']['rate_ratio'])), 0.05)
+        self.assertAlmostEqual(adjusted['covariates']['decade'][1900], 1 / 20, places=6)
+
+        # Nos eventos: a década muda o efeito do Ano 9; sem exposição, não
+        def ano_9(covariates, **kwargs):
+            fit = self.analyzer.count_regression(self.analysis, covariates=covariates, **kwargs)
+            return fit['slices']['all']['ano_9']['rate_ratio']
+
+        self.assertNotAlmostEqual(ano_9(['decade']), ano_9([]), places=3)
+        self.assertAlmostEqual(ano_9(['decade'], exposure=False), ano_9([], exposure=False), places=6)
+        with self.assertRaises(ValueError):
+            fit_count_models(table, exposure=np.where(exposure > 1, exposure, 0))
+
+    def test_slices_from_accumulator(self):
+        """Testa o ajuste por fatia a partir de um acumulador serializado."""
+        columns = ('category', 'decade', 'impact')
+        accumulator = AnoPessoalAccumulator.from_analysis(self.analysis, [columns])
+        restored = AnoPessoalAccumulator.from_dict(json.loads(json.dumps(accumulator.to_dict())))
+        years = (int(self.analysis['year'].min()), int(self.analysis['year'].max()))
+        from_counts = self.analyzer.count_regression(restored, covariates=['decade', 'impact'],
+                                                     slice_by='category', year_range=years)
+        from_df = self.analyzer.count_regression(self.analysis, covariates=['decade', 'impact'],
+                                                 slice_by='category')
+        self.assertEqual(set(from_counts['slices']), set(self.analysis['category'].unique()))
+        for key, fit in from_df['slices'].items():
+            self.assertAlmostEqual(from_counts['slices'][key]['ano_9']['rate_ratio'],
+                                   fit['ano_9']['rate_ratio'], places=10)
+        with self.assertRaises(KeyError):
+            count_table(restored, ['source'], slice_by='category')
+
+
+if __name__ == '__main__':
+    unittest.main()
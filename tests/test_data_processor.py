@@ -0,0 +1,149 @@
+"""
+Testes unitários para NumerologyDataAnalyzer
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_processor import NumerologyDataAnalyzer
+from event_store import EventStore
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+class TestNumerologyDataAnalyzer(unittest.TestCase):
+    """Testes para o analisador de dados."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Carrega o dataset sintético uma única vez."""
+        cls.events = pd.read_csv(os.path.join(DATA_DIR, 'historical_events_5000_synthetic.csv'))
+
+    def setUp(self):
+        """Configuração inicial para os testes."""
+        self.analyzer = NumerologyDataAnalyzer()
+
+    def test_analyze_event_cycles(self):
+        """Testa a análise de eventos com datas válidas e inválidas."""
+        events = pd.DataFrame({
+            'date': ['2008-09-15', 'data inválida', '2020-03-15 00:00:00+00:00'],
+            'eventLabel': ['Crise financeira', 'Inválido', 'Pandemia'],
+        })
+        analysis = self.analyzer.analyze_event_cycles(events)
+
+        self.assertEqual(len(analysis), 2)
+        self.assertEqual(analysis['year'].tolist(), [2008, 2020])
+        # destino de 2000-01-01 = 4; 4 + 2008 = 2012 -> 5; 4 + 2020 = 2024 -> 8
+        self.assertEqual(analysis['ano_pessoal'].tolist(), [5, 8])
+        self.assertEqual(analysis['event_type'].tolist(), ['unknown', 'unknown'])
+
+    def test_compact_layout(self):
+        """Testa os tipos e a economia de memória do layout compacto."""
+        events = pd.concat([self.events] * 4, ignore_index=True)
+        legacy = self.analyzer.analyze_event_cycles(events, compact=False)
+        compact = self.analyzer.analyze_event_cycles(events, keep_labels=False)
+
+        self.assertEqual(compact['ano_pessoal'].dtype, 'uint8')
+        self.assertEqual(compact['year'].dtype, 'int16')
+        self.assertEqual(str(compact['category'].dtype), 'category')
+        self.assertNotIn('event_label', compact.columns)
+        self.assertEqual(compact['ano_pessoal'].tolist(), legacy['ano_pessoal'].tolist())
+
+        legacy_bytes = self.analyzer.memory_report(legacy)['total_bytes']
+        compact_bytes = self.analyzer.memory_report(compact)['total_bytes']
+        self.assertGreaterEqual(legacy_bytes / compact_bytes, 5)
+
+    def test_analyze_incremental(self):
+        """Testa que a análise incremental reproduz a análise completa."""
+        with tempfile.TemporaryDirectory() as state_dir:
+            analyzer = NumerologyDataAnalyzer(state_dir=state_dir)
+
+            first = analyzer.analyze_incremental(self.events.iloc[:3000], 'synthetic')
+            self.assertEqual(first['new_events'], 3000)
+            self.assertEqual(first['watermark'], 3000)
+
+            # Reexecução com linhas novas processa apenas o delta
+            second = analyzer.analyze_incremental(self.events, 'synthetic')
+            self.assertEqual(second['new_events'], 2000)
+            self.assertEqual(second['watermark'], 5000)
+
+            again = analyzer.analyze_incremental(self.events, 'synthetic')
+            self.assertEqual(again['new_events'], 0)
+
+        full = self.analyzer.test_hypothesis_ano_9(self.analyzer.analyze_event_cycles(self.events))
+        self.assertEqual(second['hypothesis_test'], full)
+        self.assertEqual(again['hypothesis_test'], full)
+
+    def test_analyze_incremental_date_ties(self):
+        """Testa linhas que chegam depois com a mesma data do watermark."""
+        events = self.events.drop(columns='event_id').sort_values('date', kind='stable')
+        last_date = events['date'].iloc[-1]
+        extra = events[events['date'].str[:10] == last_date[:10]].assign(eventLabel=lambda df: df['eventLabel'] + ' (tardio)')
+
+        with tempfile.TemporaryDirectory() as state_dir:
+            analyzer = NumerologyDataAnalyzer(state_dir=state_dir)
+            first = analyzer.analyze_incremental(events, 'ties', watermark_column='date')
+            self.assertEqual(first['watermark'], last_date[:10])
+
+            # Mesma data do watermark, chegada posterior: ainda é analisada
+            grown = pd.concat([events, extra], ignore_index=True)
+            second = analyzer.analyze_incremental(grown, 'ties')
+            self.assertEqual(second['new_events'], len(extra))
+            self.assertEqual(analyzer.analyze_incremental(grown, 'ties')['new_events'], 0)
+
+        full = self.analyzer.test_hypothesis_ano_9(self.analyzer.analyze_event_cycles(grown))
+        self.assertEqual(second['hypothesis_test'], full)
+
+    def test_event_store_input(self):
+        """Testa consultas do EventStore contra filtros booleanos do pandas."""
+        analysis = self.analyzer.analyze_event_cycles(self.events)
+        store = EventStore.from_analysis(analysis)
+
+        self.assertEqual(self.analyzer.test_hypothesis_ano_9(store),
+                         self.analyzer.test_hypothesis_ano_9(analysis))
+        self.assertEqual(self.analyzer.analyze_by_decade(store),
+                         self.analyzer.analyze_by_decade(analysis))
+
+        mask = (analysis['category'] == 'Guerra/Conflito') & analysis['year'].between(1950, 1990)
+        expected = analysis.loc[mask, 'ano_pessoal'].value_counts()
+        counts = store.counts_by_ano(1950, 1990, category='Guerra/Conflito')
+        self.assertEqual({ano: counts[ano] for ano in expected.index}, expected.to_dict())
+
+        rows = store.rows(1950, 1990)
+        self.assertTrue(all(1950 <= year <= 1990 for year in store.column('year', rows)))
+        self.assertTrue(store.column('year', rows).base is store.year)
+
+    def test_event_store_blocked_counts(self):
+        """Testa as contagens por bloco contra contagem direta, inclusive nas fronteiras."""
+        rng = np.random.default_rng(0)
+        n = 20000
+        years = rng.integers(1000, 2000, n)
+        anos = rng.integers(1, 10, n)
+        sources = rng.choice(['a', 'b', 'c'], n)
+        store = EventStore(years, anos, sources=sources)
+
+        frame = pd.DataFrame({'year': years, 'ano_pessoal': anos, 'source': sources})
+        for year_min, year_max in [(None, None), (1000, 1000), (1200, 1201), (1003, 1997), (1500, 1400)]:
+            mask = frame['year'].between(year_min or 0, year_max or 9999)
+            for source in (None, 'b'):
+                selected = mask & (frame['source'] == source) if source else mask
+                expected = np.bincount(frame.loc[selected, 'ano_pessoal'], minlength=10)
+                np.testing.assert_array_equal(store.counts_by_ano(year_min, year_max, source=source),
+                                              expected)
+        self.assertEqual(store.decade_accumulator().counts.tolist(), np.bincount(anos, minlength=10).tolist())
+
+        # Índices cumulativos: bem menos de 1 byte por linha cada
+        index_bytes = store._cum.blocks.nbytes + store.indexes['source'].cum.blocks.nbytes
+        self.assertLess(index_bytes, n)
+
+
+if __name__ == '__main__':
+    unittest.main()
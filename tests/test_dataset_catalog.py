@@ -0,0 +1,113 @@
+"""
+Testes do catálogo de datasets e dos snapshots binários
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import dataset_catalog
+from dataset_catalog import DatasetCatalog
+from data_processor import NumerologyDataAnalyzer
+from event_schema import is_canonical, normalize_events
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+DATASET = 'historical_events_5000_synthetic'
+
+
+class TestDatasetCatalog(unittest.TestCase):
+    """Testes de registro, impressão digital, reuso e reconstrução dos snapshots."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.tmp.name, 'data')
+        os.makedirs(os.path.join(self.data_dir, 'cache'))
+        shutil.copy(os.path.join(DATA_DIR, f"{DATASET}.csv"), self.data_dir)
+        shutil.copy(os.path.join(DATA_DIR, 'cache', 'wikidata_events_50.csv'),
+                    os.path.join(self.data_dir, 'cache'))
+        self.csv_path = os.path.join(self.data_dir, f"{DATASET}.csv")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _catalog(self):
+        return DatasetCatalog((self.data_dir, os.path.join(self.data_dir, 'cache')))
+
+    def test_names(self):
+        """Testa os nomes relativos à raiz de dados."""
+        self.assertEqual(self._catalog().names(), ['cache/wikidata_events_50', DATASET])
+        with self.assertRaises(KeyError):
+            self._catalog().load('inexistente')
+
+    def test_raw_snapshot_matches_csv(self):
+        """Testa o snapshot bruto contra o CSV e o memory-map das colunas."""
+        df = self._catalog().load(DATASET)
+        expected = pd.read_csv(self.csv_path)
+        self.assertEqual(list(df.columns), list(expected.columns))
+        self.assertIsInstance(df['year'].dtype, np.dtype)
+        self.assertIsInstance(df['eventLabel'].dtype, pd.CategoricalDtype)
+        np.testing.assert_array_equal(df['year'].to_numpy(), expected['year'].to_numpy())
+        self.assertTrue((df['eventLabel'].astype(str) == expected['eventLabel']).all())
+        self.assertIsInstance(df['year'].values, np.memmap)
+
+    def test_events_snapshot(self):
+        """Testa o snapshot canônico contra normalize_events."""
+        df = self._catalog().load(DATASET, schema='events')
+        expected = normalize_events(pd.read_csv(self.csv_path), errors='ignore')
+        self.assertTrue(is_canonical(df))
+        # mmap=False: colunas em ndarray, comparáveis com assert_frame_equal
+        pd.testing.assert_frame_equal(self._catalog().load(DATASET, 'events', mmap=False),
+                                      expected, check_categorical=False)
+        self.assertEqual(df.attrs['validation'], expected.attrs['validation'])
+        self.assertEqual(df.attrs['dataset'], DATASET)
+
+    def test_snapshot_reused(self):
+        """Testa que a segunda leitura não reinterpreta o CSV nem refaz o hash."""
+        self._catalog().load(DATASET)
+        catalog = self._catalog()
+        with mock.patch.object(dataset_catalog.pd, 'read_csv') as read_csv, \
+                mock.patch.object(dataset_catalog, 'file_fingerprint') as fingerprint:
+            df = catalog.load(DATASET)
+        read_csv.assert_not_called()
+        fingerprint.assert_not_called()
+        self.assertEqual(len(df), 5000)
+
+    def test_snapshot_rebuilt_when_file_changes(self):
+        """Testa a reconstrução do snapshot após mudar o conteúdo do CSV."""
+        catalog = self._catalog()
+        before = catalog.load(DATASET)
+        pd.read_csv(self.csv_path).head(10).to_csv(self.csv_path, index=False)
+        after = catalog.load(DATASET)
+        self.assertEqual(len(before), 5000)
+        self.assertEqual(len(after), 10)
+        self.assertNotEqual(before.attrs['fingerprint'], after.attrs['fingerprint'])
+
+        removed = catalog.prune()
+        self.assertEqual(len(removed), 1)
+        self.assertEqual(len(catalog.load(DATASET)), 10)
+
+    def test_analyzer_load_dataset(self):
+        """Testa o carregamento por nome no analisador."""
+        analyzer = NumerologyDataAnalyzer(state_dir=os.path.join(self.data_dir, 'cache'))
+        events = analyzer.load_dataset(DATASET)
+        self.assertTrue(is_canonical(events))
+        analysis = analyzer.analyze_event_cycles(events)
+        expected = analyzer.analyze_event_cycles(normalize_events(pd.read_csv(self.csv_path)))
+        np.testing.assert_array_equal(analysis['ano_pessoal'].to_numpy(),
+                                      expected['ano_pessoal'].to_numpy())
+        raw = analyzer.load_dataset('cache/wikidata_events_50', schema='raw')
+        self.assertEqual(len(raw), len(pd.read_csv(os.path.join(self.data_dir, 'cache',
+                                                                'wikidata_events_50.csv'))))
+
+
+if __name__ == '__main__':
+    unittest.main()
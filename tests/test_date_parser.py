@@ -0,0 +1,62 @@
+"""
+Testes unitários para o parser de datas ISO/Wikidata
+"""
+
+import sys
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from date_parser import format_iso, parse_dates, to_datetime64
+from numerology_calculator import NumerologyCalculator
+
+
+class TestParseDates(unittest.TestCase):
+    """Testes para parse_dates e conversões."""
+
+    def test_formats(self):
+        """Testa formatos do Wikidata, datas parciais e valores inválidos."""
+        parsed = parse_dates([
+            '+1950-03-15T00:00:00Z', '-0044-03-15T00:00:00Z', '1950-00-00T00:00:00Z',
+            '2100-01-01 00:00:00+00:00', '+12345-01-02T00:00:00Z', '1600-05-06',
+            None, 'data inválida', '1999-13-01', pd.Timestamp('2020-01-02'),
+        ])
+        self.assertEqual(parsed.year.tolist(), [1950, -44, 1950, 2100, 12345, 1600, 0, 0, 0, 2020])
+        self.assertEqual(parsed.month.tolist(), [3, 3, 0, 1, 1, 5, 0, 0, 0, 1])
+        self.assertEqual(parsed.day.tolist(), [15, 15, 0, 1, 2, 6, 0, 0, 0, 2])
+        self.assertEqual(parsed.valid.tolist(), [True] * 6 + [False] * 3 + [True])
+
+        self.assertEqual(format_iso(parsed)[:3].tolist(), ['1950-03-15', '-0044-03-15', '1950-00-00'])
+        self.assertEqual(str(to_datetime64(parsed)[5]), '1600-05-06T00:00:00')
+        self.assertTrue(np.isnat(to_datetime64(parsed)[6]))
+
+    def test_impossible_days(self):
+        """Testa dias além do fim do mês, com anos bissextos."""
+        datas = ['1999-02-31', '2001-04-31', '1999-02-29', '2000-02-29', '1900-02-29',
+                 '2024-02-29T00:00:00Z', '-0044-02-29', '-0045-02-29', '1950-00-31']
+        parsed = parse_dates(datas)
+        self.assertEqual(parsed.valid.tolist(), [False, False, False, True, False, True, True, False, True])
+        self.assertEqual(format_iso(parsed)[3], '2000-02-29')
+        # Nas datas válidas, o datetime64 mantém o dia (1999-02-31 virava 1999-03-03)
+        calendar = to_datetime64(parsed).astype('datetime64[D]')
+        day_of_month = (calendar - calendar.astype('datetime64[M]')).astype(np.int64) + 1
+        full = parsed.valid & (parsed.month > 0)
+        self.assertEqual(day_of_month[full].tolist(), parsed.day[full].tolist())
+
+    def test_destino_from_arrays(self):
+        """Testa o Número do Destino em lote contra a versão escalar."""
+        calc = NumerologyCalculator()
+        datas = ['1995-08-16', '-0044-03-15', '1950-00-00', '0001-01-01', '2000-01-01']
+        parsed = parse_dates(datas)
+        esperado = [calc.calcular_numero_destino(data) for data in datas]
+        self.assertEqual(calc.calcular_numero_destino_array(parsed.year, parsed.month, parsed.day).tolist(),
+                         esperado)
+
+
+if __name__ == '__main__':
+    unittest.main()
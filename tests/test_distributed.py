@@ -0,0 +1,73 @@
+"""
+Testes da análise distribuída (coordenador e workers locais)
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from distributed import (CoordinatorClient, ShardCoordinator, run_local, run_worker,
+                         start_local_workers, write_shards)
+from parallel_executor import ParallelAnalysisExecutor
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+class TestDistributedAnalysis(unittest.TestCase):
+    """Testes de equivalência e de tolerância a falhas de workers."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        events = pd.read_csv(os.path.join(DATA_DIR, 'historical_events_5000_synthetic.csv'))
+        cls.shards = write_shards(events, cls.tmp.name, n_partitions=8)
+        cls.serial = ParallelAnalysisExecutor(max_workers=1).run(events)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_local_workers_match_serial(self):
+        """Testa coordenador com processos worker contra a execução serial."""
+        result = run_local(self.shards, n_workers=3, lease_timeout=5.0, timeout=60)
+
+        self.assertEqual(result['completed'], len(self.shards))
+        self.assertEqual(result['hypothesis_test'], self.serial['hypothesis_test'])
+        self.assertEqual(result['slices'], self.serial['slices'])
+
+    def test_dead_worker_shard_reassigned(self):
+        """Testa que o shard de um worker que some é reatribuído e contado uma vez."""
+        coordinator = ShardCoordinator(self.shards, lease_timeout=0.5).start()
+        dead = CoordinatorClient(coordinator.url)
+        lost = dead.call('/lease', {'worker': 'dead'})
+        processes = start_local_workers(coordinator.url, 2, heartbeat_interval=0.1)
+        result = coordinator.run(timeout=60)
+        for process in processes:
+            process.join(timeout=5)
+
+        self.assertGreaterEqual(result['reassigned'], 1)
+        self.assertEqual(result['hypothesis_test'], self.serial['hypothesis_test'])
+        # Resultado atrasado do worker "morto" não é somado de novo
+        late = {'worker': 'dead', 'shard_id': lost['shard_id'],
+                'accumulator': {'counts': [0, 0, 0, 0, 0, 0, 0, 0, 0, 1000], 'total': 1000}}
+        self.assertFalse(coordinator.result(late)['accepted'])
+
+    def test_failing_shard_is_reported(self):
+        """Testa que um shard ilegível é descartado após as tentativas."""
+        missing = os.path.join(self.tmp.name, 'missing.csv')
+        coordinator = ShardCoordinator(self.shards[:2] + [missing], max_attempts=2).start()
+        self.assertEqual(run_worker(coordinator.url, 'inline', heartbeat_interval=0.5), 2)
+        result = coordinator.run(timeout=10)
+
+        self.assertEqual(result['completed'], 2)
+        self.assertIn(missing, result['failed'])
+
+
+if __name__ == '__main__':
+    unittest.main()
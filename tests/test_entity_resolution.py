@@ -0,0 +1,49 @@
+"""
+Testes unitários para a resolução de entidades entre fontes
+"""
+
+import sys
+import os
+import unittest
+
+import pandas as pd
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from entity_resolution import resolve_entities
+
+
+class TestResolveEntities(unittest.TestCase):
+    """Testes para a deduplicação por QID e por rótulo + data."""
+
+    def setUp(self):
+        """Eventos repetidos entre Wikidata e uma fonte sem QID."""
+        self.events = pd.DataFrame({
+            'event': ['http://www.wikidata.org/entity/Q1', 'http://www.wikidata.org/entity/Q1',
+                      None, 'http://www.wikidata.org/entity/Q2', None, None],
+            'eventLabel': ['Queda do Muro', 'Fall of the Wall', 'Quéda do muro!',
+                           'Queda do Muro', 'Brexit', 'brexit'],
+            'date': ['1989-11-09 00:00:00+00:00', '1989-11-09T00:00:00Z', '1989-11-09',
+                     '1989-11-09', '2016-06-23', '2016-06-23 00:00:00'],
+        })
+
+    def test_rules(self):
+        """Testa as remoções de cada regra e a preservação de QIDs distintos."""
+        resolved, report = resolve_entities(self.events)
+
+        self.assertEqual(resolved.index.tolist(), [0, 3, 4])
+        self.assertEqual(report['qid'], 1)
+        self.assertEqual(report['label_date'], 2)
+        self.assertEqual(report['output_rows'], 3)
+
+    def test_repeated_input(self):
+        """Testa que cópias repetidas da entrada são todas removidas."""
+        events = pd.concat([self.events] * 50, ignore_index=True)
+        resolved, report = resolve_entities(events)
+        self.assertEqual(resolved.index.tolist(), [0, 3, 4])
+        self.assertEqual(report['qid'] + report['label_date'], len(events) - 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
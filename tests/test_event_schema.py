@@ -0,0 +1,102 @@
+"""
+Testes do esquema canônico de eventos e dos adaptadores por fonte
+"""
+
+import sys
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_processor import NumerologyDataAnalyzer
+from event_schema import CANONICAL_SCHEMA, detect_source, is_canonical, normalize_events
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+# Copy-on-write é o padrão no pandas 3 e opcional no pandas 2
+COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3 or pd.get_option('mode.copy_on_write') is True
+
+
+class TestEventSchema(unittest.TestCase):
+    """Testes de normalização, validação e compatibilidade com a análise."""
+
+    def test_sources_share_layout(self):
+        """Testa que todas as fontes produzem o mesmo layout tipado."""
+        expected = {
+            'historical_events_5000_synthetic.csv': 'synthetic',
+            'historical_events.csv': 'wikidata',
+            'numerology_analysis.csv': 'analysis',
+        }
+        for filename, source in expected.items():
+            raw = pd.read_csv(os.path.join(DATA_DIR, filename))
+            events = normalize_events(raw)
+            self.assertEqual(detect_source(raw), source)
+            self.assertTrue(is_canonical(events), filename)
+            self.assertEqual(len(events), len(raw))
+
+        gdelt = pd.DataFrame({'GlobalEventID': [1, 2], 'SQLDATE': ['20240101', '20240102'],
+                              'EventCode': ['010', '190'], 'EventRootCode': ['01', '19'],
+                              'date': ['2024-01-01', '2024-01-02']})
+        events = normalize_events(gdelt)
+        self.assertEqual(list(events['source']), ['GDELT', 'GDELT'])
+        self.assertEqual(list(events['event_type']), ['010', '190'])
+
+    def test_wikidata_columns(self):
+        """Testa renomeação, datas fora da faixa do pandas e ano derivado."""
+        raw = pd.DataFrame({
+            'event': ['http://www.wikidata.org/entity/Q1', 'http://www.wikidata.org/entity/Q2'],
+            'eventLabel': ['Batalha', 'Tratado'],
+            'date': ['-0044-03-15T00:00:00Z', '1648-10-24T00:00:00Z'],
+            'typeLabel': ['batalha', 'tratado'],
+        })
+        events = normalize_events(raw)
+        self.assertEqual(list(events['year']), [-44, 1648])
+        self.assertEqual(list(events['event_label']), ['Batalha', 'Tratado'])
+        self.assertEqual(list(events['source']), ['Wikidata', 'Wikidata'])
+        self.assertEqual(list(events.columns), list(CANONICAL_SCHEMA))
+
+    def test_vectorized_validation(self):
+        """Testa as regras de validação e os modos de erro."""
+        raw = pd.DataFrame({
+            'event_id': ['a', 'b', 'b', 'c'],
+            'date': ['2001-02-03', 'sem data', '2002-01-01', '2003-01-01'],
+            'year': [2001, 2001, 2002, 1999],
+        })
+        events = normalize_events(raw)
+        self.assertEqual(events.attrs['validation'],
+                         {'invalid_date': 1, 'year_mismatch': 1, 'duplicate_id': 1})
+        self.assertEqual(list(events['event_id']), ['a'])
+        self.assertEqual(len(normalize_events(raw, errors='ignore')), 4)
+        with self.assertRaises(ValueError):
+            normalize_events(raw, errors='raise')
+
+    @unittest.skipUnless(COPY_ON_WRITE, "sem copy-on-write (pandas < 3) o adaptador copia as colunas")
+    def test_typed_columns_are_not_copied(self):
+        """Testa que colunas já no dtype canônico compartilham memória com a entrada."""
+        raw = pd.DataFrame({
+            'date': np.array(['2000-01-01', '2010-06-01'], dtype='datetime64[s]'),
+            'year': np.array([2000, 2010], dtype=np.int32),
+            'category': pd.Categorical(['a', 'b']),
+        })
+        events = normalize_events(raw)
+        self.assertTrue(np.shares_memory(events['year'].to_numpy(), raw['year'].to_numpy()))
+        self.assertTrue(np.shares_memory(events['date'].to_numpy(), raw['date'].to_numpy()))
+        self.assertTrue(np.shares_memory(events['category'].array.codes, raw['category'].array.codes))
+
+    def test_analysis_accepts_canonical(self):
+        """Testa que a análise produz o mesmo resultado a partir do esquema canônico."""
+        raw = pd.read_csv(os.path.join(DATA_DIR, 'historical_events_5000_synthetic.csv'))
+        analyzer = NumerologyDataAnalyzer()
+        legacy = analyzer.analyze_event_cycles(raw)
+        canonical = analyzer.analyze_event_cycles(normalize_events(raw))
+
+        self.assertEqual(analyzer.test_hypothesis_ano_9(legacy), analyzer.test_hypothesis_ano_9(canonical))
+        self.assertEqual(list(canonical['event_label'].astype(str)), list(legacy['event_label'].astype(str)))
+        self.assertEqual(list(canonical['event_type'].astype(str)), list(legacy['event_type'].astype(str)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Testes da gravação/reprodução HTTP e do endpoint local simulado
+"""
+
+import sys
+import os
+import tempfile
+import time
+import unittest
+
+import requests
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_processor import GDELTCollector, OurWorldInDataCollector, WikidataCollector
+from http_replay import (Cassette, MockEndpointServer, RecordingNotFound, ReplayAdapter,
+                         RoutingAdapter, mount_adapter)
+
+CASSETTE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'http')
+
+
+class TestHttpReplay(unittest.TestCase):
+    """Testes dos coletores sem rede, contra a fita incluída no repositório."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cassette = Cassette(CASSETTE_DIR)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _collectors(self, session):
+        return (WikidataCollector(cache_dir=self.tmp.name, session=session),
+                OurWorldInDataCollector(cache_dir=self.tmp.name, session=session),
+                GDELTCollector(cache_dir=self.tmp.name, session=session))
+
+    def test_replay_collectors(self):
+        """Testa os três coletores reproduzindo SPARQL JSON, CSV do OWID e zip do GDELT."""
+        adapter = ReplayAdapter(self.cassette)
+        wikidata, owid, gdelt = self._collectors(mount_adapter(requests.Session(), adapter))
+
+        events = wikidata.collect_historical_events()
+        self.assertEqual(len(events), 4)
+        self.assertEqual(len(owid.collect_conflicts_data()), 74)
+        daily = gdelt.collect_daily_events('20240101')
+        self.assertEqual(len(daily), 2000)
+        self.assertTrue(daily['date'].str.match(r'^\d{4}-\d{2}-\d{2}$').all())
+        # Arquivo diário do GDELT 1.0 (o 2.0 não tem arquivos diários)
+        self.assertIn('GET /events/20240101.export.CSV.zip?', self.cassette)
+        self.assertEqual(adapter.hits, 4)
+
+    def test_replay_missing(self):
+        """Testa que requisição sem gravação falha no modo 'replay'."""
+        session = mount_adapter(requests.Session(), ReplayAdapter(self.cassette))
+        with self.assertRaises(RecordingNotFound):
+            session.get('https://example.org/nao-gravado')
+
+    def test_record_then_replay(self):
+        """Testa gravar pelo endpoint simulado e reproduzir sem servidor."""
+        recorded = Cassette(os.path.join(self.tmp.name, 'fita'))
+        url = OurWorldInDataCollector.CONFLICTS_URL
+        path = '/' + url.split('/', 3)[3]
+        adapter = ReplayAdapter(recorded, mode='record')
+        with MockEndpointServer(self.cassette) as server:
+            original = mount_adapter(requests.Session(), adapter).get(server.url + path).content
+        self.assertEqual(adapter.recorded, 1)
+
+        replay = mount_adapter(requests.Session(), ReplayAdapter(recorded))
+        self.assertEqual(replay.get(url).content, original)
+
+    def test_mock_latency_and_bandwidth(self):
+        """Testa a latência e a largura de banda simuladas."""
+        url = GDELTCollector.BASE_URL + '20240101.export.CSV.zip'
+        with MockEndpointServer(self.cassette, latency=0.05, bandwidth=400_000) as server:
+            session = mount_adapter(requests.Session(), RoutingAdapter(server.url))
+            start = time.perf_counter()
+            content = session.get(url).content
+            elapsed = time.perf_counter() - start
+        self.assertGreater(len(content), 40_000)
+        self.assertGreater(elapsed, 0.05 + 0.8 * len(content) / 400_000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Testes da análise por pessoa (ciclos na data de eventos da própria vida)
+"""
+
+import sys
+import os
+import re
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_processor import NumerologyDataAnalyzer, WikidataCollector
+from sparql_planner import people_query
+
+
+class _Response:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class _PeopleSession:
+    """Sessão que pagina pessoas sintéticas por ano de nascimento."""
+
+    def __init__(self, per_year: int):
+        self.headers = {}
+        self.per_year = per_year
+        self.queries = []
+
+    def get(self, url, params=None, timeout=None):
+        query = params['query']
+        self.queries.append(query)
+        year = int(re.search(r'\?birthDate >= "(\d{4})', query).group(1))
+        limit = int(re.search(r'LIMIT (\d+)', query).group(1))
+        offset = int(re.search(r'OFFSET (\d+)', query).group(1)) if 'OFFSET' in query else 0
+        bindings = []
+        for i in range(offset, min(offset + limit, self.per_year)):
+            uri = f"http://www.wikidata.org/entity/Q{year}{i:03d}"
+            bindings.append({'person': {'value': uri},
+                             'birthDate': {'value': f"{year}-03-{i % 28 + 1:02d}T00:00:00Z"},
+                             'deathDate': {'value': f"{year + 60}-07-{i % 28 + 1:02d}T00:00:00Z"}})
+        return _Response({'results': {'bindings': bindings}})
+
+
+class TestLifeEvents(unittest.TestCase):
+    """Testes dos ciclos por pessoa, das hipóteses e da coleta paginada."""
+
+    def setUp(self):
+        self.analyzer = NumerologyDataAnalyzer()
+        self.people = pd.DataFrame({
+            'person': ['p1', 'p2', 'p3', 'p4', 'p5'],
+            'birthDate': ['1879-03-14', '1809-02-12', '1950-00-00', '1900-01-01', '-0100-07-12'],
+            'deathDate': ['1955-04-18', '1865-04-15', '2000-01-01', None, '-0044-03-15'],
+        })
+
+    def test_matches_scalar_calculator(self):
+        """Testa Ano, Mês e Dia Pessoal e a idade contra a calculadora escalar."""
+        life = self.analyzer.analyze_life_events(self.people, compact=False)
+        calc = self.analyzer.calc
+
+        # Nascimento parcial e morte ausente ficam de fora
+        self.assertEqual(life['person'].tolist(), ['p1', 'p2', 'p5'])
+        for row in life.itertuples():
+            if row.year < 0:
+                continue
+            self.assertEqual(row.ano_pessoal, calc.calcular_ano_pessoal(row.birth_date, row.year))
+            self.assertEqual(row.mes_pessoal,
+                             calc.calcular_mes_pessoal(row.birth_date, row.year, int(row.date[5:7])))
+            self.assertEqual(row.dia_pessoal, calc.calcular_dia_pessoal(row.birth_date, row.date))
+        self.assertEqual(life['age'].tolist(), [76, 56, 55])
+
+    def test_unknown_event_day(self):
+        """Testa que mês/dia desconhecidos do evento zeram o ciclo correspondente."""
+        people = pd.DataFrame({'birthDate': ['1900-05-05', '1900-05-05'],
+                               'deathDate': ['1970-00-00', '1970-06-00']})
+        life = self.analyzer.analyze_life_events(people)
+        self.assertEqual(life['mes_pessoal'].tolist()[0], 0)
+        self.assertEqual(life['dia_pessoal'].tolist(), [0, 0])
+        self.assertGreater(life['mes_pessoal'].tolist()[1], 0)
+
+    def test_hypotheses(self):
+        """Testa as hipóteses por ciclo e por década de nascimento."""
+        rng = np.random.default_rng(0)
+        births = pd.Timestamp('1850-01-01') + pd.to_timedelta(rng.integers(0, 36500, 20_000), unit='D')
+        deaths = births + pd.to_timedelta(rng.integers(7300, 32850, 20_000), unit='D')
+        people = pd.DataFrame({'birthDate': births.strftime('%Y-%m-%d'),
+                               'deathDate': deaths.strftime('%Y-%m-%d')})
+        result = self.analyzer.life_event_hypotheses(self.analyzer.analyze_life_events(people))
+
+        for cycle in ('ano_pessoal', 'mes_pessoal', 'dia_pessoal'):
+            self.assertEqual(result[cycle]['total_events'], 20_000)
+            self.assertAlmostEqual(result[cycle]['ano_9_percentage'], 100 / 9, delta=1.0)
+        self.assertEqual(sum(h['total_events'] for h in result['slices']['birth_decade'].values()),
+                         20_000)
+
+    def test_people_query(self):
+        """Testa o filtro por intervalo de datas (sem YEAR por pessoa)."""
+        query = people_query(-50, 10, limit=5, offset=10)
+        self.assertIn('"-0050-01-01T00:00:00Z"^^xsd:dateTime', query)
+        self.assertIn('"0010-01-01T00:00:00Z"^^xsd:dateTime', query)
+        self.assertIn('?person wdt:P570 ?deathDate', query)
+        self.assertNotIn('YEAR(', query)
+        self.assertIn('OPTIONAL { ?person wdt:P570', people_query(1900, 1901, require_death=False))
+
+    def test_paginated_harvest(self):
+        """Testa a coleta paginada por ano de nascimento e a análise do resultado."""
+        with tempfile.TemporaryDirectory() as tmp:
+            session = _PeopleSession(per_year=25)
+            collector = WikidataCollector(cache_dir=tmp, session=session)
+            people = collector.collect_people_by_birth_year(1900, 1903, page_size=10)
+
+            # 3 anos x 3 páginas (10 + 10 + 5 pessoas)
+            self.assertEqual(len(session.queries), 9)
+            self.assertEqual(len(people), 75)
+            self.assertEqual(people['birth_year'].value_counts().to_dict(), {1900: 25, 1901: 25, 1902: 25})
+            self.assertEqual(people['personLabel'].iloc[0], 'Q1900000')
+
+            life = self.analyzer.analyze_life_events(people)
+            self.assertEqual(len(life), 75)
+            self.assertTrue((life['age'] == 60).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
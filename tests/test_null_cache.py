@@ -0,0 +1,101 @@
+"""
+Testes do cache de distribuições nulas de Monte Carlo
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+from collections import Counter
+from math import factorial
+
+import numpy as np
+from scipy import stats
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from accumulators import AnoPessoalAccumulator
+from data_processor import NumerologyDataAnalyzer
+from null_cache import NullDistributionCache, statistic_value
+
+
+def _exact_p_value(counts) -> float:
+    """P(qui-quadrado >= observado) exato sob a uniforme, somando sobre as partições de n."""
+    n, k = sum(counts), len(counts)
+    observed = statistic_value('chi_square', counts)
+
+    def partitions(total, parts, largest):
+        if parts == 0:
+            if total == 0:
+                yield ()
+            return
+        for first in range(min(total, largest), -1, -1):
+            for rest in partitions(total - first, parts - 1, first):
+                yield (first,) + rest
+
+    tail = 0
+    for cells in partitions(n, k, n):
+        if statistic_value('chi_square', cells) < observed - 1e-9:
+            continue
+        arrangements = factorial(k)
+        for repeated in Counter(cells).values():
+            arrangements //= factorial(repeated)
+        ways = factorial(n)
+        for count in cells:
+            ways //= factorial(count)
+        tail += arrangements * ways
+    return tail / k ** n
+
+
+class TestNullDistributionCache(unittest.TestCase):
+    """Testes da simulação, persistência e consulta dos p-valores."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = NullDistributionCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_asymptotic_chi_square(self):
+        """Testa o p-valor de Monte Carlo contra o qui-quadrado assintótico."""
+        counts = np.array([560, 550, 540, 530, 570, 560, 555, 565, 600])
+        self.assertAlmostEqual(self.cache.p_value(counts), stats.chisquare(counts).pvalue, delta=0.02)
+        self.assertEqual(self.cache.p_value([500] * 9), 1.0)
+        self.assertEqual(self.cache.p_value([0] * 8 + [90]), 1 / 20_001)
+
+    def test_persistent_and_reused(self):
+        """Testa que a mesma chave é simulada uma vez e relida do disco por outro cache."""
+        self.cache.p_value([10, 12, 9, 11, 8, 10, 13, 9, 8])
+        self.cache.p_value([12, 10, 9, 11, 8, 10, 13, 9, 8])
+        self.assertEqual(self.cache.simulated, 1)
+
+        reopened = NullDistributionCache(self.tmp.name)
+        distribution = reopened.get(90)
+        self.assertEqual(reopened.simulated, 0)
+        np.testing.assert_array_equal(distribution.support, self.cache.get(90).support)
+        np.testing.assert_array_equal(distribution.tail, self.cache.get(90).tail)
+
+    def test_exact_small_n(self):
+        """Testa P(T >= obs) contra a distribuição exata em amostras pequenas (suporte com empates)."""
+        for counts in ([5, 3, 2, 2, 2, 1, 1, 1, 1], [4, 3, 2, 2, 2, 2, 1, 1, 1], [6, 2, 1, 1, 1, 1, 0, 0, 0]):
+            self.assertAlmostEqual(self.cache.p_value(counts), _exact_p_value(counts), delta=0.015)
+        # O mesmo valor da estatística em outra ordem das células cai no mesmo ponto do suporte
+        self.assertEqual(self.cache.p_value([1, 1, 1, 1, 2, 2, 2, 3, 5]),
+                         self.cache.p_value([5, 3, 2, 2, 2, 1, 1, 1, 1]))
+
+    def test_analyzer_slices(self):
+        """Testa o p-valor de Monte Carlo na hipótese e nos testes por fatia."""
+        analyzer = NumerologyDataAnalyzer(state_dir=self.tmp.name, null_cache=self.cache)
+        counts = np.array([0, 30, 28, 35, 31, 29, 33, 27, 30, 37])
+        accumulator = AnoPessoalAccumulator(counts, counts.sum(),
+                                            {'decade': {1990: counts, 2000: counts * 2}})
+        result = analyzer.hypothesis_from_counts(accumulator)
+        self.assertAlmostEqual(result['p_value_mc'], result['p_value'], delta=0.05)
+        slices = analyzer.slice_hypotheses(accumulator, 'decade')
+        self.assertTrue(all('p_value_mc' in test for test in slices.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
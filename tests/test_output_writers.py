@@ -0,0 +1,127 @@
+"""
+Testes dos gravadores particionados e compactados
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_processor import NumerologyDataAnalyzer
+from output_writers import PartitionedWriter, read_manifest, read_partitions
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+class TestPartitionedWriter(unittest.TestCase):
+    """Testes da gravação em blocos, particionada e atômica."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.events_path = os.path.join(DATA_DIR, 'historical_events_5000_synthetic.csv')
+        cls.analyzer = NumerologyDataAnalyzer()
+        cls.analysis = cls.analyzer.analyze_event_cycles(pd.read_csv(cls.events_path))
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.tmp.name, 'analise')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunked_analysis_streams_partitions(self):
+        """Testa que a análise em blocos grava as mesmas linhas e a mesma hipótese."""
+        with PartitionedWriter(self.out, partition_by='decade') as writer:
+            result = self.analyzer.analyze_in_chunks(self.events_path, chunksize=700, writer=writer)
+
+        manifest = read_manifest(self.out)
+        self.assertEqual(manifest['total_rows'], len(self.analysis))
+        self.assertEqual(result['hypothesis_test']['counts_by_ano'],
+                         self.analyzer.test_hypothesis_ano_9(self.analysis)['counts_by_ano'])
+        self.assertTrue(all(entry['file'].endswith('.csv.gz')
+                            for entry in manifest['partitions'].values()))
+
+        decade = next(iter(manifest['partitions']))
+        part = read_partitions(self.out, partitions=[decade], columns=['year', 'ano_pessoal'])
+        self.assertEqual(len(part), manifest['partitions'][decade]['rows'])
+        self.assertTrue(((part['year'] // 10 * 10) == int(decade)).all())
+
+    def test_abort_keeps_previous_output(self):
+        """Testa que uma gravação interrompida não substitui a anterior."""
+        with PartitionedWriter(self.out, partition_by='source') as writer:
+            writer.write(self.analysis)
+        previous = read_manifest(self.out)
+
+        with self.assertRaises(RuntimeError):
+            with PartitionedWriter(self.out, partition_by='source') as writer:
+                writer.write(self.analysis.iloc[:10])
+                raise RuntimeError("falha simulada")
+
+        self.assertEqual(read_manifest(self.out)['total_rows'], previous['total_rows'])
+        self.assertEqual(len(read_partitions(self.out)), len(self.analysis))
+        leftovers = [f for _, _, files in os.walk(self.out) for f in files if f.endswith('.tmp')]
+        self.assertEqual(leftovers, [])
+
+    def test_crash_before_manifest_keeps_previous_output(self):
+        """Testa uma queda entre a renomeação das partições e a troca do manifesto."""
+        with PartitionedWriter(self.out, partition_by='source') as writer:
+            writer.write(self.analysis)
+        previous = read_manifest(self.out)
+
+        writer = PartitionedWriter(self.out, partition_by='source')
+        writer.write(self.analysis.iloc[:10])
+        with mock.patch('output_writers.json.dump', side_effect=OSError("disco cheio")):
+            with self.assertRaises(OSError):
+                writer.close()
+
+        # O manifesto antigo continua válido e aponta para arquivos intactos;
+        # a gravação que falhou apagou os próprios arquivos
+        self.assertEqual(read_manifest(self.out), previous)
+        self.assertEqual(len(read_partitions(self.out)), len(self.analysis))
+        self.assertFalse([f for _, _, names in os.walk(self.out) for f in names if writer.run_id in f])
+
+        # A próxima gravação confirmada apaga os arquivos da anterior
+        with PartitionedWriter(self.out, partition_by='source') as writer:
+            writer.write(self.analysis.iloc[:10])
+        files = sorted(os.path.relpath(os.path.join(root, f), self.out)
+                       for root, _, names in os.walk(self.out) for f in names)
+        manifest = read_manifest(self.out)
+        self.assertEqual(files, sorted([entry['file'] for entry in manifest['partitions'].values()]
+                                       + ['_manifest.json']))
+        self.assertEqual(len(read_partitions(self.out)), 10)
+
+    def test_cleanup_leaves_foreign_files(self):
+        """Testa que só os arquivos da gravação substituída são apagados."""
+        with PartitionedWriter(self.out, partition_by='source') as writer:
+            writer.write(self.analysis)
+        first = read_manifest(self.out)
+
+        # Temporário de outro gravador em andamento e arquivos do usuário
+        other = PartitionedWriter(self.out, partition_by='source')
+        other.write(self.analysis.iloc[:5])
+        foreign = [os.path.join(self.out, 'part-notas.txt'), os.path.join(self.out, 'leia.tmp')]
+        for path in foreign:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('x')
+
+        with PartitionedWriter(self.out, partition_by='source') as writer:
+            writer.write(self.analysis.iloc[:10])
+        for path in foreign:
+            self.assertTrue(os.path.exists(path))
+        tmp_files = [f for _, _, names in os.walk(self.out) for f in names if other.run_id in f]
+        self.assertTrue(tmp_files and all(f.endswith('.tmp') for f in tmp_files))
+        for entry in first['partitions'].values():
+            self.assertFalse(os.path.exists(os.path.join(self.out, entry['file'])))
+
+        other.close()
+        self.assertEqual(len(read_partitions(self.out)), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Testes unitários para ParallelAnalysisExecutor
+"""
+
+import sys
+import os
+import unittest
+
+import pandas as pd
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_processor import NumerologyDataAnalyzer
+from parallel_executor import ParallelAnalysisExecutor
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+class TestParallelAnalysisExecutor(unittest.TestCase):
+    """Testes de equivalência entre a execução paralela e a serial."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Calcula o resultado serial de referência."""
+        cls.path = os.path.join(DATA_DIR, 'historical_events_5000_synthetic.csv')
+        cls.events = pd.read_csv(cls.path)
+        analyzer = NumerologyDataAnalyzer()
+        analysis = analyzer.analyze_event_cycles(cls.events)
+        cls.serial = analyzer.test_hypothesis_ano_9(analysis)
+        cls.serial_decades = analyzer.analyze_by_decade(analysis)
+
+    def test_partitioned_dataframe(self):
+        """Testa partições por década em um pool de processos."""
+        executor = ParallelAnalysisExecutor(max_workers=2)
+        result = executor.run(self.events, partition_by='decade')
+
+        self.assertEqual(result['hypothesis_test'], self.serial)
+        self.assertEqual(result['slices']['decade'], self.serial_decades)
+        self.assertEqual(sum(h['total_events'] for h in result['slices']['category'].values()),
+                         self.serial['total_events'])
+
+    def test_file_partitions(self):
+        """Testa arquivos como partições, incluindo o reduce de duplicatas."""
+        executor = ParallelAnalysisExecutor(max_workers=2)
+        result = executor.run([self.path, self.path])
+
+        self.assertEqual(result['partitions'], 2)
+        self.assertEqual(result['hypothesis_test']['total_events'], 2 * self.serial['total_events'])
+        self.assertEqual(result['hypothesis_test']['ano_9_count'], 2 * self.serial['ano_9_count'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Testes da análise de periodicidade
+"""
+
+import sys
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lombscargle
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from periodicity import PeriodicityAnalyzer, build_count_series, detrend, lomb_scargle
+
+
+class TestPeriodicity(unittest.TestCase):
+    """Testes das séries, do espectro em lote e do teste contra surrogados."""
+
+    def test_count_series(self):
+        """Testa as séries total e por categoria, anuais e mensais."""
+        events = pd.DataFrame({
+            'date': ['1900-01-05', '1900-03-01', '1902-03-09', 'inválida'],
+            'category': ['A', 'B', 'A', 'A'],
+        })
+        series = build_count_series(events, 'year', group_by=('category',))
+        self.assertEqual(series.keys.values.tolist(), [['all', 'all'], ['category', 'A'], ['category', 'B']])
+        self.assertEqual(series.counts.tolist(), [[2, 0, 1], [1, 0, 1], [1, 0, 0]])
+        monthly = build_count_series(events, 'month', group_by=())
+        self.assertEqual(monthly.counts.shape, (1, 27))
+        self.assertAlmostEqual(monthly.times[2], 1900 + 2 / 12)
+
+    def test_lomb_scargle_matches_scipy(self):
+        """Testa o periodograma em lote contra scipy.signal.lombscargle série a série."""
+        rng = np.random.default_rng(0)
+        times = np.arange(120.0)
+        series = detrend(rng.poisson(20, size=(4, 120)))
+        frequencies = np.array([1 / 9, 1 / 4.5, 1 / 11])
+        expected = np.array([lombscargle(times, row, 2 * np.pi * frequencies) for row in series])
+        np.testing.assert_allclose(lomb_scargle(series, times, frequencies) * series.var(axis=1, keepdims=True),
+                                   expected)
+
+    def test_detects_nine_year_cycle(self):
+        """Testa que um ciclo de 9 anos é detectado e uma série sem ciclo não."""
+        years = np.arange(1900, 2020)
+        rng = np.random.default_rng(1)
+        cyclic = np.repeat(years, rng.poisson(40 + 25 * np.cos(2 * np.pi * years / 9)))
+        flat = np.repeat(years, rng.poisson(40, len(years)))
+        events = pd.DataFrame({
+            'year': np.concatenate([cyclic, flat]),
+            'source': ['ciclo'] * len(cyclic) + ['plano'] * len(flat),
+        })
+        result = PeriodicityAnalyzer(n_surrogates=199, max_workers=1, seed=0).run(events, ('source',))
+        p_values = dict(zip(result['value'], result['p_value']))
+        self.assertLess(p_values['ciclo'], 0.01)
+        self.assertGreater(p_values['plano'], 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Testes do pipeline leitura/análise/gravação
+"""
+
+import sys
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_processor import NumerologyDataAnalyzer
+from output_writers import PartitionedWriter, read_manifest
+from pipeline import Pipeline
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+class TestPipeline(unittest.TestCase):
+    """Testes de ordem, contrapressão, falhas e utilização dos estágios."""
+
+    def test_order_preserved(self):
+        """Testa que o gravador recebe os resultados na ordem da leitura."""
+        rng = random.Random(0)
+        delays = [rng.uniform(0, 0.01) for _ in range(40)]
+        written = []
+
+        def process(i):
+            time.sleep(delays[i])
+            return i * i
+
+        stats = Pipeline(range(40), process, written.append, workers=4, queue_size=2).run()
+        self.assertEqual(written, [i * i for i in range(40)])
+        self.assertEqual(stats['chunks'], 40)
+        self.assertEqual(stats['stages']['analyze']['items'], 40)
+
+    def test_backpressure_bounds_chunks_in_flight(self):
+        """Testa que um gravador lento para a leitura em vez de acumular blocos."""
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def read():
+            nonlocal in_flight, peak
+            for i in range(30):
+                with lock:
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                yield i
+
+        def consume(_):
+            nonlocal in_flight
+            time.sleep(0.005)
+            with lock:
+                in_flight -= 1
+
+        pipeline = Pipeline(read(), lambda x: x, consume, workers=2, queue_size=3)
+        stats = pipeline.run()
+        self.assertLessEqual(peak, pipeline.max_in_flight)
+        self.assertEqual(stats['bottleneck'], 'write')
+        self.assertGreater(stats['stages']['read']['wait_output_seconds'], 0)
+
+    def test_slow_analysis_is_bottleneck(self):
+        """Testa a utilização quando a análise limita a vazão."""
+        stats = Pipeline(range(20), lambda x: time.sleep(0.01), lambda _: None,
+                         workers=1, queue_size=2).run()
+        self.assertEqual(stats['bottleneck'], 'analyze')
+        self.assertGreater(stats['stages']['analyze']['utilization'], 0.5)
+        self.assertGreater(stats['stages']['write']['wait_input_seconds'], 0)
+
+    def test_failure_propagates(self):
+        """Testa que a falha de um estágio encerra o pipeline e é relançada."""
+        def process(i):
+            if i == 5:
+                raise RuntimeError("falha no bloco 5")
+            return i
+
+        written = []
+        with self.assertRaisesRegex(RuntimeError, "bloco 5"):
+            Pipeline(range(1000), process, written.append, workers=2, queue_size=2).run()
+        self.assertLess(len(written), 1000)
+
+        def consume(_):
+            raise ValueError("disco cheio")
+
+        with self.assertRaisesRegex(ValueError, "disco cheio"):
+            Pipeline(range(1000), lambda x: x, consume).run()
+
+    def test_pipelined_chunks_match_serial(self):
+        """Testa a análise em blocos com pipeline contra a execução serial."""
+        events_path = os.path.join(DATA_DIR, 'historical_events_5000_synthetic.csv')
+        with tempfile.TemporaryDirectory() as tmp:
+            analyzer = NumerologyDataAnalyzer(state_dir=tmp)
+            results = {}
+            for workers in (0, 3):
+                out = os.path.join(tmp, f"out_{workers}")
+                with PartitionedWriter(out, partition_by='decade') as writer:
+                    results[workers] = analyzer.analyze_in_chunks(events_path, chunksize=400,
+                                                                  writer=writer, workers=workers)
+                partitions = read_manifest(out)['partitions']
+                results[workers]['manifest'] = {key: entry['rows'] for key, entry in partitions.items()}
+
+        serial, pipelined = results[0], results[3]
+        self.assertEqual(pipelined['rows'], serial['rows'])
+        self.assertEqual(pipelined['accumulator'].to_dict(), serial['accumulator'].to_dict())
+        self.assertEqual(pipelined['hypothesis_test'], serial['hypothesis_test'])
+        self.assertEqual(pipelined['manifest'], serial['manifest'])
+        self.assertNotIn('pipeline', serial)
+        self.assertEqual(pipelined['pipeline']['chunks'], 13)
+        self.assertEqual(set(pipelined['pipeline']['stages']), {'read', 'analyze', 'write'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Testes do limitador de taxa contra um servidor local que limita requisições
+"""
+
+import sys
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rate_limiter import HostLimiter, LimiterRegistry, RateLimitedSession, RetryPolicy, parse_retry_after
+
+
+class _ThrottlingHandler(BaseHTTPRequestHandler):
+    """Aceita no máximo uma requisição a cada `interval` segundos; as demais recebem 429."""
+
+    interval = 0.02
+    lock = threading.Lock()
+    last_accepted = 0.0
+    flaky_left = 0
+    accepted = 0
+    rejected = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            if self.path == '/flaky' and cls.flaky_left > 0:
+                cls.flaky_left -= 1
+                status = 503
+            else:
+                now = time.monotonic()
+                status = 200 if now - cls.last_accepted >= cls.interval else 429
+                if status == 200:
+                    cls.last_accepted = now
+                    cls.accepted += 1
+                else:
+                    cls.rejected += 1
+        body = b'ok'
+        self.send_response(status)
+        if status != 200:
+            self.send_header('Retry-After', '0.05')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Testes do limitador adaptativo e das novas tentativas."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _ThrottlingHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _session(self, **limiter_settings):
+        registry = LimiterRegistry(defaults=limiter_settings)
+        return RateLimitedSession(registry, RetryPolicy(max_retries=8, base_delay=0.01, seed=0)), registry
+
+    def test_backs_off_when_throttled(self):
+        """Testa que todas as requisições concorrentes terminam em 200 e a taxa é reduzida."""
+        session, registry = self._session(rate=500.0, concurrency=8)
+        statuses = []
+
+        def worker():
+            for _ in range(5):
+                statuses.append(session.get(self.url + '/').status_code)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        limiter = registry.get(f"127.0.0.1:{self.server.server_address[1]}")
+        self.assertEqual(statuses, [200] * 20)
+        self.assertGreater(limiter.throttled, 0)
+        self.assertLess(limiter.rate, 500.0)
+        self.assertLess(limiter.concurrency, 8)
+
+    def test_retries_503(self):
+        """Testa novas tentativas após respostas 503 transitórias."""
+        _ThrottlingHandler.flaky_left = 2
+        session, _ = self._session(rate=1000.0)
+        time.sleep(_ThrottlingHandler.interval)
+        self.assertEqual(session.get(self.url + '/flaky').status_code, 200)
+        self.assertEqual(_ThrottlingHandler.flaky_left, 0)
+
+    def test_ramps_up_after_healthy_responses(self):
+        """Testa o aumento gradual da taxa e da concorrência."""
+        limiter = HostLimiter(rate=10.0, concurrency=4, ramp_after=2)
+        limiter.acquire()
+        limiter.release(429)
+        self.assertEqual((limiter.rate, limiter.concurrency), (5.0, 2))
+        for _ in range(4):
+            limiter.acquire()
+            limiter.release(200)
+        self.assertEqual((limiter.rate, limiter.concurrency), (7.0, 4))
+
+    def test_one_decrease_per_burst(self):
+        """Testa que uma rajada de 429 concorrentes reduz os limites uma única vez."""
+        limiter = HostLimiter(rate=80.0, concurrency=8)
+        sent = [limiter.acquire() for _ in range(8)]
+        for sent_at in sent:
+            limiter.release(429, sent_at=sent_at)
+        self.assertEqual((limiter.rate, limiter.concurrency, limiter.decreases), (40.0, 4, 1))
+        self.assertEqual(limiter.throttled, 8)
+
+        # Enviada depois da redução: a nova taxa ainda é alta demais
+        limiter.release(429, sent_at=limiter.acquire())
+        self.assertEqual((limiter.rate, limiter.concurrency), (20.0, 2))
+
+        # Sem instante de envio, a janela é o Retry-After
+        limiter = HostLimiter(rate=80.0, concurrency=8)
+        for _ in range(3):
+            limiter.acquire()
+        for _ in range(3):
+            limiter.release(503, retry_after=0.05)
+        self.assertEqual(limiter.decreases, 1)
+        limiter.acquire()
+        limiter.release(503)
+        self.assertEqual(limiter.decreases, 2)
+
+    def test_parse_retry_after(self):
+        """Testa o cabeçalho Retry-After em segundos, data HTTP e inválido."""
+        self.assertEqual(parse_retry_after('3'), 3.0)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertIsNone(parse_retry_after('amanhã'))
+        self.assertIsNone(parse_retry_after(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
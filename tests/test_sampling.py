@@ -0,0 +1,83 @@
+"""
+Testes da amostragem e do modo aproximado do analisador
+"""
+
+import sys
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_processor import NumerologyDataAnalyzer
+from sampling import reservoir_sample
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+class TestApproximateAnalysis(unittest.TestCase):
+    """Testes das estimativas por amostragem contra a análise exata."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.analyzer = NumerologyDataAnalyzer()
+        cls.events = pd.read_csv(os.path.join(DATA_DIR, 'historical_events_5000_synthetic.csv'))
+        cls.large = pd.concat([cls.events] * 40, ignore_index=True)
+        cls.exact = cls.analyzer.test_hypothesis_ano_9(cls.analyzer.analyze_event_cycles(cls.large))
+
+    def test_reservoir_sample(self):
+        """Testa que o reservatório tem k linhas distintas e conta a população."""
+        frame = pd.DataFrame({'i': np.arange(10_000)})
+        chunks = (frame.iloc[start:start + 777] for start in range(0, len(frame), 777))
+        sample = reservoir_sample(chunks, 500, seed=0)
+        self.assertEqual(len(sample), 500)
+        self.assertTrue(sample['i'].is_unique)
+        self.assertEqual(sample.attrs['population_size'], 10_000)
+        self.assertGreater(sample['i'].max(), 5_000)
+
+    def test_precision_and_coverage(self):
+        """Testa que a margem pedida é atingida e o intervalo cobre o valor exato."""
+        for stratify_by in (None, 'decade'):
+            result = self.analyzer.test_hypothesis_ano_9(self.large, approximate=True, precision=0.01,
+                                                         stratify_by=stratify_by, seed=3)
+            self.assertTrue(result['precision_reached'])
+            self.assertLess(result['sample_size'], len(self.large))
+            lower, upper = result['ano_9_percentage_ci']
+            self.assertLessEqual(lower, self.exact['ano_9_percentage'])
+            self.assertGreaterEqual(upper, self.exact['ano_9_percentage'])
+
+    def test_small_input_is_exact(self):
+        """Testa que entradas menores que a amostra inicial são contadas por inteiro."""
+        result = self.analyzer.test_hypothesis_ano_9(self.events.iloc[:500], approximate=True)
+        exact = self.analyzer.test_hypothesis_ano_9(self.analyzer.analyze_event_cycles(self.events.iloc[:500]))
+        self.assertEqual(result['margin_of_error'], 0.0)
+        self.assertEqual(result['counts_by_ano'], exact['counts_by_ano'])
+
+    def test_csv_path(self):
+        """Testa o CSV (amostra de reservatório em uma passada) e as opções recusadas."""
+        path = os.path.join(DATA_DIR, 'historical_events_5000_synthetic.csv')
+        exact = self.analyzer.test_hypothesis_ano_9(self.analyzer.analyze_event_cycles(self.events))
+        result = self.analyzer.approximate_hypothesis_ano_9(path, max_sample=2000, seed=1, chunksize=700)
+        self.assertEqual(result['population_size'], len(self.events))
+        self.assertEqual(result['sample_size'], 2000)
+        self.assertGreater(result['margin_of_error'], 0)
+        self.assertIsNone(result['precision_reached'])
+        lower, upper = result['ano_9_percentage_ci']
+        self.assertLessEqual(lower, exact['ano_9_percentage'])
+        self.assertGreaterEqual(upper, exact['ano_9_percentage'])
+
+        # Arquivo menor que o reservatório: contagem exata
+        whole = self.analyzer.test_hypothesis_ano_9(path, approximate=True)
+        self.assertEqual(whole['margin_of_error'], 0.0)
+        self.assertEqual(whole['counts_by_ano'], exact['counts_by_ano'])
+
+        for options in ({'precision': 0.01}, {'stratify_by': 'decade'}):
+            with self.assertRaises(ValueError):
+                self.analyzer.approximate_hypothesis_ano_9(path, **options)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Testes do serviço HTTP local
+"""
+
+import sys
+import os
+import json
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from numerology_calculator import NumerologyCalculator
+from service import create_server, run_load_test
+
+
+class TestNumerologyService(unittest.TestCase):
+    """Testes dos endpoints e do micro-lote contra a calculadora escalar."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Inicia o servidor em uma porta livre."""
+        cls.server = create_server(port=0)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.calc = NumerologyCalculator()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _post(self, path, payload):
+        request = urllib.request.Request(self.url + path, data=json.dumps(payload).encode('utf-8'),
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    def _get(self, path, query):
+        with urllib.request.urlopen(f"{self.url}{path}?{query}") as response:
+            return json.loads(response.read())
+
+    def test_endpoints(self):
+        """Testa os endpoints pessoais contra os métodos escalares."""
+        data_nasc = '1995-08-16'
+        self.assertEqual(self._post('/destino', {'data_nasc': data_nasc})['destino'],
+                         self.calc.calcular_numero_destino(data_nasc))
+        self.assertEqual(self._post('/ano', {'data_nasc': data_nasc, 'ano': 2025})['ano_pessoal'],
+                         self.calc.calcular_ano_pessoal(data_nasc, 2025))
+        self.assertEqual(self._post('/mes', {'data_nasc': data_nasc, 'ano': 2025, 'mes': 3})['mes_pessoal'],
+                         self.calc.calcular_mes_pessoal(data_nasc, 2025, 3))
+        self.assertEqual(self._post('/dia', {'data_nasc': data_nasc, 'data': '2025-03-10'})['dia_pessoal'],
+                         self.calc.calcular_dia_pessoal(data_nasc, '2025-03-10'))
+        self.assertEqual(self._post('/hipotese', {'anos': list(range(1900, 2000))})['total_events'], 100)
+
+    def test_hipotese_get(self):
+        """Testa listas separadas por vírgula na query string do GET."""
+        self.assertEqual(self._get('/hipotese', 'datas=2020-01-01')['total_events'], 1)
+        by_get = self._get('/hipotese', 'anos=1999,2008,2017')
+        self.assertEqual(by_get, self._post('/hipotese', {'anos': [1999, 2008, 2017]}))
+        self.assertEqual(by_get['total_events'], 3)
+        self.assertEqual(self._get('/hipotese', 'datas=2020-01-01,1999-12-31')['total_events'], 2)
+
+        for request in (lambda: self._get('/hipotese', 'anos=20x0'),
+                        lambda: self._post('/hipotese', {'anos': 2020}),
+                        lambda: self._post('/hipotese', {'datas': 5})):
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                request()
+            self.assertEqual(context.exception.code, 400)
+
+    def test_invalid_request(self):
+        """Testa a resposta 400 para parâmetros inválidos."""
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self._post('/ano', {'data_nasc': '16/08/1995'})
+        self.assertEqual(context.exception.code, 400)
+
+    def test_load(self):
+        """Testa requisições concorrentes agrupadas em micro-lotes."""
+        report = run_load_test(self.url, n_requests=400, concurrency=16)
+        self.assertEqual(report['requests'], 400)
+        self.assertEqual(report['errors'], 0)
+        self.assertGreater(report['requests_per_second'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
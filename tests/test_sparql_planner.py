@@ -0,0 +1,130 @@
+"""
+Testes do planejador SPARQL contra respostas gravadas do Wikidata
+"""
+
+import sys
+import os
+import json
+import re
+import tempfile
+import unittest
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_processor import WikidataCollector
+from sparql_planner import events_query, explode_types
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'wikidata')
+
+
+class _Response:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        if isinstance(self.payload, Exception):
+            raise self.payload
+        return self.payload
+
+
+class _FixtureSession:
+    """Sessão que responde às consultas com os arquivos gravados."""
+
+    def __init__(self):
+        self.headers = {}
+        self.queries = []
+
+    def get(self, url, params=None, timeout=None):
+        query = params['query']
+        self.queries.append(query)
+        if 'VALUES ?class' in query:
+            first = re.search(r'VALUES \?class \{ wd:(Q\d+)', query).group(1)
+            name = f"events_batch_{first}.json"
+        elif 'wdt:P279*' in query:
+            name = 'subclass_closure.json'
+        else:
+            name = 'legacy_events.json'
+        with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+            return _Response(json.load(f))
+
+
+class TestSparqlPlanner(unittest.TestCase):
+    """Testes da coleta planejada (fecho cacheado + lotes VALUES + GROUP_CONCAT)."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.session = _FixtureSession()
+        self.collector = WikidataCollector(cache_dir=self.tmp.name, session=self.session)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_legacy_semantics(self):
+        """Testa que a coleta planejada traz os mesmos (evento, rótulo, data, tipo) da consulta original."""
+        planned = self.collector.collect_historical_events(limit=10, batch_size=2)
+        legacy = self.collector._clean_events(self.collector._execute_sparql('legacy'))
+
+        columns = ['event', 'eventLabel', 'date', 'typeLabel']
+        self.assertEqual(len(planned), planned['event'].nunique())
+        self.assertEqual(set(map(tuple, explode_types(planned)[columns].to_numpy())),
+                         set(map(tuple, legacy[columns].to_numpy())))
+        self.assertEqual(planned['date'].tolist(), sorted(planned['date'], reverse=True))
+
+    def test_closure_cached(self):
+        """Testa que o fecho de subclasses é consultado uma única vez."""
+        self.assertEqual(self.collector.subclass_closure(),
+                         ['Q1190554', 'Q1656682', 'Q178561', 'Q8065'])
+        self.collector.subclass_closure()
+        self.assertEqual(sum('wdt:P279*' in q for q in self.session.queries), 1)
+
+    def test_batches_checkpointed(self):
+        """Testa que um lote com falha não descarta os anteriores e a retomada só busca o que falta."""
+        fetch = self.session.get
+        failing = {'Q178561'}
+
+        def flaky(url, params=None, timeout=None):
+            first = re.search(r'VALUES \?class \{ wd:(Q\d+)', params['query'])
+            if first and first.group(1) in failing:
+                return _Response(ValueError("Expecting value"))
+            return fetch(url, params, timeout)
+
+        self.session.get = flaky
+        self.assertTrue(self.collector.collect_historical_events(limit=10, batch_size=2).empty)
+        failing.clear()
+        self.session.queries.clear()
+        events = self.collector.collect_historical_events(limit=10, batch_size=2)
+        self.assertFalse(events.empty)
+        # Fecho em cache e só o lote que falhou
+        self.assertEqual(len(self.session.queries), 1)
+        self.assertIn('wd:Q178561', self.session.queries[0])
+
+    def test_closure_pruned_to_dated_classes(self):
+        """Testa que o fecho só traz classes com instâncias datadas (P585)."""
+        self.collector.subclass_closure()
+        closure = next(q for q in self.session.queries if 'wdt:P279*' in q)
+        self.assertIn('FILTER EXISTS', closure)
+        self.assertIn('wdt:P585', closure)
+
+    def test_events_query(self):
+        """Testa que a consulta de eventos não usa o caminho de propriedade."""
+        query = events_query(['Q1', 'Q2'], limit=5, year_min=1900, year_max=1910)
+        self.assertIn('VALUES ?class { wd:Q1 wd:Q2 }', query)
+        self.assertIn('GROUP_CONCAT', query)
+        self.assertNotIn('P279', query)
+        self.assertIn('YEAR(?date) >= 1900 && YEAR(?date) < 1910', query)
+
+    def test_malformed_responses(self):
+        """Testa que corpo não JSON ou sem 'bindings' vira resultado vazio, sem cache."""
+        for payload in (ValueError("Expecting value"), {'head': {}}, {'results': {}}):
+            self.session.get = lambda url, params=None, timeout=None: _Response(payload)
+            self.assertTrue(self.collector.query_sparql('SELECT ?x {}').empty)
+            self.assertTrue(self.collector.collect_historical_events(limit=10).empty)
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Testes do modo contínuo (streaming) sobre atualizações do GDELT
+"""
+
+import sys
+import os
+import io
+import tempfile
+import unittest
+import zipfile
+
+import numpy as np
+from scipy import stats
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_processor import GDELTCollector
+from streaming import DecayedCounts, GDELTUpdateFeed, SlidingWindowCounts, online_statistics
+
+
+def export_zip(days) -> bytes:
+    """Arquivo de exportação GDELT 2.0 mínimo (61 colunas, sem cabeçalho)."""
+    rows = []
+    for i, day in enumerate(days):
+        row = [''] * 61
+        row[0], row[1], row[26], row[28], row[29], row[30], row[31], row[34] = (
+            str(i), day, '010', '01', '1', '1.0', '3', '-2.5')
+        rows.append('\t'.join(row))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('export.CSV', '\n'.join(rows))
+    return buffer.getvalue()
+
+
+class _Response:
+    def __init__(self, text='', content=b''):
+        self.text = text
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class _FeedSession:
+    """Sessão que serve sempre o mesmo 'lastupdate.txt' e conta os downloads."""
+
+    def __init__(self):
+        self.downloads = 0
+
+    def get(self, url, timeout=None):
+        if url.endswith('lastupdate.txt'):
+            return _Response(text="150 abc http://x/20240101001500.export.CSV.zip\n"
+                                  "99 def http://x/20240101001500.mentions.CSV.zip\n")
+        self.downloads += 1
+        return _Response(content=export_zip(['20240101']))
+
+
+class TestStreaming(unittest.TestCase):
+    """Testes dos acumuladores online e do laço de streaming."""
+
+    def test_sliding_window_evicts(self):
+        """Testa a remoção dos lotes que saem da janela."""
+        window = SlidingWindowCounts(window_seconds=1800)
+        batch = np.arange(10)
+        window.add(0, batch)
+        window.add(900, batch)
+        np.testing.assert_array_equal(window.add(1800, batch), 2 * batch)
+        self.assertEqual(len(window.batches), 2)
+
+    def test_sliding_window_late_batches(self):
+        """Testa lotes atrasados: inseridos em ordem ou descartados fora da janela."""
+        window = SlidingWindowCounts(window_seconds=1800)
+        window.add(0, np.full(10, 1))
+        window.add(1800, np.full(10, 2))
+        # Atrasado, mas dentro da janela: entra antes do lote de 1800
+        np.testing.assert_array_equal(window.add(900, np.full(10, 4)), np.full(10, 6))
+        self.assertEqual([timestamp for timestamp, _ in window.batches], [900, 1800])
+        # Já fora da janela ao chegar: não conta
+        np.testing.assert_array_equal(window.add(0, np.full(10, 8)), np.full(10, 6))
+        # O lote atrasado sai antes do mais novo
+        np.testing.assert_array_equal(window.add(2700, np.zeros(10, dtype=np.int64)), np.full(10, 2))
+        self.assertEqual([timestamp for timestamp, _ in window.batches], [1800, 2700])
+
+    def test_decay_half_life(self):
+        """Testa que o peso cai à metade a cada meia-vida."""
+        decayed = DecayedCounts(half_life_seconds=3600)
+        decayed.add(0, np.full(10, 8))
+        np.testing.assert_allclose(decayed.add(7200, np.zeros(10)), np.full(10, 2.0))
+        # Lote atrasado uma meia-vida: entra com metade do peso
+        np.testing.assert_allclose(decayed.add(3600, np.full(10, 4)), np.full(10, 4.0))
+        self.assertEqual(decayed.timestamp, 7200)
+
+    def test_online_statistics(self):
+        """Testa o qui-quadrado e o z-score contra a uniforme."""
+        counts = np.array([0] + [100] * 8 + [180])
+        result = online_statistics(counts)
+        self.assertAlmostEqual(result['chi_square_stat'], stats.chisquare(counts[1:]).statistic)
+        self.assertAlmostEqual(result['p_value'], stats.chisquare(counts[1:]).pvalue)
+        self.assertGreater(result['z_score'], 5)
+        self.assertEqual(online_statistics(np.zeros(10))['p_value'], 1.0)
+
+    def test_directory_stream(self):
+        """Testa o streaming de um diretório: ordem, janela e latência."""
+        with tempfile.TemporaryDirectory() as tmp:
+            feed_dir = os.path.join(tmp, 'feed')
+            os.makedirs(feed_dir)
+            batches = {'20240101000000': ['20240101'] * 30 + ['19990101'] * 10,
+                       '20240101001500': ['20240101'] * 20,
+                       '20240102000000': ['20240102'] * 5}
+            for batch_id, days in batches.items():
+                with open(os.path.join(feed_dir, f'{batch_id}.export.CSV.zip'), 'wb') as f:
+                    f.write(export_zip(days))
+
+            collector = GDELTCollector(cache_dir=tmp)
+            snapshots = list(collector.stream_updates(directory=feed_dir, window_hours=1,
+                                                      idle_timeout=0))
+
+        self.assertEqual([s['batch_id'] for s in snapshots], list(batches))
+        self.assertEqual(snapshots[1]['window']['events'], 60)
+        # O último lote chega um dia depois: a janela de 1 hora só o contém
+        self.assertEqual(snapshots[2]['window']['batches'], 1)
+        self.assertEqual(snapshots[2]['cumulative']['events'], 65)
+        self.assertLess(snapshots[2]['decayed']['events'], 65)
+        self.assertTrue(all(s['total_latency_ms'] < 1000 for s in snapshots))
+
+    def test_corrupt_batch_is_skipped(self):
+        """Testa que um .zip truncado é descartado sem encerrar o fluxo."""
+        with tempfile.TemporaryDirectory() as tmp:
+            feed_dir = os.path.join(tmp, 'feed')
+            os.makedirs(feed_dir)
+            payloads = {'20240101000000': export_zip(['20240101'] * 10),
+                        '20240101001500': export_zip(['20240101'] * 10)[:40],
+                        '20240101003000': export_zip(['20240101'] * 5)}
+            for batch_id, payload in payloads.items():
+                with open(os.path.join(feed_dir, f'{batch_id}.export.CSV.zip'), 'wb') as f:
+                    f.write(payload)
+
+            collector = GDELTCollector(cache_dir=tmp)
+            snapshots = list(collector.stream_updates(directory=feed_dir, idle_timeout=0))
+
+        self.assertEqual([s['batch_id'] for s in snapshots], ['20240101000000', '20240101003000'])
+        self.assertEqual(snapshots[-1]['cumulative']['events'], 15)
+
+    def test_update_feed_downloads_once(self):
+        """Testa que o feed HTTP baixa cada exportação uma única vez."""
+        session = _FeedSession()
+        feed = GDELTUpdateFeed(session)
+        self.assertEqual([batch_id for batch_id, _ in feed.poll()], ['20240101001500'])
+        self.assertEqual(feed.poll(), [])
+        self.assertEqual(session.downloads, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
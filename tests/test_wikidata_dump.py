@@ -0,0 +1,136 @@
+"""
+Testes da leitura offline de dumps JSON do Wikidata
+"""
+
+import sys
+import os
+import bz2
+import gzip
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import wikidata_dump
+from data_processor import WikidataDumpCollector
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'wikidata', 'dump_sample.json')
+ENTITY = 'http://www.wikidata.org/entity/'
+
+
+class TestWikidataDump(unittest.TestCase):
+    """Testes da extração, da compressão, do paralelismo e das tabelas em cache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, 'cache')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _compressed(self, suffix: str) -> str:
+        path = os.path.join(self.tmp.name, f"sample.json{suffix}")
+        opener = {'.bz2': bz2.open, '.gz': gzip.open}[suffix]
+        with open(FIXTURE, 'rb') as src, opener(path, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        return path
+
+    def test_extract_records(self):
+        """Testa eventos (P585) e pessoas (Q5 com P569/P570) extraídos do fixture."""
+        with open(FIXTURE, 'rb') as f:
+            records = wikidata_dump.extract_records(f.readlines())
+        events = pd.DataFrame(records.events, columns=wikidata_dump.EVENT_COLUMNS)
+        people = pd.DataFrame(records.people, columns=wikidata_dump.PEOPLE_COLUMNS).set_index('person')
+
+        self.assertEqual(len(events), 6)
+        by_event = events.set_index('event')
+        # Datas repetidas viram uma linha; tipos unidos como no SPARQL
+        self.assertEqual(by_event.loc[ENTITY + 'Q11696', 'typeLabel'], 'Q1190554|Q178561')
+        # Precisão de ano e de mês: '00' vira 1; posto 'deprecated' é ignorado
+        self.assertEqual(by_event.loc[ENTITY + 'Q104000001', 'date'], '2001-01-01T00:00:00Z')
+        self.assertEqual(by_event.loc[ENTITY + 'Q104000002', 'date'], '1701-05-01T00:00:00Z')
+        # Sem rótulo em inglês, fica o QID
+        self.assertEqual(by_event.loc[ENTITY + 'Q104000001', 'eventLabel'], 'Q104000001')
+
+        # Só humanos; o cavalo Q1234567 tem P569 mas não é Q5
+        self.assertEqual(sorted(people.index.str.replace(ENTITY, '')),
+                         ['Q1048', 'Q5284', 'Q7186', 'Q937'])
+        self.assertEqual(people.loc[ENTITY + 'Q1048', 'birthDate'], '-0100-07-12T00:00:00Z')
+        # Posto preferido vence o normal; 'novalue' não é data
+        self.assertEqual(people.loc[ENTITY + 'Q7186', 'birthDate'], '1867-11-07T00:00:00Z')
+        self.assertTrue(pd.isna(people.loc[ENTITY + 'Q5284', 'deathDate']))
+
+    def test_event_classes_filter(self):
+        """Testa a restrição dos eventos às classes dadas."""
+        with open(FIXTURE, 'rb') as f:
+            records = wikidata_dump.extract_records(f.readlines(), frozenset({'Q178561'}))
+        self.assertEqual(sorted(event for event, _, _, _ in records.events),
+                         [ENTITY + 'Q11696', ENTITY + 'Q2277'])
+
+    def test_compressed_and_parallel_match_plain(self):
+        """Testa bz2/gz e o pool de processos contra a leitura serial do arquivo puro."""
+        def collect(path, **opts):
+            chunks = list(wikidata_dump.iter_dump_records(path, **opts))
+            return ([row for chunk in chunks for row in chunk.events],
+                    [row for chunk in chunks for row in chunk.people], len(chunks))
+
+        events, people, _ = collect(FIXTURE, workers=1)
+        for suffix in ('.bz2', '.gz'):
+            path = self._compressed(suffix)
+            # Blocos pequenos: vários blocos em voo, entregues em ordem
+            parallel_events, parallel_people, n_chunks = collect(path, workers=2, chunk_bytes=1500,
+                                                                 max_pending=2)
+            self.assertGreater(n_chunks, 2)
+            self.assertEqual(parallel_events, events)
+            self.assertEqual(parallel_people, people)
+
+    def test_collector_tables(self):
+        """Testa as tabelas em cache do coletor no formato do WikidataCollector."""
+        collector = WikidataDumpCollector(self._compressed('.bz2'), cache_dir=self.cache_dir,
+                                          workers=1, chunk_bytes=2000)
+        summary = collector.ingest()
+        self.assertEqual((summary['events'], summary['people']), (6, 4))
+        self.assertEqual(summary['lines'], 15)
+
+        events = collector.collect_historical_events()
+        self.assertEqual(list(events.columns), ['event', 'eventLabel', 'date', 'typeLabel', 'year'])
+        self.assertEqual(events.set_index('eventLabel').loc['Apollo 11', 'date'], '1969-07-20')
+        self.assertEqual(collector.collect_historical_events(limit=2)['year'].tolist(), [2001, 1989])
+
+        people = collector.collect_people()
+        self.assertEqual(list(people.columns),
+                         ['person', 'personLabel', 'birthDate', 'deathDate', 'birth_year'])
+        self.assertEqual(people.set_index('personLabel').loc['Julius Caesar', 'birth_year'], -100)
+        self.assertEqual(len(collector.collect_people(require_death=True)), 3)
+
+    def test_collector_ingests_on_demand(self):
+        """Testa a leitura do dump só na primeira coleta e as tabelas por conjunto de classes."""
+        dump_path = shutil.copy(FIXTURE, self.tmp.name)
+        collector = WikidataDumpCollector(dump_path, cache_dir=self.cache_dir, workers=1)
+        self.assertEqual(len(collector.collect_historical_events(event_classes=['Q178561'])), 2)
+        self.assertEqual(len(collector.collect_historical_events()), 6)
+        # Tabelas já em cache não releem o dump
+        os.remove(dump_path)
+        self.assertEqual(len(collector.collect_historical_events()), 6)
+        self.assertEqual(len(collector.collect_people()), 4)
+
+    def test_empty_tables_are_cached(self):
+        """Testa que uma leitura sem registros grava a tabela vazia e não relê o dump."""
+        dump_path = shutil.copy(FIXTURE, self.tmp.name)
+        collector = WikidataDumpCollector(dump_path, cache_dir=self.cache_dir, workers=1)
+        none = collector.collect_historical_events(event_classes=['Q0'])
+        self.assertTrue(none.empty)
+        self.assertEqual(list(none.columns), ['event', 'eventLabel', 'date', 'typeLabel', 'year'])
+
+        # A leitura filtrada já gravou as pessoas; nada mais precisa do dump
+        os.remove(dump_path)
+        self.assertTrue(collector.collect_historical_events(event_classes=['Q0']).empty)
+        self.assertEqual(len(collector.collect_people()), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()